@@ -1,15 +1,160 @@
 """Main entry point for whisper-typing."""
 
 import argparse
+import multiprocessing
+from typing import Any
 
 from dotenv import load_dotenv
 
 from whisper_typing.app_controller import WhisperAppController
+from whisper_typing.constants import WHISPER_NAME_MAP
+from whisper_typing.model_manager import ModelManager
+from whisper_typing.model_pool import BYTES_PER_MB
 from whisper_typing.tui.app import WhisperTui
+from whisper_typing.tuning import (
+    CONCURRENT_PASSES,
+    TUNING_PATH,
+    BackendResult,
+    TuningResult,
+    benchmark_assisted,
+    compare_backends,
+    tune,
+)
+
+
+def run_tuning(config: dict[str, Any], clip_path: str) -> None:
+    """Benchmark the configured model and cache the fastest settings.
+
+    Args:
+        config: The application configuration.
+        clip_path: Path to the reference audio clip.
+
+    """
+    model_name = WHISPER_NAME_MAP.get(config["model"], config["model"])
+    device = "cuda" if config.get("device", "cpu").startswith("cuda") else "cpu"
+    print(f"Tuning {model_name} on {device} with {clip_path}...")  # noqa: T201
+    print(  # noqa: T201
+        f"{'threads':>8} {'workers':>8} {'compute':>14} {'RTF':>8} "
+        f"{f'RTF x{CONCURRENT_PASSES}':>8}"
+    )
+
+    def report(result: TuningResult) -> None:
+        s = result.settings
+        print(  # noqa: T201
+            f"{s.cpu_threads:>8} {s.num_workers:>8} {s.compute_type:>14} "
+            f"{result.rtf:>8.3f} {result.concurrent_rtf or 0:>8.3f}"
+        )
+
+    best = tune(
+        model_name,
+        clip_path,
+        device=device,
+        download_root=config.get("model_cache_dir"),
+        on_result=report,
+    )
+    s = best.settings
+    print(  # noqa: T201
+        f"Best: cpu_threads={s.cpu_threads} num_workers={s.num_workers} "
+        f"compute_type={s.compute_type} (RTF {best.rtf:.3f}), saved to {TUNING_PATH}"
+    )
+
+
+def run_backend_comparison(config: dict[str, Any], clip_path: str) -> None:
+    """Time every decoding backend on the configured model.
+
+    Args:
+        config: The application configuration.
+        clip_path: Path to the reference audio clip.
+
+    """
+    model_id = config["model"]
+    device = "cuda" if config.get("device", "cpu").startswith("cuda") else "cpu"
+    compute_type = config.get("compute_type", "auto")
+    if compute_type == "auto":
+        compute_type = "float16" if device == "cuda" else "int8"
+    print(f"Comparing backends for {model_id} on {device} with {clip_path}...")  # noqa: T201
+
+    def report(result: BackendResult) -> None:
+        if result.error:
+            print(f"{result.backend:>16} failed: {result.error}")  # noqa: T201
+        else:
+            print(f"{result.backend:>16} {result.rtf:>8.3f}")  # noqa: T201
+
+    results = compare_backends(
+        model_id,
+        clip_path,
+        device=device,
+        compute_type=compute_type,
+        language=config.get("language"),
+        download_root=config.get("model_cache_dir"),
+        on_result=report,
+    )
+    if results[0].error:
+        print("No backend could decode the clip.")  # noqa: T201
+        return
+    print(f'Fastest: "backend": "{results[0].backend}" (RTF {results[0].rtf:.3f})')  # noqa: T201
+
+
+def run_assistant_benchmark(config: dict[str, Any], clip_path: str) -> None:
+    """Compare the configured model decoding with and without its assistant.
+
+    Args:
+        config: The application configuration.
+        clip_path: Path to the reference audio clip.
+
+    """
+    model_id = config["model"]
+    device = "cuda" if config.get("device", "cpu").startswith("cuda") else "cpu"
+    print(f"Benchmarking assisted decoding for {model_id} on {device}...")  # noqa: T201
+    result = benchmark_assisted(
+        model_id,
+        clip_path,
+        assistant_model=config.get("assistant_model"),
+        device=device,
+        compute_type=config.get("compute_type", "auto"),
+        language=config.get("language"),
+        download_root=config.get("model_cache_dir"),
+    )
+    print(f"   plain {result.plain_seconds:>8.2f} s")  # noqa: T201
+    print(f"assisted {result.assisted_seconds:>8.2f} s ({result.speedup:.2f}x)")  # noqa: T201
+    if result.identical:
+        print("Transcripts are identical.")  # noqa: T201
+    else:
+        print(f"Transcripts differ:\n   plain: {result.plain_text}")  # noqa: T201
+        print(f"assisted: {result.assisted_text}")  # noqa: T201
+
+
+def run_model_command(config: dict[str, Any], command: str) -> None:
+    """Run a model maintenance command on the configured model cache.
+
+    Args:
+        config: The application configuration.
+        command: One of "list", "download", "verify" or "prune".
+
+    """
+    manager = ModelManager(config.get("model_cache_dir"))
+    model_id = config["model"]
+    if command == "download":
+        print(f"Downloading {manager.repo_id(model_id)}...")  # noqa: T201
+        manager.download(model_id)
+    elif command == "verify":
+        status = "complete" if manager.verify(model_id) else "missing or incomplete"
+        print(f"{manager.repo_id(model_id)}: {status}")  # noqa: T201
+    elif command == "prune":
+        freed = manager.prune([model_id])
+        print(f"Freed {freed / BYTES_PER_MB:.0f} MB, kept {model_id}.")  # noqa: T201
+
+    total = 0
+    for model in manager.cached_models():
+        total += model.size_bytes
+        print(f"{model.size_bytes / BYTES_PER_MB:>8.0f} MB  {model.repo_id}")  # noqa: T201
+    print(f"{total / BYTES_PER_MB:>8.0f} MB  total")  # noqa: T201
 
 
 def main() -> None:
     """Run the whisper-typing application."""
+    # Frozen builds re-run this entry point in spawned worker processes
+    multiprocessing.freeze_support()
     parser = argparse.ArgumentParser(
         description="Whisper Typing - Background Speech to Text"
     )
@@ -19,6 +164,28 @@ def main() -> None:
     parser.add_argument("--model", help="Whisper model ID")
     parser.add_argument("--language", help="Language code")
     parser.add_argument("--api-key", help="Gemini API Key")
+    parser.add_argument(
+        "--tune",
+        metavar="CLIP",
+        help="Benchmark CPU threading settings for the model on an audio clip",
+    )
+    parser.add_argument(
+        "--compare-backends",
+        metavar="CLIP",
+        help="Time each decoding backend with the model on an audio clip",
+    )
+    parser.add_argument(
+        "--benchmark-assistant",
+        metavar="CLIP",
+        help="Compare the model decoding an audio clip with and without its "
+        "distilled assistant",
+    )
+    parser.add_argument(
+        "--models",
+        choices=["list", "download", "verify", "prune"],
+        help="Manage downloaded models: list the cache, download or verify "
+        "the configured model, or prune all other cached models",
+    )
     args = parser.parse_args()
 
     load_dotenv(override=True)
@@ -27,6 +194,19 @@ def main() -> None:
     controller = WhisperAppController()
     controller.load_configuration(args)
 
+    if args.tune:
+        run_tuning(controller.config, args.tune)
+        return
+    if args.compare_backends:
+        run_backend_comparison(controller.config, args.compare_backends)
+        return
+    if args.benchmark_assistant:
+        run_assistant_benchmark(controller.config, args.benchmark_assistant)
+        return
+    if args.models:
+        run_model_command(controller.config, args.models)
+        return
+
     # Start TUI
     # The TUI will handle component initialization and starting the listener
     app = WhisperTui(controller)
@@ -1,18 +1,31 @@
 """Main application controller for whisper-typing."""
 
+from __future__ import annotations
+
 import json
 import os
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Final
 
-import sounddevice as sd
+import numpy as np
 from dotenv import find_dotenv
 from pynput import keyboard
 
 from whisper_typing.ai_improver import AIImprover
 from whisper_typing.audio_capture import AudioRecorder
+from whisper_typing.device_registry import DeviceRegistry
+from whisper_typing.governor import LIVE_SHARE, ResourceGovernor
+from whisper_typing.long_form import SAMPLE_RATE, ParallelDecoder
+from whisper_typing.model_pool import (
+    BYTES_PER_MB,
+    ModelKey,
+    ModelPool,
+    process_memory_bytes,
+)
+from whisper_typing.process_transcriber import DECODE_OPTIONS, ProcessTranscriber
 from whisper_typing.transcriber import Transcriber
 from whisper_typing.typer import Typer
 from whisper_typing.window_manager import WindowManager
@@ -20,14 +33,28 @@ from whisper_typing.window_manager import WindowManager
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+# Live window used when spilling without one: a live pass over the whole
+# session would read the entire spill file every time
+SPILL_LIVE_WINDOW_SECONDS: Final[float] = 30.0
+
 DEFAULT_CONFIG: dict[str, Any] = {
     "hotkey": "<f8>",
     "type_hotkey": "<f9>",
     "improve_hotkey": "<f10>",
     "model": "openai/whisper-base",
+    "backend": "faster-whisper",
+    "assistant_model": None,
     "language": None,
+    "language_learn_after": 0,
+    "greedy_first": False,
+    "escalation_beam_size": 5,
+    "decode_guard": False,
+    "transcriber_process": False,
+    "long_form_workers": 0,
+    "long_form_min_seconds": 30,
     "gemini_prompt": None,
     "microphone_name": None,
+    "microphone_hostapi": None,
     "gemini_model": None,
     "device": "cpu",
     "compute_type": "auto",
@@ -36,6 +63,16 @@ DEFAULT_CONFIG: dict[str, Any] = {
     "gemini_api_key": None,
     "refocus_window": True,
     "model_cache_dir": None,
+    "preroll_ms": 0,
+    "audio_dtype": "float32",
+    "preprocess_audio": False,
+    "spill_chunk_seconds": 0,
+    "live_window_seconds": 0,
+    "model_pool_size": 2,
+    "idle_unload_minutes": 0,
+    "live_cpu_share": LIVE_SHARE,
+    "decoder_cores": None,
+    "model_pool_memory_mb": 0,
 }
 
 
@@ -84,18 +121,22 @@ class WhisperAppController:
     Decoupled from UI (CLI or TUI).
     """
 
-    def __init__(self) -> None:
+    def __init__(self) -> None:  # noqa: PLR0915
         """Initialize the WhisperAppController."""
         self.config: dict[str, Any] = {}
         self.recorder: AudioRecorder | None = None
-        self.transcriber: Transcriber | None = None
+        self.transcriber: Transcriber | ProcessTranscriber | None = None
         self.typer: Typer | None = None
         self.improver: AIImprover | None = None
         self.listener: keyboard.GlobalHotKeys | None = None
         self.window_manager: WindowManager = WindowManager()
+        self.device_registry: DeviceRegistry = DeviceRegistry()
+        self.model_pool: ModelPool = ModelPool()
+        self.governor: ResourceGovernor = ResourceGovernor()
         self.target_window_handle: Any | None = None
 
         self.is_processing: bool = False
+        self.status: str = ""
         self.pending_text: str | None = None
         self.paused: bool = False
 
@@ -105,17 +146,60 @@ class WhisperAppController:
         self.current_mic_index: int | None = None
         self.current_device: str | None = None
         self.current_compute_type: str | None = None
-
+        self.current_backend: str | None = None
+        self.current_assistant: str | None = None
+
+        # Model loading in the background, and a loaded model waiting to be
+        # swapped in between recordings
+        self._swap_lock: Final[threading.Lock] = threading.Lock()
+        self._loading_key: ModelKey | None = None
+        self._pending_model: (
+            tuple[ModelKey, Transcriber | ProcessTranscriber] | None
+        ) = None
+        self.model_load_thread: threading.Thread | None = None
+        # Models released after sitting idle, reloaded on the record hotkey
+        self._idle_timer: threading.Timer | None = None
+        self._unloaded_key: ModelKey | None = None
+        self.idle_reload_thread: threading.Thread | None = None
+        self.idle_unloads: int = 0
+        self.last_reclaimed_mb: float = 0.0
+        self.last_reload_seconds: float | None = None
+        # A recording no model was available for, kept for the next one
+        self.untranscribed_audio: np.ndarray | None = None
+        # Worker processes decoding long recordings in parallel, and the
+        # model and worker count they were started for
+        self.long_form: ParallelDecoder | None = None
+        self._long_form_setup: tuple[ModelKey, int] | None = None
+
+        # Stops the current recording's live preview; each recording gets
+        # its own, so a pass abandoned at stop can't outlive it
         self.stop_live_transcribe: threading.Event = threading.Event()
         self.live_transcribe_thread: threading.Thread | None = None
+        # Orders preview updates against the end of their recording
+        self._preview_lock: Final[threading.Lock] = threading.Lock()
 
         # Callbacks for UI updates
         self.on_status_change: Callable[[str], None] | None = None
         self.on_log: Callable[[str], None] | None = None
         self.on_preview_update: Callable[[str, str | None], None] | None = None
 
+        # Capture problems already reported for the current recording
+        self._reported_overflows: int = 0
+        # Temperature fallbacks and guard firings already logged
+        self._reported_fallbacks: int = 0
+        self._reported_guard: int = 0
+
         self.typing_stop_event: threading.Event = threading.Event()
         self._is_typing: bool = False
+        # Text left in the target window by the last typing run, and the
+        # typed text an AI improvement should be corrected from (if any)
+        self.typed_text: str | None = None
+        self.correction_base: str | None = None
+
+        # Seconds each component took in the last initialization, and the
+        # AI client still starting after the app became ready
+        self.init_seconds: dict[str, float] = {}
+        self.improver_init: Future[None] | None = None
 
     def log(self, message: str) -> None:
         """Log a message using the configured UI callback.
@@ -134,9 +218,117 @@ class WhisperAppController:
             status: The new status string.
 
         """
+        incoming = self._incoming_model()
+        if status == "Ready" and incoming:
+            status = f"Loading {incoming} (still serving {self.current_model_id})"
+        self.status = status
         if self.on_status_change:
             self.on_status_change(status)
 
+    def get_metrics(self) -> dict[str, Any]:
+        """Collect runtime metrics from the components.
+
+        Returns:
+            A dictionary of metric groups.
+
+        """
+        metrics: dict[str, Any] = {}
+        if self.recorder:
+            metrics["capture"] = self.recorder.metrics.snapshot()
+            if self.recorder.preprocessor:
+                metrics["capture"]["gain_db"] = self.recorder.preprocessor.gain_db
+        if self.transcriber:
+            metrics["decoding"] = self.transcriber.decode_metrics.snapshot()
+        metrics["governor"] = self.governor.snapshot()
+        if self.init_seconds:
+            metrics["startup_seconds"] = dict(self.init_seconds)
+        if self.config.get("idle_unload_minutes", 0):
+            metrics["idle"] = {
+                "unloaded": self._unloaded_key is not None,
+                "unloads": self.idle_unloads,
+                "reclaimed_mb": self.last_reclaimed_mb,
+                "reload_seconds": self.last_reload_seconds,
+            }
+        metrics["models_mb"] = {
+            f"{key.model_id} ({key.backend} {key.device}/{key.compute_type})": (
+                used / BYTES_PER_MB
+            )
+            for key, used in self.model_pool.resident_memory().items()
+        }
+        return metrics
+
+    def _log_model_pool(self) -> None:
+        """Log the models kept resident and their memory use."""
+        resident = ", ".join(
+            f"{model} {used:.0f} MB"
+            for model, used in self.get_metrics()["models_mb"].items()
+        )
+        self.log(f"Resident models: {resident}")
+
+    def _log_governor(self) -> None:
+        """Log how the decoder's CPU is split with the live preview."""
+        share = self.governor.live_share
+        cores = self.governor.decoder_cores
+        placement = (
+            f"pinned to cores {', '.join(map(str, cores))} "
+            f"({self.governor.pinned_threads} threads)"
+            if cores
+            else "on all cores"
+        )
+        self.log(
+            f"Live preview uses up to {share:.0%} of the decoder's time, "
+            f"pausing for final passes and typing; decoder {placement}."
+        )
+
+    def _log_decoding(self) -> None:
+        """Log how much audio needed a beam search re-decode so far.
+
+        Also reports temperature fallbacks and the runaway-decode guard
+        whenever they occurred again.
+        """
+        if not self.transcriber:
+            return
+        decoding = self.transcriber.decode_metrics.snapshot()
+        if self.transcriber.greedy_first:
+            self.log(
+                f"Re-decoded {decoding['escalated_segments']} of "
+                f"{decoding['segments']} segments with a beam "
+                f"({decoding['escalated_fraction']:.0%} of audio)."
+            )
+        if decoding["fallback_segments"] > self._reported_fallbacks:
+            self._reported_fallbacks = decoding["fallback_segments"]
+            self.log(
+                f"Temperature fallback re-decoded {decoding['fallback_segments']} "
+                f"of {decoding['decoded_segments']} segments "
+                f"({decoding['fallback_rate']:.0%})."
+            )
+        if decoding["guard_fired"] > self._reported_guard:
+            self._reported_guard = decoding["guard_fired"]
+            reasons = ", ".join(
+                f"{reason} {count}"
+                for reason, count in decoding["guard_reasons"].items()
+                if count
+            )
+            self.log(
+                f"Runaway-decode guard fired {decoding['guard_fired']} times "
+                f"({reasons}), saving about "
+                f"{decoding['guard_saved_seconds']:.1f}s of decoding."
+            )
+
+    def _check_capture_health(self) -> None:
+        """Warn when the audio callback has dropped input since the last check."""
+        if not self.recorder:
+            return
+        capture = self.recorder.metrics.snapshot()
+        overflows = capture["input_overflows"]
+        if overflows > self._reported_overflows:
+            self.log(
+                f"Warning: {overflows - self._reported_overflows} input overflow(s), "
+                f"audio was dropped (max callback gap {capture['max_gap_ms']:.0f} ms, "
+                f"slowest callback {capture['callback_ms_max']:.1f} ms)."
+            )
+            self._reported_overflows = overflows
+
     def load_configuration(self, args: Any = None) -> None:  # noqa: ANN401
         """Load and merge configuration.
 
@@ -179,11 +371,10 @@ class WhisperAppController:
         if not mic_name:
             return None
 
-        devices = sd.query_devices()
-        for i, dev in enumerate(devices):
-            if dev["max_input_channels"] > 0 and mic_name in dev["name"]:
-                return i
-        return None
+        device = self.device_registry.find(
+            mic_name, self.config.get("microphone_hostapi")
+        )
+        return device.index if device else None
 
     def list_input_devices(self) -> list[tuple[int, str]]:
         """List available audio input devices.
@@ -192,7 +383,14 @@ class WhisperAppController:
             A list of tuples containing device index and name.
 
         """
-        return AudioRecorder.list_devices()
+        return self.device_registry.input_devices()
+
+    def rescan_devices(self) -> None:
+        """Re-enumerate audio devices to pick up plugged or removed hardware."""
+        if self.recorder:
+            self.recorder.close()  # PortAudio is reinitialized
+        self.device_registry.rescan()
+        self.log("Audio devices rescanned.")
 
     def update_config(self, new_config: dict[str, Any]) -> None:
         """Update runtime config and save to file.
@@ -258,51 +456,520 @@ class WhisperAppController:
         """
         self.log("Initializing components...")
 
+        # Release the device first; a stale registry reinitializes PortAudio
+        if self.recorder:
+            self.recorder.close()
+
         # Microphone Setup
         mic_index = self.get_mic_index_from_config()
         # Note: If mic not found, we default to None (System Default)
         # instead of interactive prompt here. The UI should handle setup.
         self.current_mic_index = mic_index
+        self.governor.configure(
+            live_share=self.config.get("live_cpu_share", LIVE_SHARE),
+            decoder_cores=self.config.get("decoder_cores"),
+        )
+        self._log_governor()
+
+        # Independent components start concurrently; the hotkeys only
+        # need the recorder, the transcriber and the typer
+        tasks: dict[str, Callable[[], None]] = {
+            "recorder": self._init_recorder,
+            "typer": self._init_typer,
+        }
+        # Reload Optimization: Check if model/language changed
+        if (
+            not self.transcriber
+            or self.current_model_id != self.config["model"]
+            or self.current_language != self.config["language"]
+            or self.current_device != self.config.get("device", "cpu")
+            or self.current_compute_type != self.config.get("compute_type", "auto")
+            or self.current_backend != self.config.get("backend", "faster-whisper")
+            or self.current_assistant != self._configured_assistant()
+        ):
+            tasks["transcriber"] = self._select_model
+
+        self.init_seconds = {}
+        executor = ThreadPoolExecutor(max_workers=len(tasks) + 1)
+        required = {
+            name: executor.submit(self._timed_init, name, task)
+            for name, task in tasks.items()
+        }
+        # A slow or failing AI client must not hold up dictation
+        improver_init = executor.submit(
+            self._timed_init, "improver", self._init_improver
+        )
+        self.improver_init = improver_init
+        improver_init.add_done_callback(self._improver_initialized)
+        executor.shutdown(wait=False)
+
+        failed = False
+        for name, future in required.items():
+            try:
+                future.result()
+            except Exception as e:  # noqa: BLE001
+                self.log(f"Error initializing components: {name}: {e}")
+                failed = True
+        if failed:
+            return False
+        timings = ", ".join(
+            f"{name} {self.init_seconds[name]:.1f}s" for name in required
+        )
+        self.log(f"Components initialized ({timings}).")
+        return True
+
+    def _timed_init(self, name: str, task: Callable[[], None]) -> None:
+        """Run one component's initialization and record how long it took.
+
+        Args:
+            name: The component.
+            task: Initializes the component.
 
+        """
+        start = time.perf_counter()
         try:
-            # Reload Optimization: Check if model/language changed
-            if (
-                not self.transcriber
-                or self.current_model_id != self.config["model"]
-                or self.current_language != self.config["language"]
-                or self.current_device != self.config.get("device", "cpu")
-                or self.current_compute_type != self.config.get("compute_type", "auto")
-            ):
-                self.log(f"Loading Transcriber ({self.config['model']})...")
-                device = self.config.get("device", "cpu")
-                compute_type = self.config.get("compute_type", "auto")
-                self.transcriber = Transcriber(
-                    model_id=self.config["model"],
-                    language=self.config["language"],
-                    device=device,
-                    compute_type=compute_type,
+            task()
+        finally:
+            self.init_seconds[name] = time.perf_counter() - start
+
+    def _init_recorder(self) -> None:
+        """Create the audio recorder for the configured microphone."""
+        mic = self.device_registry.get(self.current_mic_index)
+        self.recorder = AudioRecorder(
+            device_index=self.current_mic_index,
+            capture_rate=(mic.default_samplerate or None) if mic else None,
+            preroll_ms=self.config.get("preroll_ms", 0),
+            dtype=self.config.get("audio_dtype", "float32"),
+            spill_chunk_seconds=self.config.get("spill_chunk_seconds", 0),
+            preprocess=self.config.get("preprocess_audio", False),
+        )
+        if self.recorder.open():
+            self.log("Input stream open (pre-roll enabled).")
+
+    def _init_typer(self) -> None:
+        """Create the typer."""
+        self.typer = Typer(wpm=self.config.get("typing_wpm", 40))
+
+    def _init_improver(self) -> None:
+        """Create the Gemini client."""
+        improver = AIImprover(
+            api_key=self.config.get("gemini_api_key"),
+            model_name=self.config.get("gemini_model") or "gemini-1.5-flash",
+            debug=self.config.get("debug", False),
+            logger=self.log,
+        )
+        self.improver = improver
+
+    def _improver_initialized(self, future: Future[None]) -> None:
+        """Report the AI client once it has started, or failed to.
+
+        Args:
+            future: The improver's initialization.
+
+        """
+        error = future.exception()
+        if error:
+            self.log(f"AI improvement unavailable: {error}")
+        elif future is self.improver_init:
+            seconds = self.init_seconds.get("improver", 0.0)
+            self.log(f"AI improver ready ({seconds:.1f}s).")
+
+    def _create_transcriber(self, key: ModelKey) -> Transcriber | ProcessTranscriber:
+        """Load a transcriber for a pool key.
+
+        Args:
+            key: The model to load.
+
+        Returns:
+            The new transcriber, in a worker process if configured.
+
+        """
+        transcriber_cls = (
+            ProcessTranscriber
+            if self.config.get("transcriber_process", False)
+            else Transcriber
+        )
+        transcriber = transcriber_cls(
+            model_id=key.model_id,
+            device=key.device,
+            compute_type=key.compute_type,
+            download_root=self.config.get("model_cache_dir"),
+            backend=key.backend,
+            backend_options=self._backend_options(key),
+            cpu_threads=self.governor.pinned_threads,
+            cpu_cores=self.governor.decoder_cores,
+        )
+        self._apply_decode_options(transcriber)
+        return transcriber
+
+    def _configured_assistant(self) -> str | None:
+        """Return the assistant model the configured backend decodes with.
+
+        Returns:
+            The configured assistant model ID (None for the default one, or
+            when the backend doesn't use an assistant).
+
+        """
+        if self.config.get("backend", "faster-whisper") != "assisted":
+            return None
+        return self.config.get("assistant_model")
+
+    @staticmethod
+    def _backend_options(key: ModelKey) -> dict[str, Any]:
+        """Return the backend-specific load options for a pool key.
+
+        Args:
+            key: The model to load.
+
+        Returns:
+            Keyword arguments for the backend's ``load``.
+
+        """
+        return {"assistant_model": key.assistant} if key.backend == "assisted" else {}
+
+    def _apply_decode_options(
+        self, transcriber: Transcriber | ProcessTranscriber
+    ) -> None:
+        """Apply the configured decoding options to a (pooled) transcriber.
+
+        Args:
+            transcriber: The transcriber to configure.
+
+        """
+        transcriber.language = self.config["language"]
+        transcriber.learn_language_after = self.config.get("language_learn_after", 0)
+        transcriber.greedy_first = self.config.get("greedy_first", False)
+        transcriber.escalation_beam_size = self.config.get("escalation_beam_size", 5)
+        transcriber.decode_guard = self.config.get("decode_guard", False)
+
+    def _select_model(self) -> None:
+        """Make the configured model the serving transcriber.
+
+        The first model is loaded in the foreground. Later changes load in
+        the background while the current transcriber keeps serving, and are
+        swapped in between recordings.
+        """
+        device = self.config.get("device", "cpu")
+        compute_type = self.config.get("compute_type", "auto")
+        backend = self.config.get("backend", "faster-whisper")
+        key = ModelKey(
+            self.config["model"],
+            device,
+            compute_type,
+            backend,
+            self._configured_assistant(),
+        )
+        self.model_pool.max_models = self.config.get("model_pool_size", 2)
+        self.model_pool.max_memory_mb = self.config.get("model_pool_memory_mb", 0)
+
+        if self.transcriber and key not in self.model_pool:
+            with self._swap_lock:
+                if self._loading_key == key:
+                    return  # Already on its way
+                self._loading_key = key
+            self.log(
+                f"Loading Transcriber ({key.model_id}) in the background, "
+                f"still serving {self.current_model_id}..."
+            )
+            self.model_load_thread = threading.Thread(
+                target=self._load_in_background, args=(key,), daemon=True
+            )
+            self.model_load_thread.start()
+            return
+
+        if key in self.model_pool:
+            self.log(f"Using resident model ({key.model_id}).")
+        else:
+            self.log(f"Loading Transcriber ({key.model_id})...")
+        transcriber = self.model_pool.get(key, lambda: self._create_transcriber(key))
+        with self._swap_lock:
+            # Supersedes any model still loading in the background
+            self._loading_key = None
+            self._pending_model = (key, transcriber)
+        # With nothing serving yet there is no recording to wait for
+        self._swap_pending_model(force=not self.transcriber)
+
+    def _load_in_background(self, key: ModelKey) -> None:
+        """Load a model into the pool and queue it for swapping in.
+
+        Args:
+            key: The model to load.
+
+        """
+        try:
+            transcriber = self.model_pool.get(
+                key, lambda: self._create_transcriber(key)
+            )
+        except Exception as e:  # noqa: BLE001
+            with self._swap_lock:
+                if self._loading_key != key:
+                    return
+                self._loading_key = None
+            self.log(
+                f"Error loading {key.model_id}: {e}. "
+                f"Still serving {self.current_model_id}."
+            )
+            self._refresh_ready_status(self.current_model_id)
+            return
+
+        with self._swap_lock:
+            if self._loading_key != key:
+                return  # Another model was selected meanwhile
+            self._loading_key = None
+            self._pending_model = (key, transcriber)
+        self._swap_pending_model()
+
+    def _start_long_form(self, key: ModelKey) -> None:
+        """Start worker processes for parallel long-form decoding of a model.
+
+        Args:
+            key: The model the workers should load.
+
+        """
+        workers = self.config.get("long_form_workers", 0)
+        setup = (key, workers) if workers else None
+        with self._swap_lock:
+            if setup == self._long_form_setup:
+                return
+            self._long_form_setup = setup
+            old, self.long_form = self.long_form, None
+        if old:
+            old.close()
+        if not setup:
+            return
+
+        def start() -> None:
+            try:
+                decoder = ParallelDecoder.start(
+                    workers,
+                    model_id=key.model_id,
+                    device=key.device,
+                    compute_type=key.compute_type,
                     download_root=self.config.get("model_cache_dir"),
+                    backend=key.backend,
+                    backend_options=self._backend_options(key),
+                    cpu_cores=self.governor.decoder_cores,
                 )
-                self.current_model_id = self.config["model"]
-                self.current_language = self.config["language"]
-                self.current_device = device
-                self.current_compute_type = compute_type
-
-            self.recorder = AudioRecorder(device_index=self.current_mic_index)
-            self.typer = Typer(wpm=self.config.get("typing_wpm", 40))
-            self.improver = AIImprover(
-                api_key=self.config.get("gemini_api_key"),
-                model_name=self.config.get("gemini_model") or "gemini-1.5-flash",
-                debug=self.config.get("debug", False),
-                logger=self.log,
+            except Exception as e:  # noqa: BLE001
+                self.log(f"Long-form decoding unavailable: {e}")
+                return
+            with self._swap_lock:
+                current = self._long_form_setup == setup
+                if current:
+                    self.long_form = decoder
+            if not current:
+                decoder.close()  # Model changed while starting
+                return
+            self.log(f"Long-form decoding ready ({workers} worker processes).")
+
+        threading.Thread(target=start, daemon=True).start()
+
+    def _transcribe_final(self, audio: np.ndarray) -> str:
+        """Transcribe a finished recording.
+
+        Recordings longer than ``long_form_min_seconds`` are split at pauses
+        and decoded in parallel when long-form workers are running.
+
+        Args:
+            audio: The recording (float32, 16kHz).
+
+        Returns:
+            The transcribed text.
+
+        """
+        transcriber = self.transcriber
+        if transcriber is None:
+            return ""
+        decoder = self.long_form
+        min_seconds = self.config.get("long_form_min_seconds", 30)
+        if decoder is None or len(audio) <= min_seconds * SAMPLE_RATE:
+            return transcriber.transcribe(audio)
+
+        options = {name: getattr(transcriber, name) for name in DECODE_OPTIONS}
+        # Chunks share the recording's language instead of detecting it
+        options["language"] = transcriber.language or transcriber.pinned_language
+        self.log(f"Decoding {len(audio) / SAMPLE_RATE:.0f}s of audio in parallel...")
+        return decoder.transcribe(audio, options)
+
+    def _incoming_model(self) -> str | None:
+        """Return the model loading or waiting to be swapped in, if any."""
+        with self._swap_lock:
+            if self._loading_key:
+                return self._loading_key.model_id
+            if self._pending_model:
+                return self._pending_model[0].model_id
+            return None
+
+    def _swap_pending_model(self, *, force: bool = False) -> bool:
+        """Swap in a loaded model unless a recording or transcription is running.
+
+        Args:
+            force: Swap even while recording or transcribing.
+
+        Returns:
+            True if a model was swapped in.
+
+        """
+        with self._swap_lock:
+            if self._pending_model is None:
+                return False
+            busy = self.is_processing or (self.recorder and self.recorder.recording)
+            if busy and not force:
+                return False
+            key, transcriber = self._pending_model
+            self._pending_model = None
+            previous = self.current_model_id
+            self._apply_decode_options(transcriber)
+            self.transcriber = transcriber
+            self.model_pool.activate(key)
+            self.current_model_id = key.model_id
+            self.current_device = key.device
+            self.current_compute_type = key.compute_type
+            self.current_backend = key.backend
+            self.current_assistant = key.assistant
+            self.current_language = self.config["language"]
+            self._unloaded_key = None
+
+        if previous and previous != key.model_id:
+            self.log(f"Switched model: {previous} -> {key.model_id}.")
+        self._log_model_pool()
+        self._start_long_form(key)
+        self._refresh_ready_status(previous)
+        self._schedule_idle_unload()
+        return True
+
+    def _schedule_idle_unload(self) -> None:
+        """Restart the countdown to releasing the models while idle."""
+        minutes = self.config.get("idle_unload_minutes", 0)
+        with self._swap_lock:
+            if self._idle_timer:
+                self._idle_timer.cancel()
+            self._idle_timer = None
+            if not minutes:
+                return
+            self._idle_timer = threading.Timer(minutes * 60, self._unload_if_idle)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _unload_if_idle(self) -> None:
+        """Release the models once nothing has used them for a while.
+
+        Dictation comes in bursts, so the memory is handed back between
+        them. The record hotkey loads the model again, see
+        ``_reload_idle_model``.
+        """
+        with self._swap_lock:
+            if (
+                self.transcriber is None
+                or self._loading_key
+                or self._pending_model
+                or self._idle_timer is None
+            ):
+                return
+            busy = (
+                self.is_processing
+                or self._is_typing
+                or bool(self.recorder and self.recorder.recording)
             )
+            if not busy:
+                key = ModelKey(
+                    self.current_model_id or self.config["model"],
+                    self.current_device or "cpu",
+                    self.current_compute_type or "auto",
+                    self.current_backend or "faster-whisper",
+                    self.current_assistant,
+                )
+                self._unloaded_key = key
+                self.transcriber = None
+                self._long_form_setup = None
+                long_form, self.long_form = self.long_form, None
+        if busy:
+            self._schedule_idle_unload()
+            return
 
-            self.log("Components initialized.")
-        except Exception as e:  # noqa: BLE001
-            self.log(f"Error initializing components: {e}")
-            return False
-        else:
-            return True
+        if long_form:
+            long_form.close()
+        # Models in worker processes are freed when their workers exit
+        before = process_memory_bytes() + self.model_pool.worker_memory_bytes()
+        self.model_pool.clear()
+        self.last_reclaimed_mb = max(0, before - process_memory_bytes()) / BYTES_PER_MB
+        self.idle_unloads += 1
+        self.log(
+            f"Unloaded {key.model_id} after "
+            f"{self.config.get('idle_unload_minutes', 0)} idle minutes, "
+            f"reclaimed {self.last_reclaimed_mb:.0f} MB."
+        )
+
+    def _wait_for_idle_reload(self) -> None:
+        """Wait until a model reloading after idle is serving (or failed)."""
+        thread = self.idle_reload_thread
+        if thread:
+            thread.join()
+
+    def _reload_idle_model(self) -> None:
+        """Start loading a model released while idle, if there is one.
+
+        Called when the record hotkey is pressed: the model loads while
+        the user speaks, since the recorder buffers the audio anyway.
+        """
+        pressed = time.monotonic()
+        with self._swap_lock:
+            key = self._unloaded_key
+            if key is None or self._loading_key == key:
+                return
+            self._loading_key = key
+        self.log(f"Reloading {key.model_id}...")
+
+        def reload() -> None:
+            try:
+                transcriber = self.model_pool.get(
+                    key, lambda: self._create_transcriber(key)
+                )
+            except Exception as e:  # noqa: BLE001
+                with self._swap_lock:
+                    if self._loading_key == key:
+                        self._loading_key = None
+                self.log(f"Error reloading {key.model_id}: {e}")
+                return
+            with self._swap_lock:
+                if self._loading_key != key:
+                    return  # Another model was selected meanwhile
+                self._loading_key = None
+                self._pending_model = (key, transcriber)
+            # Nothing serves the recording in progress, so swap right away
+            self._swap_pending_model(force=True)
+            self.last_reload_seconds = time.monotonic() - pressed
+            self.log(f"Reloaded {key.model_id} in {self.last_reload_seconds:.1f}s.")
+
+        self.idle_reload_thread = threading.Thread(target=reload, daemon=True)
+        self.idle_reload_thread.start()
+
+    def _ensure_model_for_final(self) -> bool:
+        """Make sure a model serves the final pass, loading it if released.
+
+        The idle timer may have released the model again just as the
+        record hotkey was pressed, or the reload may have failed; it is
+        loaded (or retried) here rather than dropping the recording.
+
+        Returns:
+            True if a model is loaded.
+
+        """
+        self._wait_for_idle_reload()
+        if self.transcriber is None:
+            self._reload_idle_model()
+            self._wait_for_idle_reload()
+        return self.transcriber is not None
+
+    def _refresh_ready_status(self, serving: str | None) -> None:
+        """Replace a background loading status once the load has finished.
+
+        Args:
+            serving: The model the loading status named as still serving.
+
+        """
+        if self.status.endswith(f"(still serving {serving})"):
+            self.set_status("Ready")
 
     def start_listener(self) -> None:
         """Start the hotkey listener."""
@@ -329,6 +996,16 @@ class WhisperAppController:
         if self.listener:
             self.listener.stop()
 
+    def shutdown(self) -> None:
+        """Stop the hotkey listener and release the audio device."""
+        self.stop()
+        if self._idle_timer:
+            self._idle_timer.cancel()
+        if self.recorder:
+            self.recorder.close()
+        if self.long_form:
+            self.long_form.close()
+
     def toggle_pause(self) -> None:
         """Toggle the application pause state."""
         self.paused = not self.paused
@@ -360,24 +1037,37 @@ class WhisperAppController:
 
     def _start_recording(self) -> None:
         """Handle the start of an audio recording session."""
+        self._reload_idle_model()
         if self.config.get("refocus_window", True) and self.window_manager:
             self.target_window_handle = self.window_manager.get_active_window()
         else:
             self.target_window_handle = None
 
         self.pending_text = None
+        self.typed_text = None
+        self.correction_base = None
         if self.on_preview_update:
             self.on_preview_update("", None)  # Clear preview
 
         if self.recorder:
-            self.recorder.start()
+            # Not while a loaded model is being swapped in. begin_recording
+            # doesn't wait for the decoder, which may still be finishing an
+            # abandoned live pass
+            with self._swap_lock:
+                self.recorder.start()
+                if self.transcriber:
+                    self.transcriber.begin_recording()
+        self._reported_overflows = 0
+        self._schedule_idle_unload()
         self.set_status("Recording")
         self.log("Recording started...")
 
         # Start live transcription loop
-        self.stop_live_transcribe.clear()
+        self.stop_live_transcribe = threading.Event()
         self.live_transcribe_thread = threading.Thread(
-            target=self._live_transcription_loop, daemon=True
+            target=self._live_transcription_loop,
+            args=(self.stop_live_transcribe,),
+            daemon=True,
         )
         self.live_transcribe_thread.start()
 
@@ -386,23 +1076,38 @@ class WhisperAppController:
         self.log("Stopping recording...")
         self.set_status("Processing")
 
-        # Stop live transcription loop
-        self.stop_live_transcribe.set()
-        if self.live_transcribe_thread:
-            self.live_transcribe_thread.join()
+        # Stop live transcription loop. A live pass still decoding is
+        # abandoned rather than awaited, so the final pass starts at once
+        with self._preview_lock:
+            self.stop_live_transcribe.set()
 
         if not self.recorder:
             return
 
         audio_data = self.recorder.stop()
+        self._check_capture_health()
 
         if audio_data is not None:
             self.is_processing = True
 
             def process_audio() -> None:
+                # Words from a recording no model was available for
+                kept, self.untranscribed_audio = self.untranscribed_audio, None
+                audio = (
+                    audio_data if kept is None else np.concatenate([kept, audio_data])
+                )
                 try:
-                    if self.transcriber:
-                        text = self.transcriber.transcribe(audio_data)
+                    if not self._ensure_model_for_final():
+                        self.untranscribed_audio = audio
+                        self.log(
+                            "No model loaded. The recording is kept and "
+                            "transcribed with the next one."
+                        )
+                        self.set_status("Error")
+                    else:
+                        with self.governor.hold("final"):
+                            text = self._transcribe_final(audio)
+                        self._log_decoding()
                         if text:
                             self.pending_text = text
                             self.log(f"Transcribed: {text}")
@@ -417,17 +1122,33 @@ class WhisperAppController:
                     self.set_status("Error")
                 finally:
                     self.is_processing = False
+                    self._swap_pending_model()
+                    self._schedule_idle_unload()
 
             threading.Thread(target=process_audio).start()
+        elif self.recorder.last_error:
+            self.log(f"Audio capture failed: {self.recorder.last_error}")
+            self.device_registry.invalidate()  # device may have changed
+            self._swap_pending_model()
+            self.set_status("Ready")
         else:
             self.log("No audio data.")
+            self._swap_pending_model()
             self.set_status("Ready")
 
-    def _live_transcription_loop(self) -> None:
-        """Periodically transcribe the current audio buffer during recording."""
+    def _live_transcription_loop(self, stop: threading.Event) -> None:
+        """Periodically transcribe the current audio buffer during recording.
+
+        Args:
+            stop: Set when the recording ends; a pass in progress then stops
+                decoding and its text is discarded.
+
+        """
         last_transcription_time = time.time()
-        while not self.stop_live_transcribe.is_set():
+        while not stop.is_set():
             time.sleep(0.5)  # Update interval
+            # Even while live passes are throttled or paused
+            self._check_capture_health()
 
             throttle_limit = 0.8
             if (
@@ -435,25 +1156,71 @@ class WhisperAppController:
             ):  # Throttle to ~1s
                 continue
 
-            if not self.recorder or not self.transcriber:
+            # Also held back while the final pass or typing needs the CPU
+            if (
+                not self.recorder
+                or not self.transcriber
+                or not self.governor.live_ready()
+            ):
                 continue
 
-            audio_data = self.recorder.get_current_data()
+            if not self.recorder.recording and self.recorder.last_error:
+                # The input stream failed to open; don't wait for a stop
+                self.log(f"Audio capture failed: {self.recorder.last_error}")
+                self.device_registry.invalidate()  # device may have changed
+                self.set_status("Microphone Error")
+                return
+
+            # Optionally preview only the most recent audio (long sessions)
+            start = 0
+            live_window = self.config.get("live_window_seconds", 0) or (
+                SPILL_LIVE_WINDOW_SECONDS
+                if self.config.get("spill_chunk_seconds", 0)
+                else 0
+            )
+            if live_window:
+                window_samples = int(live_window * self.recorder.sample_rate)
+                start = max(0, self.recorder.sample_count - window_samples)
+
+            # Transcribed before the next pass, so the scratch buffer is safe
+            audio_data = self.recorder.get_current_data(start, reuse_buffer=True)
             audio_buffer_min_len = 8000
             if (
                 audio_data is not None and len(audio_data) > audio_buffer_min_len
             ):  # At least 0.5s of audio
                 try:
-                    text = self.transcriber.transcribe(audio_data)
-                    if text and text != self.pending_text:
-                        self.pending_text = text
-                        if self.on_preview_update:
-                            self.on_preview_update(text, None)
+                    # A buffer from the start grows between passes
+                    with self.governor.live_pass():
+                        text = self.transcriber.transcribe(
+                            audio_data, streaming=start == 0, cancel=stop
+                        )
+                    if not self._show_live_text(text, stop):
+                        return  # The final pass supersedes it
                     last_transcription_time = time.time()
                 except Exception:  # noqa: BLE001, S110
                     # Don't log errors too frequently in the loop
                     pass
 
+    def _show_live_text(self, text: str, stop: threading.Event) -> bool:
+        """Preview a live pass's text unless its recording has ended.
+
+        Args:
+            text: The live transcription.
+            stop: The recording's stop event.
+
+        Returns:
+            False if the recording has ended and the text was discarded.
+
+        """
+        with self._preview_lock:
+            if stop.is_set():
+                return False
+            if text and text != self.pending_text:
+                self.pending_text = text
+                if self.on_preview_update:
+                    self.on_preview_update(text, None)
+        return True
+
     def on_type_confirm(self) -> None:
         """Confirm and start typing the transcribed text."""
         if self.paused:
@@ -470,36 +1237,65 @@ class WhisperAppController:
             self._is_typing = True
 
             threading.Thread(
-                target=self._async_typing_wrapper, args=(text_to_type,), daemon=True
+                target=self._async_typing_wrapper,
+                args=(text_to_type, self.correction_base),
+                daemon=True,
             ).start()
         else:
             self.log("No text to type.")
 
-    def _async_typing_wrapper(self, text: str) -> None:
-        """Wrap asynchronous typing simulation."""
-        try:
-            do_refocus = self.config.get("refocus_window", True)
-            if do_refocus and self.window_manager and self.target_window_handle:
-                if not self.window_manager.focus_window(self.target_window_handle):
-                    self.log("Failed to restore focus.")
-                    self._is_typing = False
-                    return
-                time.sleep(0.3)
+    def _async_typing_wrapper(
+        self, text: str, correction_base: str | None = None
+    ) -> None:
+        """Wrap asynchronous typing simulation.
 
-            if self.typer:
-                self.typer.type_text(
-                    text,
-                    stop_event=self.typing_stop_event,
-                    check_focus=self._check_typing_focus,
-                )
+        Args:
+            text: The text to type.
+            correction_base: Previously typed text to edit into ``text``
+                instead of typing it from scratch.
 
-                if self.typing_stop_event.is_set():
-                    self.log("Typing stopped.")
-                else:
-                    self.log("Typing finished.")
+        """
+        try:
+            with self.governor.hold("typing"):
+                do_refocus = self.config.get("refocus_window", True)
+                if do_refocus and self.window_manager and self.target_window_handle:
+                    if not self.window_manager.focus_window(self.target_window_handle):
+                        self.log("Failed to restore focus.")
+                        self._is_typing = False
+                        return
+                    time.sleep(0.3)
+
+                if self.typer and correction_base is not None:
+                    self.log("Applying correction to typed text...")
+                    corrected = self.typer.correct_text(
+                        correction_base,
+                        text,
+                        stop_event=self.typing_stop_event,
+                        check_focus=self._check_typing_focus,
+                    )
+                    # A partial correction leaves the window in an unknown state
+                    self.typed_text = text if corrected else None
+                    self.correction_base = None
+                    if self.typing_stop_event.is_set():
+                        self.log("Correction stopped.")
+                    else:
+                        self.log("Correction finished.")
+                elif self.typer:
+                    typed = self.typer.type_text(
+                        text,
+                        stop_event=self.typing_stop_event,
+                        check_focus=self._check_typing_focus,
+                    )
+                    self.typed_text = text[:typed]
+
+                    if self.typing_stop_event.is_set():
+                        self.log("Typing stopped.")
+                    else:
+                        self.log("Typing finished.")
         finally:
             self._is_typing = False
             self.set_status("Ready")
+            self._schedule_idle_unload()
 
     def _check_typing_focus(self) -> bool:
         """Check if the target window still has focus."""
@@ -523,6 +1319,11 @@ class WhisperAppController:
         if self.is_processing:
             return
 
+        if self._is_typing:
+            # The typed text an improvement would correct isn't final yet
+            self.log("Busy typing, ignoring improve request.")
+            return
+
         if self.pending_text:
             if not self.config.get("gemini_api_key"):
                 self.log("AI Improvement disabled: Gemini API Key missing.")
@@ -541,11 +1342,9 @@ class WhisperAppController:
                             original_text, prompt_template=prompt_template
                         )
                         if improved:
-                            self.pending_text = improved
-                            self.log("AI Improvement applied.")
-                            if self.on_preview_update:
-                                self.on_preview_update(improved, original_text)
-                            self.set_status("Text Ready (Improved)")
+                            self._apply_improvement(improved, original_text)
+                    else:
+                        self.log("AI improver is still starting, try again shortly.")
                 except Exception as e:  # noqa: BLE001
                     self.log(f"AI Error: {e}")
                 finally:
@@ -554,3 +1353,20 @@ class WhisperAppController:
             threading.Thread(target=run_improve).start()
         else:
             self.log("No text to improve.")
+
+    def _apply_improvement(self, improved: str, original_text: str | None) -> None:
+        """Make improved text the pending text.
+
+        Args:
+            improved: The improved text.
+            original_text: The text it was improved from.
+
+        """
+        self.pending_text = improved
+        if self.typed_text:
+            # Already typed: the next type confirm edits it in place
+            self.correction_base = self.typed_text
+        self.log("AI Improvement applied.")
+        if self.on_preview_update:
+            self.on_preview_update(improved, original_text)
+        self.set_status("Text Ready (Improved)")
@@ -1,27 +1,131 @@
 """Audio recording utilities using sounddevice."""
 
 import threading
-from typing import Final
+import time
+from typing import Any, Final
 
 import numpy as np
 import sounddevice as sd
 
+from whisper_typing.audio_store import SpillingAudioStore
+from whisper_typing.preprocessing import AudioPreprocessor
+from whisper_typing.resampler import StreamingResampler
+
+INT16_SCALE: Final[float] = 32768.0
+
+
+class CaptureMetrics:
+    """Health counters for the audio input callback."""
+
+    # A callback arriving this much later than its block length is late
+    LATE_GAP_FACTOR: float = 1.5
+
+    def __init__(self) -> None:
+        """Initialize the CaptureMetrics."""
+        self._lock: Final[threading.Lock] = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self.callbacks = 0
+            self.input_overflows = 0
+            self.input_underflows = 0
+            self.callback_time_total = 0.0
+            self.callback_time_max = 0.0
+            self.max_gap = 0.0
+            self.late_callbacks = 0
+            self._last_adc_time: float | None = None
+
+    def record(
+        self,
+        duration: float,
+        adc_time: float | None,
+        block_seconds: float,
+        status: sd.CallbackFlags | None,
+    ) -> None:
+        """Record one callback invocation.
+
+        Args:
+            duration: Time spent inside the callback in seconds.
+            adc_time: Capture timestamp of the block's first sample, or the
+                callback's arrival time where the host API has none.
+            block_seconds: Duration of the audio in the block.
+            status: The stream's callback flags.
+
+        """
+        with self._lock:
+            self.callbacks += 1
+            self.callback_time_total += duration
+            self.callback_time_max = max(self.callback_time_max, duration)
+            if status is not None and status.input_overflow:
+                self.input_overflows += 1
+            if status is not None and status.input_underflow:
+                self.input_underflows += 1
+            if adc_time is not None:
+                if self._last_adc_time is not None:
+                    gap = adc_time - self._last_adc_time
+                    self.max_gap = max(self.max_gap, gap)
+                    if gap > block_seconds * self.LATE_GAP_FACTOR:
+                        self.late_callbacks += 1
+                self._last_adc_time = adc_time
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current counters.
+
+        Returns:
+            A dictionary of metric names to values (times in milliseconds).
+
+        """
+        with self._lock:
+            mean = self.callback_time_total / self.callbacks if self.callbacks else 0
+            return {
+                "callbacks": self.callbacks,
+                "input_overflows": self.input_overflows,
+                "input_underflows": self.input_underflows,
+                "callback_ms_mean": mean * 1000,
+                "callback_ms_max": self.callback_time_max * 1000,
+                "max_gap_ms": self.max_gap * 1000,
+                "late_callbacks": self.late_callbacks,
+            }
+
 
 class AudioRecorder:
     """Handles audio capture from input devices."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         sample_rate: int = 16000,
         channels: int = 1,
         device_index: int | str | None = None,
+        *,
+        preroll_ms: int = 0,
+        capture_rate: int | None = None,
+        dtype: str = "float32",
+        spill_chunk_seconds: float = 0,
+        spill_dir: str | None = None,
+        preprocess: bool = False,
     ) -> None:
         """Initialize the AudioRecorder.
 
         Args:
-            sample_rate: Audio sampling rate in Hz.
+            sample_rate: Sampling rate of the recorded audio in Hz.
             channels: Number of audio channels.
             device_index: Index or name of the input device.
+            preroll_ms: If non-zero, keep the input stream open between
+                recordings and prepend this much already captured audio to
+                each new recording.
+            capture_rate: Rate to open the device at. Defaults to the
+                device's native rate; audio is resampled to ``sample_rate``.
+            dtype: Sample format kept in memory, "float32" or "int16".
+                int16 halves memory; audio is converted to float32 only
+                when it is read.
+            spill_chunk_seconds: If non-zero, write the recording to a
+                memory-mapped file in chunks of this length, keeping only
+                the latest partial chunk in memory.
+            spill_dir: Directory for spill files (system temp if None).
+            preprocess: Remove DC offset and low-frequency noise and level
+                the loudness of captured audio before storing it.
 
         """
         self.sample_rate = sample_rate
@@ -32,6 +136,31 @@ class AudioRecorder:
         self.frames: list[np.ndarray] = []
         self.thread: threading.Thread | None = None
         self._lock: Final[threading.Lock] = threading.Lock()
+        self._stop_event: Final[threading.Event] = threading.Event()
+        self.capture_rate = capture_rate
+        self._stream_rate = capture_rate or sample_rate
+        self._resampler: StreamingResampler | None = None
+        self.metrics = CaptureMetrics()
+        self.preprocessor = (
+            AudioPreprocessor(sample_rate, channels) if preprocess else None
+        )
+        self.dtype = np.dtype(dtype)
+        # Reusable float32 output for live reads of int16 storage
+        self._scratch: np.ndarray | None = None
+        # Long-session mode: the recording lives in a spill file, not frames
+        self.spill_chunk_samples = int(spill_chunk_seconds * sample_rate)
+        self.spill_dir = spill_dir
+        self.store: SpillingAudioStore | None = None
+
+        # Always-open mode: idle callbacks fill a circular pre-roll buffer
+        self.stream: sd.InputStream | None = None
+        self.last_error: Exception | None = None
+        self._preroll: np.ndarray | None = None
+        self._preroll_pos = 0
+        self._preroll_filled = 0
+        if preroll_ms > 0:
+            preroll_len = int(sample_rate * preroll_ms / 1000)
+            self._preroll = np.zeros((preroll_len, channels), dtype=self.dtype)
 
     @staticmethod
     def list_devices() -> list[tuple[int, str]]:
@@ -51,69 +180,349 @@ class AudioRecorder:
     def _callback(
         self,
         indata: np.ndarray,
-        _frames: int,
-        _time: sd.RawInputStream,
+        frames: int,
+        time_info: Any,  # noqa: ANN401
         status: sd.CallbackFlags,
     ) -> None:
         """Handle audio data from sounddevice callback.
 
         Args:
             indata: The captured audio data.
-            _frames: Missing from signature but provided by sounddevice.
-            _time: Missing from signature but provided by sounddevice.
+            frames: Number of frames in the block.
+            time_info: Stream timestamps provided by sounddevice.
             status: Callback flags.
 
         """
-        if status:
-            # Optionally log status here
-            pass
+        started = time.perf_counter()
+        try:
+            self._handle_block(indata)
+        finally:
+            adc_time = getattr(time_info, "inputBufferAdcTime", None)
+            if not isinstance(adc_time, float) or adc_time <= 0:
+                # MME and DirectSound on Windows report 0: time the arrival
+                adc_time = started
+            self.metrics.record(
+                time.perf_counter() - started,
+                adc_time,
+                frames / self._stream_rate,
+                status,
+            )
+
+    def _handle_block(self, indata: np.ndarray) -> None:
+        """Resample, preprocess and store one captured block.
+
+        Args:
+            indata: The captured audio data.
+
+        """
+        if self._resampler is None and self.preprocessor is None:
+            block = indata.copy()
+        else:
+            block = indata
+            if self._resampler is not None:
+                block = self._resampler.process(block)
+                if not len(block):
+                    return
+            if self.preprocessor is not None:
+                block = self.preprocessor.process(block)
+            block = self._to_storage(block)
+        with self._lock:
+            if self.recording or self._preroll is None:
+                self._append(block)
+            else:
+                self._write_preroll(block)
+
+    def _append(self, block: np.ndarray) -> None:
+        """Add a block to the current recording. Caller holds the lock.
+
+        Args:
+            block: Audio samples in the storage format.
+
+        """
+        if self.store is not None:
+            self.store.append(block)
+        else:
+            self.frames.append(block)
+
+    def _reset_recording(self, preroll: np.ndarray | None = None) -> None:
+        """Start an empty recording buffer. Caller holds the lock.
+
+        Args:
+            preroll: Optional audio to start the recording with.
+
+        """
+        self.frames = []
+        self.metrics.reset()
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        if self.spill_chunk_samples:
+            self.store = SpillingAudioStore(
+                self.spill_chunk_samples,
+                channels=self.channels,
+                dtype=self.dtype.name,
+                directory=self.spill_dir,
+            )
+        if preroll is not None:
+            self._append(preroll)
+
+    @property
+    def sample_count(self) -> int:
+        """Number of samples in the current recording."""
+        with self._lock:
+            if self.store is not None:
+                return len(self.store)
+            return sum(len(frame) for frame in self.frames)
+
+    def _to_storage(self, block: np.ndarray) -> np.ndarray:
+        """Convert a float32 block to the storage sample format.
+
+        Args:
+            block: Float audio in the range [-1, 1].
+
+        Returns:
+            The block in the recorder's storage dtype.
+
+        """
+        if self.dtype == np.int16:
+            scaled = np.clip(block * INT16_SCALE, -INT16_SCALE, INT16_SCALE - 1)
+            return scaled.astype(np.int16)
+        return block
+
+    def _write_preroll(self, indata: np.ndarray) -> None:
+        """Write a block into the circular pre-roll buffer.
+
+        Args:
+            indata: The captured audio block.
+
+        """
+        ring = self._preroll
+        size = len(ring)
+        block = indata[-size:]
+        n = len(block)
+        end = self._preroll_pos + n
+        if end <= size:
+            ring[self._preroll_pos : end] = block
+        else:
+            split = size - self._preroll_pos
+            ring[self._preroll_pos :] = block[:split]
+            ring[: n - split] = block[split:]
+        self._preroll_pos = end % size
+        self._preroll_filled = min(size, self._preroll_filled + n)
+
+    def _snapshot_preroll(self) -> np.ndarray | None:
+        """Return the buffered pre-roll audio in chronological order.
+
+        Returns:
+            The pre-roll audio, or None if nothing has been buffered.
+
+        """
+        ring = self._preroll
+        if ring is None or not self._preroll_filled:
+            return None
+        start = (self._preroll_pos - self._preroll_filled) % len(ring)
+        if start < self._preroll_pos:
+            return ring[start : self._preroll_pos].copy()
+        return np.concatenate((ring[start:], ring[: self._preroll_pos]))
+
+    def open(self) -> bool:
+        """Open the always-open input stream used for pre-roll capture.
+
+        Returns:
+            True if the stream is open, False if pre-roll is disabled or the
+            device could not be opened (recording then opens it on demand).
+
+        """
+        if self._preroll is None:
+            return False
+        if self.stream is not None:
+            return True
+        try:
+            stream = self._create_stream()
+            stream.start()
+        except Exception as e:  # noqa: BLE001
+            self.last_error = e
+            return False
+        self.stream = stream
+        return True
+
+    def close(self) -> None:
+        """Close the always-open input stream and any spill file."""
         with self._lock:
-            self.frames.append(indata.copy())
+            if self.store is not None:
+                self.store.close()
+                self.store = None
+        stream, self.stream = self.stream, None
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception as e:  # noqa: BLE001
+                self.last_error = e
+
+    def _native_rate(self) -> int:
+        """Look up the default sampling rate of the input device.
+
+        Returns:
+            The device's native rate, or ``sample_rate`` if unknown.
+
+        """
+        try:
+            info = sd.query_devices(self.device_index, "input")
+            return int(info["default_samplerate"])
+        except Exception:  # noqa: BLE001
+            return self.sample_rate
+
+    def _create_stream(self) -> sd.InputStream:
+        """Create an input stream at the device's capture rate.
+
+        Returns:
+            The (not yet started) input stream.
+
+        """
+        rate = self.capture_rate or self._native_rate()
+        self._stream_rate = rate
+        if rate == self.sample_rate:
+            self._resampler = None
+        else:
+            self._resampler = StreamingResampler(rate, self.sample_rate, self.channels)
+        if self.preprocessor is not None:
+            self.preprocessor.reset()
+        # Resampling and preprocessing work in float; storage format is
+        # applied after
+        converted = self._resampler is not None or self.preprocessor is not None
+        return sd.InputStream(
+            samplerate=rate,
+            dtype="float32" if converted else self.dtype.name,
+            channels=self.channels,
+            device=self.device_index,
+            callback=self._callback,
+        )
 
     def _record(self) -> None:
         """Run the internal recording loop."""
         try:
-            with sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=self.channels,
-                device=self.device_index,
-                callback=self._callback,
-            ):
-                while self.recording:
-                    sd.sleep(100)
-        except Exception:  # noqa: BLE001
+            with self._create_stream():
+                # Leaving the context stops the stream, which returns only
+                # once the last pending callback has been delivered
+                self._stop_event.wait()
+        except Exception as e:  # noqa: BLE001
+            self.last_error = e
             self.recording = False
+            return
+
+        if self._resampler is not None:
+            tail = self._resampler.flush()
+            if len(tail) and self.preprocessor is not None:
+                tail = self.preprocessor.process(tail)
+            if len(tail):
+                with self._lock:
+                    self._append(self._to_storage(tail))
 
     def start(self) -> None:
         """Start recording."""
         if self.recording:
             return
 
+        if self.open():
+            # Stream is already running: capture starts with the next block
+            with self._lock:
+                self._reset_recording(self._snapshot_preroll())
+                self._preroll_filled = 0
+                self.recording = True
+            return
+
         self.recording = True
+        self.last_error = None
+        self._stop_event.clear()
         with self._lock:
-            self.frames = []  # Clear frames
+            self._reset_recording()  # Clear frames
         self.thread = threading.Thread(target=self._record)
         self.thread.start()
 
-    def get_current_data(self) -> np.ndarray | None:
+    def get_current_data(
+        self, start: int = 0, *, reuse_buffer: bool = False
+    ) -> np.ndarray | None:
         """Get the current accumulated audio data as a numpy array.
 
+        Args:
+            start: Index of the first sample to return.
+            reuse_buffer: Write into a scratch buffer owned by the recorder
+                instead of a new array. The result is only valid until the
+                next call with ``reuse_buffer=True``.
+
         Returns:
-            The accumulated audio data as a 1D numpy array, or None if no data.
+            The accumulated audio data as a float32 1D numpy array for mono
+            (``(samples, channels)`` otherwise), or None if no data. In
+            long-session mode float32 audio is returned as a view into the
+            spill file when possible.
 
         """
         with self._lock:
-            if not self.frames:
-                return None
+            store = self.store
             data = list(self.frames)  # Copy list
 
-        if not data:
+        if store is not None:
+            region = store.read(start)
+            if not len(region):
+                return None
+            if region.dtype == np.float32 and not reuse_buffer:
+                # Zero-copy: already in the transcriber's format
+                return region.reshape(-1) if self.channels == 1 else region
+            data = [region]
+            start = 0
+
+        total = sum(len(frame) for frame in data)
+        if start >= total:
             return None
+        return self._to_float(data, start, total, reuse_buffer=reuse_buffer)
+
+    def _to_float(
+        self, data: list[np.ndarray], start: int, total: int, *, reuse_buffer: bool
+    ) -> np.ndarray:
+        """Convert stored blocks from ``start`` onwards to one float32 array.
+
+        Args:
+            data: The stored blocks.
+            start: Index of the first sample to convert.
+            total: Total number of samples in ``data``.
+            reuse_buffer: Write into the recorder's scratch buffer.
+
+        Returns:
+            The converted audio (1D for mono).
 
-        # Concatenate and flatten to 1D array for mono
-        recording = np.concatenate(data, axis=0)
+        """
+        shape = (total - start, self.channels)
+        if reuse_buffer:
+            if self._scratch is None or len(self._scratch) < shape[0]:
+                # Grow geometrically so a growing recording reallocates rarely
+                self._scratch = np.empty(
+                    (max(shape[0], int(shape[0] * 1.5)), self.channels),
+                    dtype=np.float32,
+                )
+            recording = self._scratch[: shape[0]]
+        else:
+            recording = np.empty(shape, dtype=np.float32)
+
+        # Convert only the requested region, block by block
+        pos = 0
+        offset = start
+        for frame in data:
+            if offset >= len(frame):
+                offset -= len(frame)
+                continue
+            chunk = frame[offset:].reshape(-1, self.channels)
+            offset = 0
+            out = recording[pos : pos + len(chunk)]
+            if chunk.dtype == np.int16:
+                np.multiply(chunk, 1.0 / INT16_SCALE, out=out)
+            else:
+                out[...] = chunk
+            pos += len(chunk)
+
+        # Flatten to 1D array for mono
         if self.channels == 1:
-            recording = recording.flatten()
+            return recording.reshape(-1)
         return recording
 
     def stop(self) -> np.ndarray | None:
@@ -126,8 +535,13 @@ class AudioRecorder:
         if not self.recording:
             return None
 
-        self.recording = False
+        with self._lock:
+            self.recording = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join()
 
+        if self.store is not None:
+            # One contiguous file region lets the result be a single view
+            self.store.flush()
         return self.get_current_data()
@@ -0,0 +1,205 @@
+"""Disk-backed audio storage for long recording sessions."""
+
+import atexit
+import tempfile
+import threading
+from pathlib import Path
+from typing import Final
+
+import numpy as np
+
+# Spill files still mapped when their store closed, deleted once released
+_undeleted: set[Path] = set()
+_undeleted_lock: Final[threading.Lock] = threading.Lock()
+
+
+def delete_released_spill_files() -> None:
+    """Delete spill files whose last memory-mapped views are gone.
+
+    Windows refuses to delete a file while any view of it is mapped, and
+    views returned by ``SpillingAudioStore.read`` may outlive the store.
+    Such files are retried here, when the next store starts and at exit.
+    """
+    with _undeleted_lock:
+        for path in list(_undeleted):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue
+            _undeleted.discard(path)
+
+
+atexit.register(delete_released_spill_files)
+
+
+class SpillingAudioStore:
+    """Append-only audio buffer that spills finalized chunks to disk.
+
+    Only the most recent, not yet spilled audio (less than one chunk) is
+    kept in memory. Spilled audio is read back through a read-only memory
+    map, so reading any range inside it is a zero-copy view and pages the
+    OS can drop again.
+    """
+
+    def __init__(
+        self,
+        chunk_samples: int,
+        channels: int = 1,
+        dtype: str = "float32",
+        directory: str | None = None,
+    ) -> None:
+        """Initialize the SpillingAudioStore.
+
+        Args:
+            chunk_samples: Number of samples written to disk at a time.
+            channels: Number of audio channels.
+            dtype: Sample format of the stored audio.
+            directory: Directory for the spill file (system temp if None).
+
+        """
+        self.chunk_samples = chunk_samples
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self._lock: Final[threading.Lock] = threading.Lock()
+
+        delete_released_spill_files()
+        with tempfile.NamedTemporaryFile(
+            prefix="whisper-typing-", suffix=".pcm", dir=directory, delete=False
+        ) as f:
+            self.path = Path(f.name)
+        self._file = self.path.open("r+b")
+        self._spilled = 0
+        self._resident: list[np.ndarray] = []
+        self._resident_len = 0
+        self._map: np.memmap | None = None
+
+    def __len__(self) -> int:
+        """Return the total number of stored samples."""
+        with self._lock:
+            return self._spilled + self._resident_len
+
+    @property
+    def resident_samples(self) -> int:
+        """Number of samples currently held in memory."""
+        with self._lock:
+            return self._resident_len
+
+    def append(self, block: np.ndarray) -> None:
+        """Append audio, spilling whole chunks to disk.
+
+        Args:
+            block: Audio samples shaped ``(frames, channels)``.
+
+        """
+        with self._lock:
+            self._resident.append(block.reshape(-1, self.channels))
+            self._resident_len += len(block)
+            if self._resident_len >= self.chunk_samples:
+                self._spill(self._resident_len // self.chunk_samples)
+
+    def flush(self) -> None:
+        """Spill all resident audio so the whole recording is on disk."""
+        with self._lock:
+            if self._resident_len:
+                self._write(np.concatenate(self._resident), self._resident_len)
+                self._resident = []
+                self._resident_len = 0
+
+    def read(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Read a range of samples.
+
+        Args:
+            start: Index of the first sample.
+            stop: Index after the last sample (end of the recording if None).
+
+        Returns:
+            The samples shaped ``(frames, channels)``. A view into the spill
+            file when the range has been spilled, otherwise a copy.
+
+        """
+        with self._lock:
+            total = self._spilled + self._resident_len
+            stop = total if stop is None else min(stop, total)
+            start = min(start, stop)
+            spilled = self._spilled
+            resident = list(self._resident)
+            mapped = self._mapped(spilled) if start < spilled else None
+
+        if stop <= spilled and mapped is not None:
+            return mapped[start:stop]
+
+        parts = []
+        if mapped is not None:
+            parts.append(mapped[start:])
+        # Resident blocks follow the spilled region
+        offset = spilled
+        for block in resident:
+            lo = max(start - offset, 0)
+            hi = min(stop - offset, len(block))
+            if lo < hi:
+                parts.append(block[lo:hi])
+            offset += len(block)
+        if not parts:
+            return np.zeros((0, self.channels), dtype=self.dtype)
+        return np.concatenate(parts)
+
+    def close(self) -> None:
+        """Release the memory map and delete the spill file.
+
+        If a view returned by ``read`` still maps the file (Windows won't
+        delete it then), deletion is retried later, see
+        ``delete_released_spill_files``.
+        """
+        with self._lock:
+            self._map = None
+            self._resident = []
+            self._resident_len = 0
+            self._file.close()
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError:
+            with _undeleted_lock:
+                _undeleted.add(self.path)
+
+    def _spill(self, chunks: int) -> None:
+        """Write whole chunks from the front of the resident blocks.
+
+        Args:
+            chunks: Number of chunks to write.
+
+        """
+        data = np.concatenate(self._resident)
+        count = chunks * self.chunk_samples
+        self._write(data[:count], count)
+        rest = data[count:]
+        self._resident = [rest] if len(rest) else []
+        self._resident_len = len(rest)
+
+    def _write(self, data: np.ndarray, count: int) -> None:
+        """Append samples to the spill file.
+
+        Args:
+            data: The samples to write.
+            count: Number of samples in ``data``.
+
+        """
+        self._file.seek(0, 2)
+        self._file.write(np.ascontiguousarray(data, dtype=self.dtype).tobytes())
+        self._file.flush()
+        self._spilled += count
+
+    def _mapped(self, spilled: int) -> np.memmap:
+        """Return a read-only map covering the spilled samples.
+
+        Args:
+            spilled: Number of samples written to the file.
+
+        Returns:
+            The memory map.
+
+        """
+        if self._map is None or len(self._map) != spilled:
+            self._map = np.memmap(
+                self.path, dtype=self.dtype, mode="r", shape=(spilled, self.channels)
+            )
+        return self._map
@@ -0,0 +1,701 @@
+"""Speech recognition runtimes the Transcriber can decode with."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, Protocol
+
+import numpy as np
+import torch
+from faster_whisper import WhisperModel, decode_audio
+from faster_whisper.tokenizer import _LANGUAGE_CODES
+from faster_whisper.transcribe import Segment, get_compression_ratio
+from faster_whisper.vad import get_speech_timestamps
+from huggingface_hub import constants
+
+from whisper_typing.constants import ASSISTANT_MODELS, WHISPER_NAME_MAP
+from whisper_typing.features import StreamingFeatureExtractor
+from whisper_typing.model_manager import ModelManager
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+SAMPLE_RATE: Final[int] = 16000
+# Audio the generate-based backends decode per call
+WINDOW_SAMPLES: Final[int] = 30 * SAMPLE_RATE
+DEFAULT_BACKEND: Final[str] = "faster-whisper"
+
+
+class DecodeInfo(NamedTuple):
+    """What a backend reports about a transcription besides its segments."""
+
+    language: str
+    language_probability: float
+    duration: float
+
+
+class AsrBackend(Protocol):
+    """A speech recognition runtime.
+
+    Backends decode like ``WhisperModel.transcribe``: they take the same
+    keyword options (ignoring those they don't support) and return lazily
+    decoded faster-whisper ``Segment`` objects with an info object that
+    has at least a ``language``.
+    """
+
+    name: str
+    model_path: str
+
+    def transcribe(
+        self,
+        audio: str | np.ndarray,
+        **options: Any,  # noqa: ANN401
+    ) -> tuple[Iterable[Segment], Any]:
+        """Decode a recording."""
+        ...
+
+    def stream(
+        self,
+        audio: np.ndarray,
+        **options: Any,  # noqa: ANN401
+    ) -> tuple[Iterable[Segment], Any]:
+        """Decode the live buffer of a recording, extended since the last call."""
+        ...
+
+    def reset_stream(self) -> None:
+        """Forget what was cached for the previous recording's live buffer."""
+        ...
+
+    def detect_language(
+        self,
+        audio: np.ndarray,
+        **options: Any,  # noqa: ANN401
+    ) -> tuple[str, float, list[tuple[str, float]]]:
+        """Detect the spoken language."""
+        ...
+
+
+class FasterWhisperBackend:
+    """Decodes CTranslate2 Whisper models with faster-whisper."""
+
+    name = "faster-whisper"
+
+    def __init__(self, model: WhisperModel, model_path: str) -> None:
+        """Initialize the FasterWhisperBackend.
+
+        Args:
+            model: The loaded model.
+            model_path: The directory or name the model was loaded from.
+
+        """
+        self.model = model
+        self.model_path = model_path
+        # Installed on the first streaming pass
+        self.streaming_features: StreamingFeatureExtractor | None = None
+
+    @classmethod
+    def load(  # noqa: PLR0913
+        cls,
+        model_id: str,
+        *,
+        device: str,
+        compute_type: str,
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        download_root: str | None = None,
+    ) -> FasterWhisperBackend:
+        """Load a model, from a complete local copy if there is one.
+
+        Args:
+            model_id: HuggingFace model ID, faster-whisper model name or
+                transformers checkpoint.
+            device: Device to run the model on ('cpu' or 'cuda').
+            compute_type: Quantization type for the model.
+            cpu_threads: CPU threads per decode (0 = library default).
+            num_workers: Decodes that can run concurrently.
+            download_root: Directory to download models to.
+
+        Returns:
+            The backend.
+
+        """
+        # A complete local copy loads without asking the hub for updates;
+        # transformers checkpoints are converted to one on first use
+        manager = ModelManager(download_root)
+        local_path = manager.local_path(model_id) or manager.convert(model_id)
+        model_path = local_path or WHISPER_NAME_MAP.get(model_id, model_id)
+        model = WhisperModel(
+            model_path,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+            download_root=download_root,
+            local_files_only=local_path is not None,
+        )
+        return cls(model, model_path)
+
+    def transcribe(
+        self,
+        audio: str | np.ndarray,
+        **options: Any,  # noqa: ANN401
+    ) -> tuple[Iterable[Segment], Any]:
+        """Decode a recording.
+
+        Args:
+            audio: File path to audio or numpy array of audio samples.
+            **options: Options for ``WhisperModel.transcribe``.
+
+        Returns:
+            The lazily decoded segments and the transcription info.
+
+        """
+        return self.model.transcribe(audio, **options)
+
+    def stream(
+        self,
+        audio: np.ndarray,
+        **options: Any,  # noqa: ANN401
+    ) -> tuple[Iterable[Segment], Any]:
+        """Decode the live buffer, updating its features incrementally.
+
+        Args:
+            audio: The recording so far (float32, 16kHz).
+            **options: Options for ``WhisperModel.transcribe``.
+
+        Returns:
+            The lazily decoded segments and the transcription info.
+
+        """
+        features = self._streaming_extractor()
+        features.prepare(audio)
+        try:
+            # faster-whisper computes the features before returning
+            return self.model.transcribe(audio, **options)
+        finally:
+            features.release()
+
+    def reset_stream(self) -> None:
+        """Forget the incremental features of the previous recording."""
+        if self.streaming_features:
+            self.streaming_features.incremental.reset()
+
+    def detect_language(
+        self,
+        audio: np.ndarray,
+        **options: Any,  # noqa: ANN401
+    ) -> tuple[str, float, list[tuple[str, float]]]:
+        """Detect the spoken language.
+
+        Args:
+            audio: Audio samples (float32, 16kHz).
+            **options: Options for ``WhisperModel.detect_language``.
+
+        Returns:
+            The language, its probability and the probabilities of all
+            languages.
+
+        """
+        return self.model.detect_language(audio, **options)
+
+    def _streaming_extractor(self) -> StreamingFeatureExtractor:
+        """Return the model's streaming feature extractor, installing it.
+
+        Returns:
+            The streaming feature extractor.
+
+        """
+        if self.streaming_features is None:
+            self.streaming_features = StreamingFeatureExtractor(
+                self.model.feature_extractor
+            )
+            self.model.feature_extractor = self.streaming_features
+        return self.streaming_features
+
+
+def onnx_export_dir(model_id: str, download_root: str | None = None) -> Path:
+    """Return where the ONNX export of a model is kept.
+
+    Args:
+        model_id: HuggingFace model ID.
+        download_root: Directory models are downloaded to.
+
+    Returns:
+        The export directory.
+
+    """
+    root = Path(download_root or constants.HF_HUB_CACHE)
+    return root / "onnx" / model_id.replace("/", "--")
+
+
+class GenerateBackend:
+    """Decodes Hugging Face Whisper models through ``generate``.
+
+    Shared by the backends built on transformers-style models. Audio is
+    decoded in 30 second windows, one segment per window.
+    """
+
+    name = "generate"
+
+    def __init__(self, model: Any, processor: Any, model_path: str) -> None:  # noqa: ANN401
+        """Initialize the GenerateBackend.
+
+        Args:
+            model: A speech-to-text model with ``generate``.
+            processor: The matching ``WhisperProcessor``.
+            model_path: The directory or ID the model was loaded from.
+
+        """
+        self.model = model
+        self.processor = processor
+        self.model_path = model_path
+        tokenizer = processor.tokenizer
+        self.sot_token: int = tokenizer.convert_tokens_to_ids("<|startoftranscript|>")
+        self.eot_token: int = tokenizer.eos_token_id
+        # English-only checkpoints have no language tokens
+        special = set(tokenizer.additional_special_tokens)
+        self.language_tokens: dict[str, int] = {
+            code: tokenizer.convert_tokens_to_ids(f"<|{code}|>")
+            for code in _LANGUAGE_CODES
+            if f"<|{code}|>" in special
+        }
+
+    def transcribe(
+        self,
+        audio: str | np.ndarray,
+        *,
+        beam_size: int = 5,
+        language: str | None = None,
+        max_new_tokens: int | None = None,
+        **_options: Any,  # noqa: ANN401
+    ) -> tuple[Iterator[Segment], DecodeInfo]:
+        """Decode a recording.
+
+        Args:
+            audio: File path to audio or numpy array of audio samples.
+            beam_size: Beam size for the search.
+            language: Language code, or None to detect it.
+            max_new_tokens: Token limit per window.
+            **_options: faster-whisper options this backend doesn't support.
+
+        Returns:
+            The lazily decoded segments and the transcription info.
+
+        """
+        if isinstance(audio, str):
+            audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+        probability = 1.0
+        if language is None:
+            language, probability, _ = self.detect_language(audio)
+        info = DecodeInfo(language, probability, len(audio) / SAMPLE_RATE)
+        return self._segments(audio, beam_size, language, max_new_tokens), info
+
+    def stream(
+        self,
+        audio: np.ndarray,
+        **options: Any,  # noqa: ANN401
+    ) -> tuple[Iterator[Segment], DecodeInfo]:
+        """Decode the live buffer of a recording.
+
+        Nothing is cached between live passes.
+
+        Args:
+            audio: The recording so far (float32, 16kHz).
+            **options: Decoding options, as for ``transcribe``.
+
+        Returns:
+            The lazily decoded segments and the transcription info.
+
+        """
+        return self.transcribe(audio, **options)
+
+    def reset_stream(self) -> None:
+        """Nothing is cached between live passes."""
+
+    def detect_language(
+        self,
+        audio: np.ndarray,
+        *,
+        vad_filter: bool = False,
+        **_options: Any,  # noqa: ANN401
+    ) -> tuple[str, float, list[tuple[str, float]]]:
+        """Detect the spoken language from the first decoder step.
+
+        Args:
+            audio: Audio samples (float32, 16kHz).
+            vad_filter: Only look at the parts of the audio with speech.
+            **_options: faster-whisper options this backend doesn't support.
+
+        Returns:
+            The language, its probability and the probabilities of all
+            languages.
+
+        Raises:
+            ValueError: If ``vad_filter`` is set and there is no speech.
+
+        """
+        if not self.language_tokens:
+            return "en", 1.0, [("en", 1.0)]
+        if vad_filter:
+            speech = get_speech_timestamps(audio)
+            if not speech:
+                msg = "No speech found in the audio"
+                raise ValueError(msg)
+            audio = np.concatenate([audio[s["start"] : s["end"]] for s in speech])
+
+        features = self._features(audio[:WINDOW_SAMPLES])
+        with torch.inference_mode():
+            logits = self.model(
+                input_features=features,
+                decoder_input_ids=torch.tensor(
+                    [[self.sot_token]], device=features.device
+                ),
+            ).logits[0, -1]
+        codes = list(self.language_tokens)
+        probabilities = torch.softmax(
+            logits[list(self.language_tokens.values())].float(), dim=-1
+        ).tolist()
+        ranked = sorted(
+            zip(codes, probabilities, strict=True), key=lambda x: x[1], reverse=True
+        )
+        return ranked[0][0], ranked[0][1], ranked
+
+    def _generate_options(self, beam_size: int) -> dict[str, Any]:
+        """Return the search options for ``generate``.
+
+        Args:
+            beam_size: Requested beam size.
+
+        Returns:
+            Keyword arguments for ``generate``.
+
+        """
+        return {"num_beams": beam_size}
+
+    def _features(self, audio: np.ndarray) -> torch.Tensor:
+        """Compute the log-mel input features of up to 30 seconds of audio.
+
+        Args:
+            audio: Audio samples (float32, 16kHz).
+
+        Returns:
+            The input features.
+
+        """
+        return self.processor(
+            audio, sampling_rate=SAMPLE_RATE, return_tensors="pt"
+        ).input_features
+
+    def _segments(
+        self,
+        audio: np.ndarray,
+        beam_size: int,
+        language: str,
+        max_new_tokens: int | None,
+    ) -> Iterator[Segment]:
+        """Decode the audio window by window.
+
+        Args:
+            audio: Audio samples (float32, 16kHz).
+            beam_size: Beam size for the search.
+            language: Language code.
+            max_new_tokens: Token limit per window.
+
+        Yields:
+            One segment per window.
+
+        """
+        options: dict[str, Any] = {
+            **self._generate_options(beam_size),
+            "max_new_tokens": max_new_tokens,
+            "return_dict_in_generate": True,
+            "output_scores": True,
+        }
+        if self.language_tokens:
+            options.update(language=language, task="transcribe")
+
+        for index, start in enumerate(range(0, len(audio), WINDOW_SAMPLES)):
+            end = min(len(audio), start + WINDOW_SAMPLES)
+            with torch.inference_mode():
+                output = self.model.generate(
+                    self._features(audio[start:end]), **options
+                )
+                scores = self.model.compute_transition_scores(
+                    output.sequences,
+                    output.scores,
+                    getattr(output, "beam_indices", None),
+                    normalize_logits=True,
+                )
+            tokens = [
+                token
+                for token in output.sequences[0].tolist()
+                if token < self.eot_token
+            ]
+            text = self.processor.batch_decode(
+                output.sequences, skip_special_tokens=True
+            )[0]
+            yield Segment(
+                id=index,
+                seek=start,
+                start=start / SAMPLE_RATE,
+                end=end / SAMPLE_RATE,
+                text=text,
+                tokens=tokens,
+                avg_logprob=float(scores[0].mean()) if scores.numel() else 0.0,
+                compression_ratio=get_compression_ratio(text),
+                no_speech_prob=0.0,  # Not reported by generate
+                words=None,
+                temperature=0.0,
+            )
+
+
+class OnnxBackend(GenerateBackend):
+    """Decodes Hugging Face Whisper checkpoints with ONNX Runtime via Optimum.
+
+    The checkpoint is exported to ONNX on first use and the export is kept
+    next to the downloaded models.
+    """
+
+    name = "onnx"
+
+    @classmethod
+    def load(  # noqa: PLR0913
+        cls,
+        model_id: str,
+        *,
+        device: str,
+        compute_type: str,  # noqa: ARG003
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        download_root: str | None = None,
+    ) -> OnnxBackend:
+        """Load a checkpoint, exporting it to ONNX the first time.
+
+        Args:
+            model_id: HuggingFace model ID of a transformers checkpoint.
+            device: Device to run the model on ('cpu' or 'cuda').
+            compute_type: Ignored; the export keeps the checkpoint's precision.
+            cpu_threads: Threads per ONNX Runtime session (0 = default).
+            num_workers: Sessions' inter-op threads.
+            download_root: Directory to download models to.
+
+        Returns:
+            The backend.
+
+        """
+        # Imported here: transformers and optimum take seconds to import
+        import onnxruntime  # noqa: PLC0415
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq  # noqa: PLC0415
+        from transformers import WhisperProcessor  # noqa: PLC0415
+
+        session_options = onnxruntime.SessionOptions()
+        if cpu_threads:
+            session_options.intra_op_num_threads = cpu_threads
+        session_options.inter_op_num_threads = num_workers
+        provider = (
+            "CUDAExecutionProvider" if device == "cuda" else "CPUExecutionProvider"
+        )
+
+        export_dir = onnx_export_dir(model_id, download_root)
+        if (export_dir / "config.json").is_file():
+            model = ORTModelForSpeechSeq2Seq.from_pretrained(
+                export_dir, provider=provider, session_options=session_options
+            )
+            processor = WhisperProcessor.from_pretrained(export_dir)
+        else:
+            model = ORTModelForSpeechSeq2Seq.from_pretrained(
+                model_id,
+                export=True,
+                cache_dir=download_root,
+                provider=provider,
+                session_options=session_options,
+            )
+            processor = WhisperProcessor.from_pretrained(
+                model_id, cache_dir=download_root
+            )
+            model.save_pretrained(export_dir)
+            processor.save_pretrained(export_dir)
+        return cls(model, processor, str(export_dir))
+
+
+class AssistedBackend(GenerateBackend):
+    """Decodes with a PyTorch Whisper model helped by a distilled assistant.
+
+    In assisted (speculative) generation the small assistant drafts a few
+    tokens at a time and the main model checks them all in one forward
+    pass, keeping the drafted tokens it agrees with. The text is the main
+    model's greedy result, but most of its sequential decoder steps are
+    replaced by cheap assistant steps.
+    """
+
+    name = "assisted"
+
+    def __init__(
+        self,
+        model: Any,  # noqa: ANN401
+        processor: Any,  # noqa: ANN401
+        model_path: str,
+        assistant: Any = None,  # noqa: ANN401
+    ) -> None:
+        """Initialize the AssistedBackend.
+
+        Args:
+            model: The main ``WhisperForConditionalGeneration``.
+            processor: The matching ``WhisperProcessor``.
+            model_path: The ID the main model was loaded from.
+            assistant: The draft model (None decodes with the main model
+                alone).
+
+        """
+        super().__init__(model, processor, model_path)
+        self.assistant = assistant
+
+    @classmethod
+    def load(  # noqa: PLR0913
+        cls,
+        model_id: str,
+        *,
+        device: str,
+        compute_type: str,
+        cpu_threads: int = 0,
+        num_workers: int = 1,  # noqa: ARG003
+        download_root: str | None = None,
+        assistant_model: str | None = None,
+    ) -> AssistedBackend:
+        """Load the main model and its assistant.
+
+        Args:
+            model_id: HuggingFace model ID of a transformers checkpoint.
+            device: Device to run the models on ('cpu' or 'cuda').
+            compute_type: "float32" keeps full precision on GPU; otherwise
+                GPU models run in float16. CPU models always use float32.
+            cpu_threads: PyTorch CPU threads (0 = default).
+            num_workers: Ignored; PyTorch decodes one pass at a time.
+            download_root: Directory to download models to.
+            assistant_model: Draft model ID (default from
+                ``ASSISTANT_MODELS``).
+
+        Returns:
+            The backend.
+
+        Raises:
+            ValueError: If no assistant is known for the model.
+
+        """
+        assistant_id = assistant_model or ASSISTANT_MODELS.get(model_id)
+        if assistant_id is None:
+            msg = f"No assistant model known for {model_id}; set assistant_model"
+            raise ValueError(msg)
+
+        # Imported here: transformers takes seconds to import
+        from transformers import (  # noqa: PLC0415
+            AutoConfig,
+            AutoModelForCausalLM,
+            AutoModelForSpeechSeq2Seq,
+            WhisperProcessor,
+        )
+
+        if cpu_threads:
+            torch.set_num_threads(cpu_threads)
+        dtype = (
+            torch.float16
+            if device == "cuda" and compute_type != "float32"
+            else torch.float32
+        )
+        options = {"torch_dtype": dtype, "cache_dir": download_root}
+        model = AutoModelForSpeechSeq2Seq.from_pretrained(model_id, **options)
+
+        # Distilled large models keep the teacher's encoder: only their
+        # decoder is loaded, and it reuses the main model's encoder output
+        config = AutoConfig.from_pretrained(assistant_id, cache_dir=download_root)
+        shares_encoder = (
+            config.d_model == model.config.d_model
+            and config.encoder_layers == model.config.encoder_layers
+        )
+        assistant_cls = (
+            AutoModelForCausalLM if shares_encoder else AutoModelForSpeechSeq2Seq
+        )
+        assistant = assistant_cls.from_pretrained(assistant_id, **options)
+        processor = WhisperProcessor.from_pretrained(model_id, cache_dir=download_root)
+        return cls(model.to(device), processor, model_id, assistant.to(device))
+
+    def _generate_options(self, beam_size: int) -> dict[str, Any]:
+        """Return the search options for ``generate``.
+
+        Args:
+            beam_size: Requested beam size, used without an assistant.
+
+        Returns:
+            Keyword arguments for ``generate``.
+
+        """
+        if self.assistant is None:
+            return {"num_beams": beam_size}
+        # The assistant drafts a single greedy hypothesis
+        return {"num_beams": 1, "assistant_model": self.assistant}
+
+    def _features(self, audio: np.ndarray) -> torch.Tensor:
+        """Compute input features on the model's device and precision.
+
+        Args:
+            audio: Audio samples (float32, 16kHz).
+
+        Returns:
+            The input features.
+
+        """
+        features = super()._features(audio)
+        return features.to(self.model.device, self.model.dtype)
+
+
+BACKENDS: Final[
+    dict[str, type[FasterWhisperBackend | OnnxBackend | AssistedBackend]]
+] = {
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    OnnxBackend.name: OnnxBackend,
+    AssistedBackend.name: AssistedBackend,
+}
+
+
+def load_backend(  # noqa: PLR0913
+    name: str,
+    model_id: str,
+    *,
+    device: str,
+    compute_type: str,
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+    download_root: str | None = None,
+    **options: Any,  # noqa: ANN401
+) -> AsrBackend:
+    """Load a model with the named backend.
+
+    Args:
+        name: Backend name (one of ``BACKENDS``).
+        model_id: HuggingFace model ID or faster-whisper model name.
+        device: Device to run the model on ('cpu' or 'cuda').
+        compute_type: Quantization type for the model.
+        cpu_threads: CPU threads per decode (0 = library default).
+        num_workers: Decodes that can run concurrently.
+        download_root: Directory to download models to.
+        **options: Options specific to the backend.
+
+    Returns:
+        The loaded backend.
+
+    Raises:
+        ValueError: If the backend is unknown.
+
+    """
+    if name not in BACKENDS:
+        msg = f"Unknown backend {name!r} (choose from {', '.join(BACKENDS)})"
+        raise ValueError(msg)
+    return BACKENDS[name].load(
+        model_id,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+        download_root=download_root,
+        **options,
+    )
@@ -50,3 +50,13 @@ WHISPER_NAME_MAP: Final[dict[str, str]] = {
     "distil-whisper/distil-large-v2": "distil-large-v2",
     "distil-whisper/distil-large-v3": "distil-large-v3",
 }
+
+# Distilled models that can draft tokens for a larger model sharing its
+# tokenizer, for assisted decoding
+ASSISTANT_MODELS: Final[dict[str, str]] = {
+    "openai/whisper-large-v1": "distil-whisper/distil-large-v2",
+    "openai/whisper-large-v2": "distil-whisper/distil-large-v2",
+    "openai/whisper-large": "distil-whisper/distil-large-v2",
+    "openai/whisper-large-v3": "distil-whisper/distil-large-v3",
+    "openai/whisper-medium.en": "distil-whisper/distil-small.en",
+}
@@ -0,0 +1,146 @@
+"""Cached audio input device enumeration."""
+
+import contextlib
+import threading
+from typing import Final, NamedTuple
+
+import sounddevice as sd
+
+
+class InputDevice(NamedTuple):
+    """An audio input device as seen at enumeration time."""
+
+    index: int
+    name: str
+    hostapi: str
+    default_samplerate: int
+
+
+class DeviceRegistry:
+    """Enumerates input devices once and serves lookups from a cache.
+
+    PortAudio enumeration can take hundreds of milliseconds, so the device
+    list is only refreshed on an explicit ``rescan`` or after ``invalidate``
+    has been called because a device failed to open.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the DeviceRegistry."""
+        self._lock: Final[threading.Lock] = threading.Lock()
+        self._devices: list[InputDevice] | None = None
+        self._default_index: int | None = None
+        # PortAudio only sees hot-plugged devices after reinitialization
+        self._reinitialize = False
+
+    def invalidate(self) -> None:
+        """Mark the cache stale so the next lookup rescans devices."""
+        with self._lock:
+            self._devices = None
+            self._reinitialize = True
+
+    def rescan(self) -> list[InputDevice]:
+        """Enumerate devices again, picking up added or removed hardware.
+
+        No input stream may be open while rescanning, as PortAudio is
+        reinitialized.
+
+        Returns:
+            The refreshed list of input devices.
+
+        """
+        self.invalidate()
+        return self.devices()
+
+    def devices(self) -> list[InputDevice]:
+        """Return all input devices, enumerating them on first use.
+
+        Returns:
+            The cached list of input devices.
+
+        """
+        with self._lock:
+            if self._devices is None:
+                self._devices = self._enumerate()
+            return self._devices
+
+    def input_devices(self) -> list[tuple[int, str]]:
+        """List input devices as (index, name) pairs.
+
+        Returns:
+            A list of tuples containing device index and name.
+
+        """
+        return [(dev.index, dev.name) for dev in self.devices()]
+
+    def get(self, index: int | None) -> InputDevice | None:
+        """Look up a device by index, or the default input device for None.
+
+        Args:
+            index: The device index.
+
+        Returns:
+            The device, or None if unknown.
+
+        """
+        devices = self.devices()
+        if index is None:
+            index = self._default_index
+        for dev in devices:
+            if dev.index == index:
+                return dev
+        return None
+
+    def find(self, name: str, hostapi: str | None = None) -> InputDevice | None:
+        """Find a device by name, preferring the given host API.
+
+        Args:
+            name: The device name (a substring match is used as a fallback).
+            hostapi: Optional host API name the device was selected under.
+
+        Returns:
+            The best matching device, or None if none matches.
+
+        """
+        devices = self.devices()
+        exact = [dev for dev in devices if dev.name == name]
+        for dev in exact:
+            if hostapi is None or dev.hostapi == hostapi:
+                return dev
+        if exact:
+            return exact[0]
+        for dev in devices:
+            if name in dev.name:
+                return dev
+        return None
+
+    def _enumerate(self) -> list[InputDevice]:
+        """Query PortAudio for input devices. Caller holds the lock.
+
+        Returns:
+            The list of input devices.
+
+        """
+        if self._reinitialize:
+            self._reinitialize = False
+            with contextlib.suppress(Exception):
+                sd._terminate()  # noqa: SLF001
+                sd._initialize()  # noqa: SLF001
+
+        hostapis = [api["name"] for api in sd.query_hostapis()]
+        devices = []
+        for i, dev in enumerate(sd.query_devices()):
+            if dev["max_input_channels"] > 0:
+                hostapi = dev.get("hostapi")
+                devices.append(
+                    InputDevice(
+                        index=i,
+                        name=dev["name"],
+                        hostapi=hostapis[hostapi] if hostapi is not None else "",
+                        default_samplerate=int(dev.get("default_samplerate", 0)),
+                    )
+                )
+
+        self._default_index = None
+        with contextlib.suppress(Exception):
+            self._default_index = int(sd.query_devices(kind="input")["index"])
+        return devices
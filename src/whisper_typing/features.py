@@ -0,0 +1,266 @@
+"""Incremental log-mel features for a growing recording."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Final
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from faster_whisper.feature_extractor import FeatureExtractor
+
+# faster-whisper appends this many zeros before computing the spectrogram
+TAIL_PADDING: Final[int] = 160
+# Samples compared to make sure a buffer continues the one seen before
+CONTINUITY_CHECK: Final[int] = 400
+
+
+class IncrementalFeatures:
+    """Keeps the log-mel spectrogram of a growing recording up to date.
+
+    Produces the same features as faster-whisper's ``FeatureExtractor``
+    for the whole buffer, but only computes STFT frames for new audio.
+    Frames whose window lies entirely inside the audio seen so far never
+    change again and are cached as raw log-mel values; the few frames at
+    the end, which still depend on the zero padding, are recomputed on
+    every update. The global-max clamp and scaling are applied on fetch,
+    since the maximum can change as audio arrives.
+    """
+
+    def __init__(self, extractor: FeatureExtractor) -> None:
+        """Initialize the IncrementalFeatures.
+
+        Args:
+            extractor: The model's feature extractor, providing the STFT
+                and mel filterbank parameters.
+
+        """
+        self.n_fft = extractor.n_fft
+        self.hop_length = extractor.hop_length
+        self.mel_filters = extractor.mel_filters
+        self.window = np.hanning(self.n_fft + 1)[:-1].astype(np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the cached frames so a new recording can start."""
+        self._final = np.zeros((len(self.mel_filters), 0), dtype=np.float32)
+        self._final_count = 0
+        self._final_max = -np.inf
+        self._samples = 0
+        self._check: np.ndarray | None = None
+
+    @property
+    def cached_frames(self) -> int:
+        """Number of frames that will not be computed again."""
+        return self._final_count
+
+    def update(self, audio: np.ndarray) -> np.ndarray:
+        """Return the features for the buffer, computing only what is new.
+
+        Args:
+            audio: The whole recording so far (float32, 16kHz). Must extend
+                the buffer passed on the previous call, otherwise the cache
+                is rebuilt.
+
+        Returns:
+            The log-mel features shaped ``(n_mels, frames)``.
+
+        """
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if not self._continues(audio):
+            self.reset()
+
+        length = len(audio)
+        half = self.n_fft // 2
+        total = (length + TAIL_PADDING) // self.hop_length
+        # Frame k covers samples [k * hop - n_fft / 2, k * hop + n_fft / 2);
+        # frame 0 also reflects sample n_fft / 2
+        final = min(total, max(0, (length - half - 1) // self.hop_length + 1))
+
+        if final > self._final_count:
+            new = self._log_mel(audio, self._final_count, final)
+            self._append_final(new)
+        tail = self._log_mel(audio, self._final_count, total)
+
+        self._samples = length
+        check_start = max(0, length - CONTINUITY_CHECK)
+        self._check = audio[check_start:length].copy()
+
+        log_spec = np.concatenate((self._final[:, : self._final_count], tail), axis=1)
+        peak = max(self._final_max, float(tail.max()) if tail.size else -np.inf)
+        log_spec = np.maximum(log_spec, peak - 8.0)
+        return (log_spec + 4.0) / 4.0
+
+    def _continues(self, audio: np.ndarray) -> bool:
+        """Check the buffer extends the one the cache was built from.
+
+        Args:
+            audio: The new buffer.
+
+        Returns:
+            True if the cached frames are still valid.
+
+        """
+        if self._check is None:
+            return True
+        if len(audio) < self._samples:
+            return False
+        start = self._samples - len(self._check)
+        return np.array_equal(audio[start : self._samples], self._check)
+
+    def _append_final(self, frames: np.ndarray) -> None:
+        """Add frames to the cache, growing its storage geometrically.
+
+        Args:
+            frames: Raw log-mel frames shaped ``(n_mels, count)``.
+
+        """
+        needed = self._final_count + frames.shape[1]
+        if needed > self._final.shape[1]:
+            grown = np.zeros(
+                (self._final.shape[0], max(needed, 2 * self._final.shape[1])),
+                dtype=np.float32,
+            )
+            grown[:, : self._final_count] = self._final[:, : self._final_count]
+            self._final = grown
+        self._final[:, self._final_count : needed] = frames
+        self._final_count = needed
+        if frames.size:
+            self._final_max = max(self._final_max, float(frames.max()))
+
+    def _log_mel(self, audio: np.ndarray, first: int, stop: int) -> np.ndarray:
+        """Compute raw log-mel values for a range of frames.
+
+        Args:
+            audio: The recording.
+            first: Index of the first frame.
+            stop: Index after the last frame.
+
+        Returns:
+            The frames shaped ``(n_mels, stop - first)``, before clamping.
+
+        """
+        count = stop - first
+        if count <= 0:
+            return np.zeros((len(self.mel_filters), 0), dtype=np.float32)
+
+        samples = self._padded(
+            audio,
+            first * self.hop_length - self.n_fft // 2,
+            (stop - 1) * self.hop_length + self.n_fft // 2,
+        )
+        frames = np.lib.stride_tricks.as_strided(
+            samples,
+            (count, self.n_fft),
+            (self.hop_length * samples.strides[0], samples.strides[0]),
+            writeable=False,
+        )
+        stft = np.fft.rfft(frames * self.window, n=self.n_fft, axis=-1)
+        magnitudes = np.abs(stft.astype(np.complex64)) ** 2
+        mel_spec = self.mel_filters @ magnitudes.T
+        return np.log10(np.clip(mel_spec, a_min=1e-10, a_max=None))
+
+    def _padded(self, audio: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        """Read samples the way faster-whisper pads the waveform.
+
+        The waveform is extended with zeros and then reflect padded on both
+        sides by half an FFT window.
+
+        Args:
+            audio: The recording.
+            lo: First sample index (negative reaches into the left padding).
+            hi: Sample index after the last one.
+
+        Returns:
+            The samples.
+
+        """
+        extended = len(audio) + TAIL_PADDING
+        if lo >= 0 and hi <= len(audio):
+            return audio[lo:hi]
+        if not len(audio):
+            return np.zeros(hi - lo, dtype=np.float32)
+        index = np.arange(lo, hi)
+        index = np.where(index < 0, -index, index)
+        index = np.where(index >= extended, 2 * (extended - 1) - index, index)
+        inside = index < len(audio)
+        return np.where(inside, audio[np.where(inside, index, 0)], 0).astype(np.float32)
+
+
+class StreamingFeatureExtractor:
+    """Feature extractor that serves precomputed features for one buffer.
+
+    Installed in place of a WhisperModel's extractor, it returns the
+    incremental features when called with the live buffer they were
+    computed for, and defers to the original extractor for anything else
+    (language detection on VAD output, escalated segments, final passes).
+    """
+
+    def __init__(self, extractor: FeatureExtractor) -> None:
+        """Initialize the StreamingFeatureExtractor.
+
+        Args:
+            extractor: The model's original feature extractor.
+
+        """
+        self.extractor = extractor
+        self.incremental = IncrementalFeatures(extractor)
+        self._audio: np.ndarray | None = None
+        self._features: np.ndarray | None = None
+
+    def prepare(self, audio: np.ndarray) -> None:
+        """Update the incremental features for the next decode of a buffer.
+
+        Args:
+            audio: The live buffer about to be transcribed.
+
+        """
+        if len(audio) < self.extractor.n_fft:
+            # Padding wider than the audio reflects more than once
+            self.release()
+            return
+        self._features = self.incremental.update(audio)
+        self._audio = audio
+
+    def release(self) -> None:
+        """Stop serving the prepared features."""
+        self._audio = None
+        self._features = None
+
+    def __call__(
+        self,
+        waveform: np.ndarray,
+        padding: int = TAIL_PADDING,
+        chunk_length: int | None = None,
+    ) -> np.ndarray:
+        """Return features for a waveform.
+
+        Args:
+            waveform: The audio samples.
+            padding: Zeros appended before the STFT.
+            chunk_length: Optional chunk length override.
+
+        Returns:
+            The log-mel features.
+
+        """
+        if (
+            self._features is not None
+            and waveform is self._audio
+            and padding == TAIL_PADDING
+            and chunk_length is None
+        ):
+            return self._features
+        return self.extractor(waveform, padding=padding, chunk_length=chunk_length)
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Expose the original extractor's parameters.
+
+        Args:
+            name: The attribute name.
+
+        Returns:
+            The attribute of the original extractor.
+
+        """
+        return getattr(self.extractor, name)
@@ -0,0 +1,206 @@
+"""CPU budgets for live preview and final decoding."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Final
+
+import psutil
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Share of the decoder's time the live preview may use by default; it
+# still pauses for final passes and typing
+LIVE_SHARE: Final[float] = 1.0
+# Work that pauses the live preview while it runs
+HOLD_REASONS: Final[tuple[str, ...]] = ("final", "typing")
+
+
+def available_cores() -> list[int]:
+    """Return the CPU cores this process may run on.
+
+    Returns:
+        The core indices.
+
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    if hasattr(psutil.Process, "cpu_affinity"):
+        return sorted(psutil.Process().cpu_affinity())
+    return list(range(os.cpu_count() or 1))
+
+
+@contextlib.contextmanager
+def pinned_to(cores: list[int] | None) -> Iterator[None]:
+    """Run a block on the given cores only.
+
+    Threads started inside the block, such as the decoder's thread pool
+    created while a model loads, keep the restriction. Pinning relies on
+    per-thread affinity, which only Linux offers; elsewhere decoders are
+    pinned in their worker processes instead, see ``pin_process``.
+
+    Args:
+        cores: Core indices (None or empty to leave the affinity alone).
+
+    Yields:
+        Nothing.
+
+    """
+    if not cores or not hasattr(os, "sched_setaffinity"):
+        yield
+        return
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cores)
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, previous)
+
+
+def pin_process(cores: list[int] | None) -> None:
+    """Restrict the whole current process to the given cores.
+
+    Meant for decoder worker processes, where nothing else competes for
+    the restriction. Works wherever psutil supports CPU affinity,
+    including Windows.
+
+    Args:
+        cores: Core indices (None or empty to leave the affinity alone).
+
+    """
+    if cores and hasattr(psutil.Process, "cpu_affinity"):
+        psutil.Process().cpu_affinity(cores)
+
+
+class ResourceGovernor:
+    """Splits the decoder's CPU between the live preview and final passes.
+
+    The final pass and typing have priority: while either runs, live
+    passes are paused. Otherwise the live preview may use ``live_share``
+    of the decoder's time (all of it by default). The decoder's thread
+    pool is sized when the model loads, so a smaller budget is enforced by
+    resting after each live pass in proportion to how long it took.
+    Optionally the decoder is
+    pinned to ``decoder_cores``, leaving the other cores to the audio
+    callback and the UI.
+    """
+
+    def __init__(
+        self, *, live_share: float = LIVE_SHARE, decoder_cores: list[int] | None = None
+    ) -> None:
+        """Initialize the ResourceGovernor.
+
+        Args:
+            live_share: Fraction of the decoder's time live passes may use.
+            decoder_cores: Cores to pin decoder threads to (None = all).
+
+        """
+        self._lock: Final[threading.Lock] = threading.Lock()
+        self._holds = dict.fromkeys(HOLD_REASONS, 0)
+        self._resume_at = 0.0
+        self.live_passes = 0
+        self.live_paused = 0
+        self.live_rest_seconds = 0.0
+        self.configure(live_share=live_share, decoder_cores=decoder_cores)
+
+    def configure(
+        self, *, live_share: float = LIVE_SHARE, decoder_cores: list[int] | None = None
+    ) -> None:
+        """Set the budgets.
+
+        Pinning applies to models loaded afterwards.
+
+        Args:
+            live_share: Fraction of the decoder's time live passes may use.
+            decoder_cores: Cores to pin decoder threads to (None = all).
+
+        """
+        available = available_cores()
+        cores = [core for core in decoder_cores or [] if core in available]
+        with self._lock:
+            self.live_share = min(1.0, max(0.0, live_share))
+            self.decoder_cores = cores or None
+
+    @property
+    def pinned_threads(self) -> int:
+        """Decoder threads matching the pinned cores (0 when not pinned)."""
+        return len(self.decoder_cores) if self.decoder_cores else 0
+
+    @contextlib.contextmanager
+    def hold(self, reason: str) -> Iterator[None]:
+        """Pause live passes while a block runs.
+
+        Args:
+            reason: What needs the CPU (one of ``HOLD_REASONS``).
+
+        Yields:
+            Nothing.
+
+        """
+        with self._lock:
+            self._holds[reason] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._holds[reason] -= 1
+
+    def paused_for(self) -> str | None:
+        """Return what live passes are paused for, if anything."""
+        with self._lock:
+            return next((r for r, count in self._holds.items() if count), None)
+
+    def live_ready(self) -> bool:
+        """Check whether a live pass may run now.
+
+        Returns:
+            False while paused or while resting after the previous pass.
+
+        """
+        with self._lock:
+            if any(self._holds.values()):
+                self.live_paused += 1
+                return False
+            return time.monotonic() >= self._resume_at
+
+    @contextlib.contextmanager
+    def live_pass(self) -> Iterator[None]:
+        """Account for a live pass and schedule the rest after it.
+
+        Yields:
+            Nothing.
+
+        """
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self.live_passes += 1
+                # Rest so the pass is live_share of the time until the next
+                rest = elapsed * (1 / max(self.live_share, 0.01) - 1)
+                self.live_rest_seconds += rest
+                self._resume_at = time.monotonic() + rest
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current allocation and counters.
+
+        Returns:
+            A dictionary of metric names to values.
+
+        """
+        paused_for = self.paused_for()
+        with self._lock:
+            return {
+                "live_share": self.live_share,
+                "decoder_cores": self.decoder_cores,
+                "live_paused_for": paused_for,
+                "live_passes": self.live_passes,
+                "live_paused": self.live_paused,
+                "live_rest_seconds": self.live_rest_seconds,
+            }
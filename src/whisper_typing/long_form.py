@@ -0,0 +1,218 @@
+"""Parallel decoding of long recordings split at pauses."""
+
+from __future__ import annotations
+
+import itertools
+import os
+import queue
+import string
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+from whisper_typing.process_transcriber import ProcessTranscriber
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from whisper_typing.transcriber import Transcriber
+
+SAMPLE_RATE: Final[int] = 16000
+# Whisper's context window; longer chunks would be decoded sequentially
+WINDOW_SECONDS: Final[float] = 30.0
+# Audio shared by neighbouring chunks when no pause allows a clean cut
+OVERLAP_SECONDS: Final[float] = 1.0
+MAX_OVERLAP_WORDS: Final[int] = 8
+MIN_PAUSE_MS: Final[int] = 300
+
+
+class Chunk(NamedTuple):
+    """A range of the recording decoded on its own."""
+
+    start: int
+    end: int
+    overlaps_previous: bool
+
+
+def split_at_pauses(
+    audio: np.ndarray,
+    max_seconds: float = WINDOW_SECONDS,
+    overlap_seconds: float = OVERLAP_SECONDS,
+) -> list[Chunk]:
+    """Split audio into chunks no longer than the model's window.
+
+    Cuts are placed in the middle of pauses found by voice activity
+    detection, as late as possible within each window. A window without
+    any pause is cut hard, with the next chunk overlapping it slightly so
+    no word is lost at the boundary.
+
+    Args:
+        audio: The recording (float32, 16kHz).
+        max_seconds: Maximum chunk length.
+        overlap_seconds: Overlap used for hard cuts.
+
+    Returns:
+        The chunks in order.
+
+    """
+    max_len = int(max_seconds * SAMPLE_RATE)
+    if len(audio) <= max_len:
+        return [Chunk(0, len(audio), overlaps_previous=False)]
+
+    speech = get_speech_timestamps(
+        audio, VadOptions(min_silence_duration_ms=MIN_PAUSE_MS)
+    )
+    cuts = [
+        (before["end"] + after["start"]) // 2
+        for before, after in itertools.pairwise(speech)
+    ]
+
+    chunks = []
+    start = 0
+    overlaps = False
+    while len(audio) - start > max_len:
+        limit = start + max_len
+        candidates = [cut for cut in cuts if start < cut <= limit]
+        if candidates:
+            chunks.append(Chunk(start, candidates[-1], overlaps))
+            start = candidates[-1]
+            overlaps = False
+        else:
+            chunks.append(Chunk(start, limit, overlaps))
+            start = limit - int(overlap_seconds * SAMPLE_RATE)
+            overlaps = True
+    chunks.append(Chunk(start, len(audio), overlaps))
+    return chunks
+
+
+def _normalize(word: str) -> str:
+    return word.strip(string.punctuation).lower()
+
+
+def _overlap_length(previous: list[str], current: list[str]) -> int:
+    """Find how many leading words of a chunk repeat the previous chunk's end.
+
+    Args:
+        previous: Words stitched so far.
+        current: Words of the next chunk.
+
+    Returns:
+        The number of duplicated words.
+
+    """
+    longest = min(MAX_OVERLAP_WORDS, len(previous), len(current))
+    for n in range(longest, 0, -1):
+        tail = [_normalize(word) for word in previous[-n:]]
+        if tail == [_normalize(word) for word in current[:n]]:
+            return n
+    return 0
+
+
+def stitch(texts: list[str], chunks: list[Chunk]) -> str:
+    """Join chunk transcripts, dropping words repeated across overlaps.
+
+    Args:
+        texts: Transcript of each chunk.
+        chunks: The chunks the transcripts belong to.
+
+    Returns:
+        The combined text.
+
+    """
+    words: list[str] = []
+    for text, chunk in zip(texts, chunks, strict=True):
+        current = text.split()
+        if chunk.overlaps_previous and words:
+            current = current[_overlap_length(words, current) :]
+        words.extend(current)
+    return " ".join(words)
+
+
+class ParallelDecoder:
+    """Decodes the chunks of a long recording concurrently.
+
+    Each worker holds its own copy of the model, usually in its own
+    process, so chunks are decoded in parallel instead of window after
+    window.
+    """
+
+    def __init__(self, workers: list[Transcriber | ProcessTranscriber]) -> None:
+        """Initialize the ParallelDecoder.
+
+        Args:
+            workers: Transcribers to spread the chunks over.
+
+        """
+        self.workers = workers
+        self._idle: queue.Queue[Transcriber | ProcessTranscriber] = queue.Queue()
+        for worker in workers:
+            self._idle.put(worker)
+
+    @classmethod
+    def start(cls, count: int, **kwargs: Any) -> ParallelDecoder:  # noqa: ANN401
+        """Start worker processes, loading the model in each concurrently.
+
+        The CPU threads are divided between the workers so they don't
+        oversubscribe the machine.
+
+        Args:
+            count: Number of worker processes.
+            **kwargs: Arguments for each worker's Transcriber.
+
+        Returns:
+            The decoder.
+
+        """
+        kwargs.setdefault("cpu_threads", max(1, (os.cpu_count() or 1) // count))
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [
+                executor.submit(ProcessTranscriber, **kwargs) for _ in range(count)
+            ]
+        workers: list[Transcriber | ProcessTranscriber] = []
+        errors = []
+        for future in futures:
+            try:
+                workers.append(future.result())
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+        if errors:
+            for worker in workers:
+                worker.close()
+            raise errors[0]
+        return cls(workers)
+
+    def transcribe(
+        self, audio: np.ndarray, options: dict[str, Any] | None = None
+    ) -> str:
+        """Transcribe a recording by decoding its chunks in parallel.
+
+        Args:
+            audio: The recording (float32, 16kHz).
+            options: Decoding options to set on each worker.
+
+        Returns:
+            The transcribed text.
+
+        """
+        chunks = split_at_pauses(audio)
+
+        def decode(chunk: Chunk) -> str:
+            worker = self._idle.get()
+            try:
+                worker.begin_recording()  # Chunks never share a pinned language
+                for name, value in (options or {}).items():
+                    setattr(worker, name, value)
+                return worker.transcribe(audio[chunk.start : chunk.end])
+            finally:
+                self._idle.put(worker)
+
+        with ThreadPoolExecutor(max_workers=len(self.workers)) as executor:
+            texts = list(executor.map(decode, chunks))
+        return stitch(texts, chunks)
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        for worker in self.workers:
+            if isinstance(worker, ProcessTranscriber):
+                worker.close()
@@ -0,0 +1,384 @@
+"""Local-first resolution and maintenance of downloaded Whisper models."""
+
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+from typing import Final, NamedTuple
+
+from faster_whisper.utils import _MODELS, download_model
+from huggingface_hub import constants, scan_cache_dir, snapshot_download
+
+from whisper_typing.constants import WHISPER_NAME_MAP
+
+# Files a CTranslate2 Whisper model cannot be loaded without
+REQUIRED_FILES: Final[tuple[str, ...]] = ("config.json", "model.bin", "tokenizer.json")
+# Weights of a transformers checkpoint, in order of preference
+CHECKPOINT_WEIGHTS: Final[tuple[str, ...]] = ("model.safetensors", "pytorch_model.bin")
+# What conversion needs from a transformers checkpoint repository
+CHECKPOINT_PATTERNS: Final[list[str]] = ["*.json", "*.txt", *CHECKPOINT_WEIGHTS]
+# Copied next to the converted weights for faster-whisper
+CONVERTED_EXTRA_FILES: Final[tuple[str, ...]] = (
+    "tokenizer.json",
+    "preprocessor_config.json",
+)
+CONVERTED_QUANTIZATION: Final[str] = "int8"
+
+
+class CachedModel(NamedTuple):
+    """A model repository present in the local cache."""
+
+    repo_id: str
+    path: str
+    size_bytes: int
+
+
+class ModelManager:
+    """Resolves models to local copies before touching the network.
+
+    Loading a model by name makes faster-whisper ask the Hugging Face hub
+    for the latest revision, even when the model is already downloaded.
+    The manager looks for a complete local copy first so startup never
+    waits on the network once a model has been fetched.
+    """
+
+    def __init__(self, cache_dir: str | None = None) -> None:
+        """Initialize the ModelManager.
+
+        Args:
+            cache_dir: Model cache directory (Hugging Face default if None).
+
+        """
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def model_name(model_id: str) -> str:
+        """Map an app model ID to the name faster-whisper downloads.
+
+        Args:
+            model_id: HuggingFace model ID or faster-whisper model name.
+
+        Returns:
+            The faster-whisper model name or repository ID.
+
+        """
+        return WHISPER_NAME_MAP.get(model_id, model_id)
+
+    def local_path(self, model_id: str) -> str | None:
+        """Find a complete local copy of a model without network access.
+
+        Args:
+            model_id: HuggingFace model ID, faster-whisper name or a path.
+
+        Returns:
+            The model directory, or None if it is missing or incomplete.
+
+        """
+        name = self.model_name(model_id)
+        if Path(name).is_dir():
+            path = name
+        else:
+            try:
+                path = download_model(
+                    name, local_files_only=True, cache_dir=self.cache_dir
+                )
+            except Exception:  # noqa: BLE001
+                path = None
+        if path and self.is_complete(path):
+            return path
+        return self._converted_copy(model_id)
+
+    def resolve(self, model_id: str) -> str:
+        """Return what to load: a local directory if possible, else the name.
+
+        Args:
+            model_id: HuggingFace model ID or faster-whisper model name.
+
+        Returns:
+            A local model directory, or the model name to download.
+
+        """
+        return self.local_path(model_id) or self.model_name(model_id)
+
+    def download(self, model_id: str) -> str:
+        """Download a model (or the missing parts of it) into the cache.
+
+        Transformers checkpoints are converted as well, see ``convert``.
+
+        Args:
+            model_id: HuggingFace model ID or faster-whisper model name.
+
+        Returns:
+            The local model directory.
+
+        """
+        return self.convert(model_id) or download_model(
+            self.model_name(model_id), cache_dir=self.cache_dir
+        )
+
+    def convert(self, model_id: str) -> str | None:
+        """Convert a transformers Whisper checkpoint to CTranslate2 once.
+
+        Fine-tuned models are usually published as transformers
+        checkpoints, which faster-whisper cannot load. The checkpoint is
+        converted to an int8 CTranslate2 model in the cache directory,
+        keyed by the checkpoint's revision, so later loads reuse it until
+        the checkpoint changes.
+
+        Args:
+            model_id: HuggingFace model ID or path of a local checkpoint.
+
+        Returns:
+            The converted model directory, or None if the model is not a
+            transformers checkpoint (or could not be fetched).
+
+        """
+        if self.is_ctranslate2_release(model_id):
+            return None  # No need to ask the hub
+        source = self._checkpoint_path(model_id, download=True)
+        if source is None or not self.is_checkpoint(source):
+            return None
+        target = self._converted_dir(model_id, source)
+        if self.is_complete(str(target)):
+            return str(target)
+
+        # Imported here: the converter pulls in transformers
+        from ctranslate2.converters import TransformersConverter  # noqa: PLC0415
+
+        partial = target.with_name(f"{target.name}.partial")
+        shutil.rmtree(partial, ignore_errors=True)
+        copy_files = [
+            name for name in CONVERTED_EXTRA_FILES if (Path(source) / name).is_file()
+        ]
+        TransformersConverter(source, copy_files=copy_files).convert(
+            str(partial), quantization=CONVERTED_QUANTIZATION, force=True
+        )
+        if "tokenizer.json" not in copy_files:
+            # Older checkpoints only ship the slow tokenizer files
+            from transformers import AutoTokenizer  # noqa: PLC0415
+
+            tokenizer = AutoTokenizer.from_pretrained(source, use_fast=True)
+            tokenizer.save_pretrained(str(partial))
+        shutil.rmtree(target, ignore_errors=True)
+        partial.rename(target)
+        return str(target)
+
+    def verify(self, model_id: str) -> bool:
+        """Check that a model is fully present in the cache.
+
+        Args:
+            model_id: HuggingFace model ID or faster-whisper model name.
+
+        Returns:
+            True if the model can be loaded offline.
+
+        """
+        return self.local_path(model_id) is not None
+
+    @staticmethod
+    def is_ctranslate2_release(model_id: str) -> bool:
+        """Check whether a model is published in CTranslate2 format.
+
+        Covers the official names and the repositories faster-whisper
+        downloads them from, such as ``Systran/faster-distil-whisper-large-v3``.
+
+        Args:
+            model_id: HuggingFace model ID or faster-whisper model name.
+
+        Returns:
+            True if the model never needs converting.
+
+        """
+        return (
+            model_id in WHISPER_NAME_MAP
+            or model_id in _MODELS
+            or model_id in _MODELS.values()
+        )
+
+    @staticmethod
+    def is_checkpoint(path: str) -> bool:
+        """Check whether a directory holds a transformers Whisper checkpoint.
+
+        Args:
+            path: The model directory.
+
+        Returns:
+            True if the directory has a Whisper config and transformers
+            weights.
+
+        """
+        directory = Path(path)
+        try:
+            config = json.loads((directory / "config.json").read_text())
+        except Exception:  # noqa: BLE001
+            return False
+        return config.get("model_type") == "whisper" and any(
+            (directory / name).is_file() for name in CHECKPOINT_WEIGHTS
+        )
+
+    def _checkpoint_path(self, model_id: str, *, download: bool) -> str | None:
+        """Find the files of a transformers checkpoint.
+
+        Args:
+            model_id: HuggingFace model ID or path of a local checkpoint.
+            download: Fetch the checkpoint if it is not cached.
+
+        Returns:
+            The checkpoint directory, or None if it is not available.
+
+        """
+        if Path(model_id).is_dir():
+            return model_id
+        try:
+            return snapshot_download(
+                model_id,
+                cache_dir=self.cache_dir,
+                allow_patterns=CHECKPOINT_PATTERNS,
+                local_files_only=not download,
+            )
+        except Exception:  # noqa: BLE001
+            return None
+
+    def _converted_dir(self, model_id: str, source: str) -> Path:
+        """Return where the conversion of a checkpoint revision is kept.
+
+        Args:
+            model_id: HuggingFace model ID or path of a local checkpoint.
+            source: The checkpoint directory.
+
+        Returns:
+            The directory for the converted model.
+
+        """
+        if Path(model_id).is_dir():
+            # Local checkpoints have no revision; their weights stand in
+            weights = next(
+                Path(source) / name
+                for name in CHECKPOINT_WEIGHTS
+                if (Path(source) / name).is_file()
+            )
+            stat = weights.stat()
+            revision = f"local-{stat.st_size}-{stat.st_mtime_ns}"
+            name = Path(model_id).resolve().name
+        else:
+            # Hub snapshots are named after their commit
+            revision = Path(source).name
+            name = model_id.replace("/", "--")
+        root = Path(self.cache_dir or constants.HF_HUB_CACHE)
+        return root / "ctranslate2" / name / f"{revision}-{CONVERTED_QUANTIZATION}"
+
+    def _converted_copy(self, model_id: str) -> str | None:
+        """Find an existing conversion of a cached checkpoint, offline.
+
+        Args:
+            model_id: HuggingFace model ID or path of a local checkpoint.
+
+        Returns:
+            The converted model directory, or None if there is none for
+            the cached revision.
+
+        """
+        if self.is_ctranslate2_release(model_id):
+            return None
+        source = self._checkpoint_path(model_id, download=False)
+        if source is None or not self.is_checkpoint(source):
+            return None
+        target = self._converted_dir(model_id, source)
+        return str(target) if self.is_complete(str(target)) else None
+
+    @staticmethod
+    def is_complete(path: str) -> bool:
+        """Check a model directory holds every required, non-empty file.
+
+        Args:
+            path: The model directory.
+
+        Returns:
+            True if the model is complete.
+
+        """
+        directory = Path(path)
+        for name in REQUIRED_FILES:
+            file = directory / name
+            if not file.is_file() or file.stat().st_size == 0:
+                return False
+        return True
+
+    def cached_models(self) -> list[CachedModel]:
+        """List the Whisper models in the cache.
+
+        Returns:
+            The cached models, largest first.
+
+        """
+        try:
+            info = scan_cache_dir(self.cache_dir)
+        except Exception:  # noqa: BLE001
+            return []  # No cache yet
+        models = [
+            CachedModel(repo.repo_id, str(repo.repo_path), repo.size_on_disk)
+            for repo in info.repos
+            if self._is_whisper(repo.repo_type, repo.repo_id)
+        ]
+        return sorted(models, key=lambda model: model.size_bytes, reverse=True)
+
+    def prune(self, keep: list[str]) -> int:
+        """Delete cached Whisper models except the ones to keep.
+
+        Other repositories sharing the Hugging Face cache are left alone.
+
+        Args:
+            keep: Model IDs, faster-whisper names or repository IDs to keep.
+
+        Returns:
+            The number of bytes freed.
+
+        """
+        try:
+            info = scan_cache_dir(self.cache_dir)
+        except Exception:  # noqa: BLE001
+            return 0
+
+        kept = {self.repo_id(model_id) for model_id in keep}
+        revisions = [
+            revision.commit_hash
+            for repo in info.repos
+            if self._is_whisper(repo.repo_type, repo.repo_id)
+            and repo.repo_id not in kept
+            for revision in repo.revisions
+        ]
+        if not revisions:
+            return 0
+        strategy = info.delete_revisions(*revisions)
+        strategy.execute()
+        return strategy.expected_freed_size
+
+    def repo_id(self, model_id: str) -> str:
+        """Return the Hugging Face repository a model is downloaded from.
+
+        Args:
+            model_id: HuggingFace model ID or faster-whisper model name.
+
+        Returns:
+            The repository ID.
+
+        """
+        name = self.model_name(model_id)
+        return _MODELS.get(name, name)
+
+    @staticmethod
+    def _is_whisper(repo_type: str, repo_id: str) -> bool:
+        """Check whether a cached repository holds a Whisper model.
+
+        Args:
+            repo_type: The Hugging Face repository type.
+            repo_id: The repository ID.
+
+        Returns:
+            True for Whisper model repositories.
+
+        """
+        return repo_type == "model" and (
+            repo_id in _MODELS.values() or "whisper" in repo_id.lower()
+        )
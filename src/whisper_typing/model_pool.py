@@ -0,0 +1,246 @@
+"""LRU pool of loaded Whisper transcribers."""
+
+from __future__ import annotations
+
+import gc
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+import psutil
+
+from whisper_typing.process_transcriber import ProcessTranscriber
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from whisper_typing.transcriber import Transcriber
+
+BYTES_PER_MB: Final[int] = 1024 * 1024
+
+
+class ModelKey(NamedTuple):
+    """Identifies a loaded model."""
+
+    model_id: str
+    device: str
+    compute_type: str
+    backend: str = "faster-whisper"
+    # Draft model of the "assisted" backend
+    assistant: str | None = None
+
+
+class PoolEntry(NamedTuple):
+    """A resident transcriber and the memory its load added."""
+
+    transcriber: Transcriber | ProcessTranscriber
+    memory_bytes: int
+
+
+def process_memory_bytes() -> int:
+    """Return the resident set size of this process.
+
+    Returns:
+        The RSS in bytes.
+
+    """
+    return psutil.Process().memory_info().rss
+
+
+class ModelPool:
+    """Keeps recently used transcribers loaded so switching back is instant.
+
+    Entries are evicted least recently used first once the pool holds more
+    than ``max_models`` models or their combined memory exceeds
+    ``max_memory_mb``. Neither the most recently used model nor the one
+    serving dictations (see ``activate``) is ever evicted. Models load
+    outside the pool's lock, so lookups never wait for a load; concurrent
+    requests for a model that is loading share that load.
+    """
+
+    def __init__(self, max_models: int = 2, max_memory_mb: int = 0) -> None:
+        """Initialize the ModelPool.
+
+        Args:
+            max_models: Maximum number of resident models.
+            max_memory_mb: Memory budget for resident models (0 = no limit).
+
+        """
+        self.max_models = max_models
+        self.max_memory_mb = max_memory_mb
+        self._entries: OrderedDict[ModelKey, PoolEntry] = OrderedDict()
+        self._loading: dict[ModelKey, Future[Transcriber | ProcessTranscriber]] = {}
+        self._lock: Final[threading.RLock] = threading.RLock()
+        # In-process loads are measured by the RSS they add, so two of them
+        # must not overlap
+        self._measure_lock: Final[threading.Lock] = threading.Lock()
+        self._active: ModelKey | None = None
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether a model is resident."""
+        with self._lock:
+            return key in self._entries
+
+    def get(
+        self,
+        key: ModelKey,
+        loader: Callable[[], Transcriber | ProcessTranscriber],
+    ) -> Transcriber | ProcessTranscriber:
+        """Return a resident transcriber, loading it on a miss.
+
+        Args:
+            key: The model to fetch.
+            loader: Creates the transcriber if it is not resident.
+
+        Returns:
+            The transcriber for ``key``.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry.transcriber
+            pending = self._loading.get(key)
+            if pending is None:
+                load: Future[Transcriber | ProcessTranscriber] = Future()
+                self._loading[key] = load
+        if pending is not None:
+            return pending.result()  # Already loading in another thread
+
+        try:
+            transcriber, used = self._load(loader)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            load.set_exception(e)
+            raise
+        with self._lock:
+            del self._loading[key]
+            self._entries[key] = PoolEntry(transcriber, used)
+            self._evict()
+        load.set_result(transcriber)
+        return transcriber
+
+    def _load(
+        self, loader: Callable[[], Transcriber | ProcessTranscriber]
+    ) -> tuple[Transcriber | ProcessTranscriber, int]:
+        """Run a loader and measure the memory the model uses.
+
+        Args:
+            loader: Creates the transcriber.
+
+        Returns:
+            The transcriber and its memory in bytes.
+
+        """
+        with self._measure_lock:
+            before = process_memory_bytes()
+            transcriber = loader()
+            if isinstance(transcriber, ProcessTranscriber):
+                # Loaded in the worker, which other loads can't inflate
+                return transcriber, transcriber.memory_bytes()
+            return transcriber, max(0, process_memory_bytes() - before)
+
+    def activate(self, key: ModelKey | None) -> None:
+        """Mark the model serving dictations, which is never evicted.
+
+        Args:
+            key: The serving model (None when none is).
+
+        """
+        with self._lock:
+            self._active = key
+
+    def loading(self, key: ModelKey) -> bool:
+        """Return whether a model is being loaded."""
+        with self._lock:
+            return key in self._loading
+
+    def evict(self, key: ModelKey) -> int:
+        """Drop a model from the pool.
+
+        Args:
+            key: The model to drop.
+
+        Returns:
+            The memory attributed to the model in bytes (0 if not resident).
+
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return 0
+        freed = entry.memory_bytes
+        del entry
+        gc.collect()
+        return freed
+
+    def clear(self) -> int:
+        """Drop all models.
+
+        Returns:
+            The memory attributed to the dropped models in bytes.
+
+        """
+        with self._lock:
+            freed = self._total_bytes()
+            self._entries.clear()
+            self._active = None
+        gc.collect()
+        return freed
+
+    def worker_memory_bytes(self) -> int:
+        """Measure the worker processes of resident models right now.
+
+        Their memory is returned to the system when the models are
+        dropped, unlike in-process models, whose release shows in this
+        process's RSS.
+
+        Returns:
+            The combined RSS of the workers in bytes.
+
+        """
+        with self._lock:
+            workers = [
+                entry.transcriber
+                for entry in self._entries.values()
+                if isinstance(entry.transcriber, ProcessTranscriber)
+            ]
+        return sum(worker.memory_bytes() for worker in workers)
+
+    def resident_memory(self) -> dict[ModelKey, int]:
+        """Report the memory attributed to each resident model.
+
+        Returns:
+            A mapping of model key to bytes, least recently used first.
+
+        """
+        with self._lock:
+            return {key: entry.memory_bytes for key, entry in self._entries.items()}
+
+    def _evict(self) -> None:
+        """Evict least recently used models until within budget."""
+        budget = self.max_memory_mb * BYTES_PER_MB
+        evicted = False
+        # Oldest first, sparing the newest and the serving model
+        candidates = [key for key in list(self._entries)[:-1] if key != self._active]
+        for key in candidates:
+            if len(self._entries) <= self.max_models and (
+                not budget or self._total_bytes() <= budget
+            ):
+                break
+            del self._entries[key]
+            evicted = True
+        if evicted:
+            gc.collect()
+
+    def _total_bytes(self) -> int:
+        """Sum the memory attributed to resident models.
+
+        Returns:
+            The total in bytes.
+
+        """
+        return sum(entry.memory_bytes for entry in self._entries.values())
@@ -0,0 +1,92 @@
+"""Streaming conditioning of captured audio before transcription."""
+
+import math
+
+import numpy as np
+from scipy import signal
+
+# Pole of the DC blocker; closer to 1 removes less of the low end
+DC_POLE: float = 0.995
+# Rumble, handling noise and mains hum sit below the speech band
+HIGHPASS_HZ: float = 80.0
+HIGHPASS_ORDER: int = 2
+TARGET_RMS_DBFS: float = -20.0
+MAX_GAIN_DB: float = 24.0
+MIN_GAIN_DB: float = -12.0
+# Blocks quieter than this are pauses and leave the gain unchanged, so
+# background noise is not pumped up between words
+NOISE_GATE_DBFS: float = -55.0
+# Time constants of the gain: it falls quickly on loud input and rises slowly
+ATTACK_SECONDS: float = 0.05
+RELEASE_SECONDS: float = 1.0
+
+
+def _dbfs(rms: float) -> float:
+    return 20 * math.log10(max(rms, 1e-10))
+
+
+class AudioPreprocessor:
+    """Removes DC offset and low-frequency noise and levels the loudness.
+
+    Works block by block on the capture callback's output, carrying the
+    filter state and the gain across blocks, so the result does not depend
+    on how the stream is split. The DC blocker and the high-pass filter
+    run as one cascade of second-order sections. The automatic gain
+    control moves the speech level towards ``TARGET_RMS_DBFS``, ramping
+    the gain across each block to avoid clicks.
+    """
+
+    def __init__(
+        self, sample_rate: int = 16000, channels: int = 1, *, agc: bool = True
+    ) -> None:
+        """Initialize the AudioPreprocessor.
+
+        Args:
+            sample_rate: Sampling rate of the audio in Hz.
+            channels: Number of audio channels.
+            agc: Whether to normalize the loudness as well as filter.
+
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.agc = agc
+        dc_blocker = np.array([[1.0, -1.0, 0.0, 1.0, -DC_POLE, 0.0]])
+        highpass = signal.butter(
+            HIGHPASS_ORDER, HIGHPASS_HZ, btype="highpass", fs=sample_rate, output="sos"
+        )
+        self.sos = np.vstack((dc_blocker, highpass))
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the carried state so a new stream can be processed."""
+        self._zi = np.zeros((len(self.sos), 2, self.channels))
+        self.gain_db = 0.0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Condition the next block of audio.
+
+        Args:
+            block: Float audio samples shaped ``(frames, channels)``.
+
+        Returns:
+            The processed block, float32 in the range [-1, 1].
+
+        """
+        block = np.asarray(block, dtype=np.float32).reshape(-1, self.channels)
+        if not len(block):
+            return block
+        filtered, self._zi = signal.sosfilt(self.sos, block, axis=0, zi=self._zi)
+        if not self.agc:
+            return filtered.astype(np.float32)
+
+        previous = self.gain_db
+        level = _dbfs(float(np.sqrt(np.mean(np.square(filtered)))))
+        if level > NOISE_GATE_DBFS:
+            wanted = min(MAX_GAIN_DB, max(MIN_GAIN_DB, TARGET_RMS_DBFS - level))
+            tau = ATTACK_SECONDS if wanted < previous else RELEASE_SECONDS
+            step = 1 - math.exp(-len(block) / (self.sample_rate * tau))
+            self.gain_db = previous + (wanted - previous) * step
+
+        ramp = np.linspace(previous, self.gain_db, len(block), dtype=np.float32)
+        gain = np.power(np.float32(10), ramp / 20)[:, None]
+        return np.clip(filtered * gain, -1.0, 1.0).astype(np.float32)
@@ -0,0 +1,437 @@
+"""Transcriber hosted in a worker process, fed through shared memory."""
+
+from __future__ import annotations
+
+import contextlib
+import multiprocessing as mp
+import threading
+import weakref
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Any, Final, Protocol
+
+import numpy as np
+import psutil
+
+from whisper_typing.governor import pin_process
+from whisper_typing.transcriber import DecodeMetrics, Transcriber
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from multiprocessing.process import BaseProcess
+
+SAMPLE_RATE: Final[int] = 16000
+# Initial ring capacity; grown on demand for longer recordings
+RING_SECONDS: Final[int] = 60
+# How often a waiting caller checks whether its request was abandoned
+CANCEL_POLL_SECONDS: Final[float] = 0.05
+# Decoding options forwarded with every request
+DECODE_OPTIONS: Final[tuple[str, ...]] = (
+    "language",
+    "learn_language_after",
+    "greedy_first",
+    "escalation_beam_size",
+    "decode_guard",
+)
+
+
+def _read_ring(
+    shm: shared_memory.SharedMemory, capacity: int, offset: int, length: int
+) -> np.ndarray:
+    """Copy a range of samples out of the shared ring.
+
+    Args:
+        shm: The shared memory block.
+        capacity: Ring size in samples.
+        offset: Index of the first sample.
+        length: Number of samples.
+
+    Returns:
+        The samples as a float32 array.
+
+    """
+    ring = np.ndarray((capacity,), dtype=np.float32, buffer=shm.buf)
+    # A copy, so no view pins the block when the parent resizes the ring
+    return ring[offset : offset + length].copy()
+
+
+class _Flag(Protocol):
+    """An event shared with the worker process."""
+
+    def is_set(self) -> bool: ...
+
+    def set(self) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+def _worker_main(  # noqa: PLR0913, PLR0917
+    conn: Connection,
+    shm_name: str,
+    capacity: int,
+    abort: _Flag,
+    transcriber_cls: type[Transcriber],
+    kwargs: dict[str, Any],
+) -> None:
+    """Serve transcription requests until told to close.
+
+    Args:
+        conn: Pipe end for requests and replies.
+        shm_name: Name of the shared audio ring.
+        capacity: Ring size in samples.
+        abort: Set by the parent to stop the pass in progress after its
+            current segment.
+        transcriber_cls: Transcriber implementation to host.
+        kwargs: Arguments for the transcriber.
+
+    """
+    # The parent owns the ring; the worker must not unlink it on exit
+    shm = shared_memory.SharedMemory(name=shm_name, track=False)
+    try:
+        # The whole worker decodes, so it is pinned as a process
+        pin_process(kwargs.pop("cpu_cores", None))
+        transcriber = transcriber_cls(**kwargs)
+    except Exception as e:  # noqa: BLE001
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        shm.close()
+        return
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            command, *args = conn.recv()
+        except EOFError:
+            break
+        try:
+            if command == "close":
+                break
+            if command == "resize":
+                shm.close()
+                shm = shared_memory.SharedMemory(name=args[0], track=False)
+                capacity = args[1]
+                conn.send(("ok", None))
+            elif command == "transcribe":
+                offset, length, streaming, new_recording, options = args
+                if new_recording:
+                    transcriber.begin_recording()
+                for name, value in options.items():
+                    setattr(transcriber, name, value)
+                audio = _read_ring(shm, capacity, offset, length)
+                text = transcriber.transcribe(audio, streaming=streaming, cancel=abort)
+                metrics = transcriber.decode_metrics.snapshot()
+                conn.send(("ok", (text, metrics, transcriber.pinned_language)))
+        except Exception as e:  # noqa: BLE001
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+    shm.close()
+
+
+def _shutdown(
+    process: BaseProcess, conn: Connection, shm: list[shared_memory.SharedMemory]
+) -> None:
+    """Stop the worker and release the shared ring.
+
+    Args:
+        process: The worker process.
+        conn: Pipe end to the worker.
+        shm: Holder of the current shared memory block.
+
+    """
+    with contextlib.suppress(Exception):
+        conn.send(("close",))
+    process.join(timeout=5)
+    if process.is_alive():
+        process.terminate()
+    conn.close()
+    shm[0].close()
+    shm[0].unlink()
+
+
+class RemoteDecodeMetrics:
+    """Decode counters last reported by the worker process."""
+
+    def __init__(self) -> None:
+        """Initialize the RemoteDecodeMetrics."""
+        self._snapshot = DecodeMetrics().snapshot()
+
+    def update(self, snapshot: dict[str, Any]) -> None:
+        """Store the counters reported with a result.
+
+        Args:
+            snapshot: The worker's decode counters.
+
+        """
+        self._snapshot = snapshot
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the last reported counters.
+
+        Returns:
+            A dictionary of metric names to values.
+
+        """
+        return dict(self._snapshot)
+
+
+class ProcessTranscriber:
+    """Runs a Transcriber in a worker process.
+
+    Decoding then no longer competes with the UI, the hotkey listener and
+    the audio callback for the GIL. Audio is written into a shared memory
+    ring that the worker reads directly, so only the sample range crosses
+    the pipe; the text comes back over the same pipe. Calls block until
+    the worker replies, like ``Transcriber.transcribe`` does, but an
+    abandoned pass is stopped in the worker too, so the next request
+    doesn't queue behind it.
+    """
+
+    def __init__(
+        self,
+        *,
+        transcriber_cls: type[Transcriber] = Transcriber,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Start the worker and load the model in it.
+
+        Args:
+            transcriber_cls: Transcriber implementation to host.
+            **kwargs: Arguments for the transcriber.
+
+        Raises:
+            RuntimeError: If the worker fails to load the model.
+
+        """
+        self.language: str | None = kwargs.get("language")
+        self.learn_language_after: int = kwargs.get("learn_language_after", 0)
+        self.greedy_first: bool = kwargs.get("greedy_first", False)
+        self.escalation_beam_size: int = kwargs.get("escalation_beam_size", 5)
+        self.decode_guard: bool = kwargs.get("decode_guard", False)
+        self.decode_metrics = RemoteDecodeMetrics()
+        # Language the worker pinned for the current recording
+        self.pinned_language: str | None = None
+
+        self._lock: Final[threading.Lock] = threading.Lock()
+        self._capacity = RING_SECONDS * SAMPLE_RATE
+        self._write_pos = 0
+        # Ring index and length of the live buffer last handed over
+        self._stream: tuple[int, int] | None = None
+        # Sent with the next request, so starting a recording never waits
+        # for the worker
+        self._new_recording = False
+        # Held in a list so the finalizer sees the ring after a resize
+        self._shm = [self._create_ring(self._capacity)]
+
+        ctx = mp.get_context("spawn")
+        self._abort: _Flag = ctx.Event()
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                self._shm[0].name,
+                self._capacity,
+                self._abort,
+                transcriber_cls,
+                kwargs,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._finalizer = weakref.finalize(
+            self, _shutdown, self._process, self._conn, self._shm
+        )
+
+        status, message = self._receive()
+        if status != "ready":
+            self._finalizer()
+            msg = f"Transcriber process failed to start: {message}"
+            raise RuntimeError(msg)
+
+    @staticmethod
+    def _create_ring(capacity: int) -> shared_memory.SharedMemory:
+        """Allocate a shared ring.
+
+        Args:
+            capacity: Ring size in samples.
+
+        Returns:
+            The shared memory block.
+
+        """
+        return shared_memory.SharedMemory(
+            create=True, size=capacity * np.dtype(np.float32).itemsize
+        )
+
+    def transcribe(
+        self,
+        audio_input: np.ndarray,
+        *,
+        streaming: bool = False,
+        cancel: threading.Event | None = None,
+    ) -> str:
+        """Transcribe audio in the worker process.
+
+        Args:
+            audio_input: Numpy array of audio samples (float32, 16kHz).
+            streaming: The audio is the growing live buffer of the recording.
+            cancel: Set to abandon the pass. A request still waiting for
+                the worker is dropped; one it is decoding stops after the
+                current segment.
+
+        Returns:
+            The transcribed text ("" if abandoned before it started).
+
+        """
+        audio = np.asarray(audio_input, dtype=np.float32).reshape(-1)
+        options = {name: getattr(self, name) for name in DECODE_OPTIONS}
+        with self._lock:
+            if cancel is not None and cancel.is_set():
+                return ""
+            new_recording, self._new_recording = self._new_recording, False
+            if new_recording:
+                self._stream = None
+            offset = self._write_audio(audio, streaming=streaming)
+            self._abort.clear()
+            text, metrics, self.pinned_language = self._request(
+                "transcribe",
+                offset,
+                len(audio),
+                streaming,
+                new_recording,
+                options,
+                cancel=cancel,
+            )
+        self.decode_metrics.update(metrics)
+        return text
+
+    def begin_recording(self) -> None:
+        """Forget the language and features of the previous recording.
+
+        Only marks the next request, so it returns at once even while the
+        worker is still busy with an abandoned live pass.
+        """
+        self._new_recording = True
+        self.pinned_language = None
+
+    def close(self) -> None:
+        """Stop the worker process and free the shared ring."""
+        self._finalizer()
+
+    def memory_bytes(self) -> int:
+        """Return the resident set size of the worker process.
+
+        The model lives in the worker, so this is its memory; the parent
+        only holds the handle and the shared ring.
+
+        Returns:
+            The worker's RSS in bytes (0 once it has exited).
+
+        """
+        if not self._process.is_alive():
+            return 0
+        try:
+            return psutil.Process(self._process.pid).memory_info().rss
+        except psutil.Error:
+            return 0
+
+    def _write_audio(self, audio: np.ndarray, *, streaming: bool) -> int:
+        """Copy audio into the ring. Caller holds the lock.
+
+        The live buffer only grows during a recording, so for a streaming
+        request just the samples captured since the previous one are
+        copied, after the part already in the ring.
+
+        Args:
+            audio: The samples to hand over.
+            streaming: The audio is the live buffer of the recording.
+
+        Returns:
+            Ring index of the first sample.
+
+        """
+        length = len(audio)
+        stream, self._stream = self._stream, None
+        if streaming and stream is not None:
+            offset, written = stream
+            if written <= length and offset + length <= self._capacity:
+                ring = self._ring()
+                ring[offset + written : offset + length] = audio[written:]
+                self._stream = (offset, length)
+                self._write_pos = offset + length
+                return offset
+
+        if length > self._capacity:
+            self._grow(length)
+        # Keep each request contiguous: wrap when it doesn't fit at the end
+        offset = self._write_pos if self._write_pos + length <= self._capacity else 0
+        self._ring()[offset : offset + length] = audio
+        self._write_pos = offset + length
+        if streaming:
+            self._stream = (offset, length)
+        return offset
+
+    def _ring(self) -> np.ndarray:
+        """Return the current shared ring as an array. Caller holds the lock."""
+        return np.ndarray((self._capacity,), dtype=np.float32, buffer=self._shm[0].buf)
+
+    def _grow(self, samples: int) -> None:
+        """Replace the ring with one large enough for a recording.
+
+        Args:
+            samples: Number of samples that must fit.
+
+        """
+        capacity = max(samples, 2 * self._capacity)
+        shm = self._create_ring(capacity)
+        self._request("resize", shm.name, capacity)
+        old = self._shm[0]
+        self._shm[0] = shm
+        self._capacity = capacity
+        self._write_pos = 0
+        old.close()
+        old.unlink()
+
+    def _request(
+        self,
+        *message: Any,  # noqa: ANN401
+        cancel: threading.Event | None = None,
+    ) -> Any:  # noqa: ANN401
+        """Send a command and wait for its reply. Caller holds the lock.
+
+        Args:
+            *message: The command and its arguments.
+            cancel: Set to make the worker stop the request early; its
+                (partial) reply is still awaited, keeping the pipe in step.
+
+        Returns:
+            The reply payload.
+
+        Raises:
+            RuntimeError: If the worker reports an error or has died.
+
+        """
+        self._conn.send(message)
+        if cancel is not None:
+            while not self._conn.poll(CANCEL_POLL_SECONDS):
+                if cancel.is_set():
+                    self._abort.set()
+                    break
+        status, payload = self._receive()
+        if status != "ok":
+            raise RuntimeError(payload)
+        return payload
+
+    def _receive(self) -> tuple[str, Any]:
+        """Wait for the worker's next message.
+
+        Returns:
+            The status and payload.
+
+        Raises:
+            RuntimeError: If the worker has died.
+
+        """
+        try:
+            return self._conn.recv()
+        except EOFError as e:
+            msg = "Transcriber process exited unexpectedly"
+            raise RuntimeError(msg) from e
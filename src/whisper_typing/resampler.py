@@ -0,0 +1,141 @@
+"""Streaming polyphase resampling for captured audio."""
+
+from math import gcd
+
+import numpy as np
+from scipy import signal
+
+# Same anti-aliasing design as scipy.signal.resample_poly
+HALF_LEN_FACTOR: int = 10
+KAISER_BETA: float = 5.0
+
+
+class StreamingResampler:
+    """Resamples audio block by block, carrying filter state across blocks.
+
+    Output is identical to filtering the whole signal at once: each block
+    is filtered together with the input history the polyphase filter still
+    needs, and only output samples that are fully determined are emitted.
+    The filter's group delay is compensated, so output sample ``n`` lines up
+    with input time ``n / output_rate``.
+    """
+
+    def __init__(self, input_rate: int, output_rate: int, channels: int = 1) -> None:
+        """Initialize the StreamingResampler.
+
+        Args:
+            input_rate: Sampling rate of the incoming audio in Hz.
+            output_rate: Desired sampling rate in Hz.
+            channels: Number of audio channels.
+
+        """
+        divisor = gcd(input_rate, output_rate)
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+        self.channels = channels
+        self.delay = 0
+        self.taps = np.ones(1, dtype=np.float32)
+
+        if not self.passthrough:
+            self._design_filter()
+
+        self._history = np.zeros((0, channels), dtype=np.float32)
+        self._history_start = 0  # absolute input index of _history[0]
+        self._total_in = 0
+        self._next_out = 0
+
+    def _design_filter(self) -> None:
+        """Design the anti-aliasing filter for the conversion ratio."""
+        # Round the half length up so the group delay is a whole number of
+        # output samples
+        half_len = HALF_LEN_FACTOR * max(self.up, self.down)
+        half_len += -half_len % self.down
+        self.delay = half_len // self.down
+        self.taps = (
+            signal.firwin(
+                2 * half_len + 1,
+                1.0 / max(self.up, self.down),
+                window=("kaiser", KAISER_BETA),
+            ).astype(np.float32)
+            * self.up
+        )
+
+    @property
+    def passthrough(self) -> bool:
+        """Whether input and output rates are equal."""
+        return self.up == self.down
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample the next block of audio.
+
+        Args:
+            block: Audio samples shaped ``(frames, channels)``.
+
+        Returns:
+            The newly available output samples shaped ``(frames, channels)``.
+
+        """
+        block = np.asarray(block, dtype=np.float32).reshape(-1, self.channels)
+        if self.passthrough:
+            return block
+
+        self._history = np.concatenate((self._history, block))
+        self._total_in += len(block)
+        # Output n needs upsampled input up to (n + delay) * down
+        last_out = (self._total_in - 1) * self.up // self.down - self.delay
+        return self._emit(last_out)
+
+    def flush(self) -> np.ndarray:
+        """Emit the output still held back by the filter delay.
+
+        Returns:
+            The remaining output samples shaped ``(frames, channels)``.
+
+        """
+        if self.passthrough or not self._total_in:
+            return np.zeros((0, self.channels), dtype=np.float32)
+
+        expected = -(-self._total_in * self.up // self.down)
+        # Zero padding stands in for the input after the end of the stream
+        pad = -(-(len(self.taps) + self.delay * self.down) // self.up) + 1
+        self._history = np.concatenate(
+            (self._history, np.zeros((pad, self.channels), dtype=np.float32))
+        )
+        out = self._emit(expected - 1)
+        self.reset()
+        return out
+
+    def reset(self) -> None:
+        """Forget all carried state so a new stream can be processed."""
+        self._history = np.zeros((0, self.channels), dtype=np.float32)
+        self._history_start = 0
+        self._total_in = 0
+        self._next_out = 0
+
+    def _emit(self, last_out: int) -> np.ndarray:
+        """Filter the carried history and emit outputs up to ``last_out``.
+
+        Args:
+            last_out: Absolute index of the last output sample to emit.
+
+        Returns:
+            The output samples shaped ``(frames, channels)``.
+
+        """
+        if last_out < self._next_out:
+            return np.zeros((0, self.channels), dtype=np.float32)
+
+        filtered = signal.upfirdn(self.taps, self._history, self.up, self.down, axis=0)
+        # _history_start is a multiple of down, so it maps to a whole output
+        offset = self._history_start * self.up // self.down - self.delay
+        out = filtered[self._next_out - offset : last_out - offset + 1]
+        self._next_out = last_out + 1
+
+        # Drop history no longer reachable by the filter for the next output
+        first_tap = (self._next_out + self.delay) * self.down - len(self.taps) + 1
+        needed = first_tap // self.up
+        trim = max(0, needed - self._history_start) // self.down * self.down
+        if trim:
+            self._history = self._history[trim:]
+            self._history_start += trim
+        return out.astype(np.float32, copy=False)
@@ -0,0 +1,72 @@
+"""Text diffing utilities shared by the preview and the typer."""
+
+import difflib
+from collections.abc import Sequence
+
+# (tag, i1, i2, j1, j2) as produced by difflib.SequenceMatcher.get_opcodes()
+Opcode = tuple[str, int, int, int, int]
+
+# Keystroke step: ("left" | "right" | "backspace", count) or ("type", text)
+EditStep = tuple[str, int | str]
+
+
+def diff_opcodes(old: Sequence[str], new: Sequence[str]) -> list[Opcode]:
+    """Compute the opcodes that turn one sequence into another.
+
+    Args:
+        old: The original sequence (characters or words).
+        new: The target sequence.
+
+    Returns:
+        A list of difflib opcodes.
+
+    """
+    # autojunk would treat frequent characters (spaces) as junk on long text
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    return matcher.get_opcodes()
+
+
+def build_edit_script(old: str, new: str) -> list[EditStep]:
+    """Build the keystrokes that turn already typed text into new text.
+
+    The cursor is assumed to sit at the end of ``old``. Edits are applied
+    from the end backwards so earlier offsets stay valid, and the script
+    ends by moving the cursor back to the end of ``new``.
+
+    Args:
+        old: The text that has already been typed.
+        new: The text it should become.
+
+    Returns:
+        A list of keystroke steps.
+
+    """
+    steps: list[EditStep] = []
+    cursor = len(old)
+    for tag, i1, i2, j1, j2 in reversed(diff_opcodes(old, new)):
+        if tag == "equal":
+            continue
+        if cursor > i2:
+            steps.append(("left", cursor - i2))
+        if i2 > i1:
+            steps.append(("backspace", i2 - i1))
+        if j2 > j1:
+            steps.append(("type", new[j1:j2]))
+        cursor = i1 + (j2 - j1)
+
+    if steps and cursor < len(new):
+        steps.append(("right", len(new) - cursor))
+    return steps
+
+
+def edit_script_cost(steps: list[EditStep]) -> int:
+    """Count the keystrokes needed to run an edit script.
+
+    Args:
+        steps: The keystroke steps.
+
+    Returns:
+        The total number of key presses.
+
+    """
+    return sum(len(value) if isinstance(value, str) else value for _, value in steps)
@@ -1,28 +1,217 @@
-"""Audio transcription using faster-whisper."""
+"""Audio transcription using Whisper models."""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Final
 
 import torch
-from faster_whisper import WhisperModel
+from faster_whisper import decode_audio
 
+from whisper_typing.backends import DEFAULT_BACKEND, load_backend
 from whisper_typing.constants import WHISPER_NAME_MAP
+from whisper_typing.governor import pinned_to
+from whisper_typing.tuning import TUNING_PATH, load_tuned_settings
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
     import numpy as np
+    from faster_whisper.transcribe import Segment
+
+SAMPLE_RATE: Final[int] = 16000
+# Speech needed before the detected language is trusted for a recording
+LANGUAGE_DETECT_SECONDS: Final[float] = 2.0
+# Audio searched for that speech, from the start of the recording
+LANGUAGE_SEARCH_SECONDS: Final[float] = 10.0
+LANGUAGE_MIN_PROBABILITY: Final[float] = 0.5
+
+# A greedy segment beyond any of these limits is decoded again with a beam.
+# They are stricter than faster-whisper's own temperature fallback limits.
+ESCALATE_AVG_LOGPROB: Final[float] = -0.7
+ESCALATE_COMPRESSION_RATIO: Final[float] = 2.0
+ESCALATE_NO_SPEECH_PROB: Final[float] = 0.4
+
+# Runaway-decode guard. Whisper may loop on a phrase until it reaches its
+# token limit on near-silent or noisy audio, so new tokens are capped by
+# the audio duration: even fast speech stays well under this rate.
+GUARD_TOKENS_PER_SECOND: Final[float] = 8.0
+GUARD_TOKEN_MARGIN: Final[int] = 16
+# Whisper's own limit on new tokens per 30 s window
+MAX_NEW_TOKENS: Final[int] = 224
+WINDOW_SECONDS: Final[float] = 30.0
+GUARD_COMPRESSION_RATIO: Final[float] = 2.4
+GUARD_NO_SPEECH_PROB: Final[float] = 0.8
+# A segment ending in this many repeats of the same n-gram is a loop
+GUARD_REPEATS: Final[int] = 4
+GUARD_MAX_NGRAM: Final[int] = 8
+GUARD_REASONS: Final[tuple[str, ...]] = ("repetition", "compression", "no_speech")
+
+
+def token_budget(audio_seconds: float) -> int:
+    """Return the most new tokens a window of audio can plausibly hold.
+
+    Args:
+        audio_seconds: Duration of the audio being decoded.
+
+    Returns:
+        The token limit per window.
+
+    """
+    window = min(audio_seconds, WINDOW_SECONDS)
+    budget = math.ceil(window * GUARD_TOKENS_PER_SECOND) + GUARD_TOKEN_MARGIN
+    return min(MAX_NEW_TOKENS, budget)
+
+
+def is_repetitive(tokens: list[int]) -> bool:
+    """Check whether tokens end in a loop of one repeated n-gram.
+
+    Args:
+        tokens: Token IDs of a segment.
+
+    Returns:
+        True if the last n-gram repeats ``GUARD_REPEATS`` times in a row.
+
+    """
+    for n in range(1, GUARD_MAX_NGRAM + 1):
+        if len(tokens) < n * GUARD_REPEATS:
+            break
+        unit = tokens[-n:]
+        end = len(tokens)
+        if all(
+            tokens[end - (i + 1) * n : end - i * n] == unit
+            for i in range(1, GUARD_REPEATS)
+        ):
+            return True
+    return False
+
+
+class DecodeMetrics:
+    """Counters for how much audio needed a second, more expensive decode.
+
+    Covers beam search escalation, faster-whisper's temperature fallback
+    and the runaway-decode guard.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the DecodeMetrics."""
+        self._lock: Final[threading.Lock] = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self.passes = 0
+            self.audio_seconds = 0.0
+            self.segments = 0
+            self.escalated_segments = 0
+            self.escalated_seconds = 0.0
+            self.guard_counts = dict.fromkeys(GUARD_REASONS, 0)
+            self.guard_saved_seconds = 0.0
+            self.decoded_segments = 0
+            self.fallback_segments = 0
+
+    def record_pass(
+        self,
+        audio_seconds: float,
+        segments: int,
+        escalated_segments: int,
+        escalated_seconds: float,
+    ) -> None:
+        """Record one transcription pass.
+
+        Args:
+            audio_seconds: Duration of the transcribed audio.
+            segments: Number of segments decoded.
+            escalated_segments: Segments decoded again with a larger beam.
+            escalated_seconds: Audio covered by the escalated segments.
+
+        """
+        with self._lock:
+            self.passes += 1
+            self.audio_seconds += audio_seconds
+            self.segments += segments
+            self.escalated_segments += escalated_segments
+            self.escalated_seconds += escalated_seconds
+
+    def record_segment(self, *, fallback: bool) -> None:
+        """Record a decoded segment.
+
+        Args:
+            fallback: The segment needed temperature fallback, i.e. was
+                decoded more than once.
+
+        """
+        with self._lock:
+            self.decoded_segments += 1
+            self.fallback_segments += fallback
+
+    def record_guard(self, reason: str, saved_seconds: float = 0.0) -> None:
+        """Record a segment dropped by the runaway-decode guard.
+
+        Args:
+            reason: Which check fired (one of ``GUARD_REASONS``).
+            saved_seconds: Estimated decode time the guard avoided.
+
+        """
+        with self._lock:
+            self.guard_counts[reason] += 1
+            self.guard_saved_seconds += saved_seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current counters.
+
+        Returns:
+            A dictionary of metric names to values.
+
+        """
+        with self._lock:
+            return {
+                "passes": self.passes,
+                "audio_seconds": self.audio_seconds,
+                "segments": self.segments,
+                "escalated_segments": self.escalated_segments,
+                "escalated_fraction": (
+                    self.escalated_seconds / self.audio_seconds
+                    if self.audio_seconds
+                    else 0.0
+                ),
+                "decoded_segments": self.decoded_segments,
+                "fallback_segments": self.fallback_segments,
+                "fallback_rate": (
+                    self.fallback_segments / self.decoded_segments
+                    if self.decoded_segments
+                    else 0.0
+                ),
+                "guard_fired": sum(self.guard_counts.values()),
+                "guard_reasons": dict(self.guard_counts),
+                "guard_saved_seconds": self.guard_saved_seconds,
+            }
 
 
 class Transcriber:
     """Handles speech-to-text conversion using Whisper models."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         model_id: str = "openai/whisper-base",
         language: str | None = None,
         device: str = "cpu",
         compute_type: str = "auto",
         download_root: str | None = None,
+        *,
+        cpu_threads: int = 0,
+        num_workers: int = 0,
+        tuning_path: str | None = TUNING_PATH,
+        learn_language_after: int = 0,
+        greedy_first: bool = False,
+        escalation_beam_size: int = 5,
+        decode_guard: bool = False,
+        backend: str = DEFAULT_BACKEND,
+        backend_options: dict[str, Any] | None = None,
+        cpu_cores: list[int] | None = None,
     ) -> None:
         """Initialize the Transcriber.
 
@@ -32,12 +221,41 @@ class Transcriber:
             device: Device to run the model on ('cpu' or 'cuda').
             compute_type: Quantization type for the model.
             download_root: Directory to download models to.
+            cpu_threads: CPU threads per decode (0 = tuned or library default).
+            num_workers: Decodes that can run concurrently (0 = tuned or 1).
+            tuning_path: Tuning cache to take unset settings from (None to
+                ignore it).
+            learn_language_after: Recordings in a row that must detect the
+                same language before it becomes the session default
+                (0 = never).
+            greedy_first: Decode greedily and re-decode only low-confidence
+                segments with a beam search.
+            escalation_beam_size: Beam size for re-decoded segments.
+            decode_guard: Cap tokens by audio duration and drop looping,
+                repetitive or non-speech segments.
+            backend: Runtime to decode with (see ``whisper_typing.backends``).
+            backend_options: Options specific to the backend, such as the
+                assistant model of the "assisted" backend.
+            cpu_cores: Cores to pin the decoder threads to (None = any;
+                only honoured on Linux, see ``pinned_to``).
 
         """
         self.download_root = download_root
         self.model_name = WHISPER_NAME_MAP.get(model_id, model_id)
         self.language = language
 
+        # Language detected for the current recording, and the session
+        # default learned from agreeing recordings
+        self.learn_language_after = learn_language_after
+        self.pinned_language: str | None = None
+        self.session_language: str | None = None
+        self._detected_history: list[str] = []
+
+        self.greedy_first = greedy_first
+        self.escalation_beam_size = escalation_beam_size
+        self.decode_guard = decode_guard
+        self.decode_metrics = DecodeMetrics()
+
         # Validate device
         if device.startswith("cuda") and not torch.cuda.is_available():
             device = "cpu"
@@ -55,31 +273,369 @@ class Transcriber:
         else:
             self.compute_type = compute_type
 
-        self.model = WhisperModel(
-            self.model_name,
-            device=self.device,
-            compute_type=self.compute_type,
-            download_root=self.download_root,
+        # Settings benchmarked on this machine fill in what wasn't set
+        self.tuned = (
+            load_tuned_settings(self.model_name, self.device, tuning_path)
+            if tuning_path
+            else None
         )
+        if self.tuned:
+            if compute_type == "auto":
+                self.compute_type = self.tuned.compute_type
+            cpu_threads = cpu_threads or self.tuned.cpu_threads
+            num_workers = num_workers or self.tuned.num_workers
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers or 1
 
-    def transcribe(self, audio_input: str | np.ndarray) -> str:
+        # The decoder's threads start while loading and inherit the pinning
+        with pinned_to(cpu_cores):
+            self.backend = load_backend(
+                backend,
+                model_id,
+                device=self.device,
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+                num_workers=self.num_workers,
+                download_root=self.download_root,
+                **(backend_options or {}),
+            )
+        self.model_path = self.backend.model_path
+
+    def transcribe(
+        self,
+        audio_input: str | np.ndarray,
+        *,
+        streaming: bool = False,
+        cancel: threading.Event | None = None,
+    ) -> str:
         """Transcribe audio input (file path or numpy array) to text.
 
         Args:
             audio_input: File path to audio or numpy array of audio samples.
+            streaming: The audio is the live buffer of the current recording,
+                extended since the previous streaming call, so the backend
+                can update its features incrementally instead of
+                recomputing them.
+            cancel: Set to abandon the pass; decoding stops after the
+                current segment and the text so far is returned.
 
         Returns:
             The transcribed text.
 
         """
-        # Faster-whisper handles numpy arrays directly (float32, 16kHz)
+        # Backends handle numpy arrays directly (float32, 16kHz)
+        language = self.language or self._recording_language(audio_input)
+        streaming = streaming and not isinstance(audio_input, str)
+        if self.greedy_first:
+            return self._transcribe_escalating(
+                audio_input, language, streaming=streaming, cancel=cancel
+            )
 
-        segments, _info = self.model.transcribe(
-            audio_input,
+        audio = self._audio_array(audio_input) if self.decode_guard else audio_input
+        segments, _info = self._decode(
+            audio,
+            streaming=streaming,
+            cancel=cancel,
             beam_size=5,
-            language=self.language,
-            condition_on_previous_text=False,  # recommended for real-time/short clips
+            language=language,
+            **self._guard_options(audio),
         )
+        if self.decode_guard:
+            segments = self._guarded(
+                segments, len(audio) / SAMPLE_RATE, streaming=streaming
+            )
 
         # Consolidate segments
         return " ".join([segment.text for segment in segments]).strip()
+
+    def _decode(
+        self,
+        audio: str | np.ndarray,
+        *,
+        streaming: bool = False,
+        cancel: threading.Event | None = None,
+        **options: Any,  # noqa: ANN401
+    ) -> tuple[Iterator[Segment], Any]:
+        """Run the backend, counting temperature fallbacks as segments arrive.
+
+        Args:
+            audio: File path to audio or numpy array of audio samples.
+            streaming: The audio is the live buffer of the current recording,
+                so the backend may reuse work from the previous live pass.
+            cancel: Set to stop decoding further segments.
+            **options: Decoding options, as for ``WhisperModel.transcribe``.
+
+        Returns:
+            The lazily decoded segments and the transcription info.
+
+        """
+        decode = self.backend.stream if streaming else self.backend.transcribe
+        segments, info = decode(
+            audio,
+            condition_on_previous_text=False,  # recommended for real-time
+            **options,
+        )
+
+        def counted() -> Iterator[Segment]:
+            for segment in segments:
+                # Decoded again at a higher temperature after failing checks
+                self.decode_metrics.record_segment(fallback=segment.temperature > 0)
+                yield segment
+                if cancel is not None and cancel.is_set():
+                    return  # Segments are lazy: the rest is never decoded
+
+        return counted(), info
+
+    @staticmethod
+    def _audio_array(audio_input: str | np.ndarray) -> np.ndarray:
+        """Return the samples of an audio input.
+
+        Args:
+            audio_input: File path to audio or numpy array of audio samples.
+
+        Returns:
+            The audio as a numpy array (float32, 16kHz).
+
+        """
+        if isinstance(audio_input, str):
+            return decode_audio(audio_input, sampling_rate=SAMPLE_RATE)
+        return audio_input
+
+    def _guard_options(self, audio: str | np.ndarray) -> dict[str, Any]:
+        """Return the decoding options the runaway-decode guard adds.
+
+        Args:
+            audio: The audio being decoded (samples when the guard is on).
+
+        Returns:
+            Keyword arguments for the backend's ``transcribe``.
+
+        """
+        if not self.decode_guard:
+            return {}
+        return {"max_new_tokens": token_budget(len(audio) / SAMPLE_RATE)}
+
+    def _guarded(
+        self, segments: Iterable[Segment], audio_seconds: float, *, streaming: bool
+    ) -> Iterator[Segment]:
+        """Drop runaway segments as each one finishes decoding.
+
+        Segments are only checked once the backend has produced them, so
+        a loop inside a segment is not cut short here: the token cap from
+        ``token_budget`` is what bounds it. A looping or overly repetitive
+        segment is then dropped. On a live pass the rest of the buffer is
+        not decoded either, since the model is stuck on it and the next
+        pass starts afresh; a final pass goes on with the following
+        windows. Segments that are most likely not speech are dropped as
+        well.
+
+        Args:
+            segments: Segments as lazily produced by faster-whisper.
+            audio_seconds: Duration of the decoded audio.
+            streaming: The audio is the live buffer of the current recording.
+
+        Yields:
+            The segments to keep.
+
+        """
+        budget = token_budget(audio_seconds)
+        iterator = iter(segments)
+        decode_seconds = 0.0
+        tokens = 0
+        while True:
+            # Only time spent inside the decoder, not in the caller
+            started = time.perf_counter()
+            segment = next(iterator, None)
+            decode_seconds += time.perf_counter() - started
+            if segment is None:
+                return
+            tokens += len(segment.tokens)
+
+            reason = self._guard_reason(segment)
+            if reason is None:
+                yield segment
+                continue
+            if reason == "no_speech":
+                self.decode_metrics.record_guard(reason)
+                continue
+
+            # Without the cap the loop would have run to Whisper's limit
+            saved = (MAX_NEW_TOKENS - budget) * decode_seconds / max(tokens, 1)
+            if streaming and 0 < segment.end < audio_seconds:
+                remaining = audio_seconds - segment.end
+                saved += remaining * decode_seconds / segment.end
+                self.decode_metrics.record_guard(reason, saved)
+                return
+            self.decode_metrics.record_guard(reason, saved)
+
+    @staticmethod
+    def _guard_reason(segment: Segment) -> str | None:
+        """Check whether a segment is a runaway decode.
+
+        Args:
+            segment: A decoded segment.
+
+        Returns:
+            The check that fired (one of ``GUARD_REASONS``), or None.
+
+        """
+        if is_repetitive(segment.tokens):
+            return "repetition"
+        if segment.compression_ratio > GUARD_COMPRESSION_RATIO:
+            return "compression"
+        if segment.no_speech_prob > GUARD_NO_SPEECH_PROB:
+            return "no_speech"
+        return None
+
+    def _transcribe_escalating(
+        self,
+        audio_input: str | np.ndarray,
+        language: str | None,
+        *,
+        streaming: bool,
+        cancel: threading.Event | None = None,
+    ) -> str:
+        """Decode greedily, then re-decode low-confidence segments with a beam.
+
+        Args:
+            audio_input: File path to audio or numpy array of audio samples.
+            language: Language code, or None to detect it.
+            streaming: The audio is the live buffer of the current recording.
+            cancel: Set to abandon the pass.
+
+        Returns:
+            The transcribed text.
+
+        """
+        audio = self._audio_array(audio_input)
+        audio_seconds = len(audio) / SAMPLE_RATE
+        segments, info = self._decode(
+            audio,
+            streaming=streaming,
+            cancel=cancel,
+            beam_size=1,
+            language=language,
+            **self._guard_options(audio),
+        )
+        if self.decode_guard:
+            segments = self._guarded(segments, audio_seconds, streaming=streaming)
+
+        texts = []
+        count = escalated = 0
+        escalated_seconds = 0.0
+        for segment in segments:
+            count += 1
+            if cancel is not None and cancel.is_set():
+                break
+            if not self._needs_escalation(segment):
+                texts.append(segment.text.strip())
+                continue
+            start = int(segment.start * SAMPLE_RATE)
+            end = int(segment.end * SAMPLE_RATE)
+            part = audio[start:end]
+            redone, _ = self._decode(
+                part,
+                beam_size=self.escalation_beam_size,
+                language=info.language,
+                without_timestamps=True,
+                **self._guard_options(part),
+            )
+            texts.append(" ".join(s.text.strip() for s in redone))
+            escalated += 1
+            escalated_seconds += segment.end - segment.start
+
+        self.decode_metrics.record_pass(
+            audio_seconds, count, escalated, escalated_seconds
+        )
+        return " ".join(text for text in texts if text).strip()
+
+    @staticmethod
+    def _needs_escalation(segment: Segment) -> bool:
+        """Check whether a greedy segment is too unreliable to keep.
+
+        Args:
+            segment: A segment from the greedy pass.
+
+        Returns:
+            True if the segment should be decoded again with a beam.
+
+        """
+        return (
+            segment.avg_logprob < ESCALATE_AVG_LOGPROB
+            or segment.compression_ratio > ESCALATE_COMPRESSION_RATIO
+            or segment.no_speech_prob > ESCALATE_NO_SPEECH_PROB
+        )
+
+    def begin_recording(self) -> None:
+        """Forget the language and features of the previous recording."""
+        self.pinned_language = None
+        self.backend.reset_stream()
+
+    def _recording_language(self, audio_input: str | np.ndarray) -> str | None:
+        """Return the language to decode the current recording with.
+
+        The language is detected once per recording, from the first couple
+        of seconds of speech, and pinned for every later live and final
+        pass, so each pass skips its own language detection.
+
+        Args:
+            audio_input: File path to audio or numpy array of audio samples.
+
+        Returns:
+            The language code, or None to let the model detect it.
+
+        """
+        if self.pinned_language:
+            return self.pinned_language
+        if self.session_language:
+            self.pinned_language = self.session_language
+            return self.pinned_language
+        if isinstance(audio_input, str):
+            return None
+
+        detected = self._detect_language(audio_input)
+        if detected is None:
+            return None
+        language, probability = detected
+        if probability < LANGUAGE_MIN_PROBABILITY:
+            return language  # Not trusted enough to pin; retry next pass
+
+        self.pinned_language = language
+        self._learn_language(language)
+        return language
+
+    def _detect_language(self, audio: np.ndarray) -> tuple[str, float] | None:
+        """Detect the spoken language from the start of a recording.
+
+        Args:
+            audio: The recording so far (float32, 16kHz).
+
+        Returns:
+            The language code and its probability, or None if there is not
+            enough audio yet.
+
+        """
+        search = audio[: int(LANGUAGE_SEARCH_SECONDS * SAMPLE_RATE)]
+        if len(search) < LANGUAGE_DETECT_SECONDS * SAMPLE_RATE:
+            return None
+        try:
+            language, probability, _ = self.backend.detect_language(
+                search, vad_filter=True
+            )
+        except ValueError:
+            return None  # No speech found yet
+        return language, probability
+
+    def _learn_language(self, language: str) -> None:
+        """Adopt a session default once enough recordings agree on it.
+
+        Args:
+            language: The language pinned for the current recording.
+
+        """
+        if not self.learn_language_after:
+            return
+        self._detected_history.append(language)
+        recent = self._detected_history[-self.learn_language_after :]
+        if len(recent) == self.learn_language_after and len(set(recent)) == 1:
+            self.session_language = language
@@ -1,7 +1,6 @@
 """TUI application using Textual."""
 
 import contextlib
-import difflib
 from datetime import UTC, datetime
 from typing import ClassVar
 
@@ -14,6 +13,7 @@ from textual.reactive import reactive
 from textual.widgets import Footer, Header, Label, RichLog, Static
 
 from whisper_typing.app_controller import WhisperAppController
+from whisper_typing.text_diff import diff_opcodes
 from whisper_typing.tui.screens import ApiKeyPromptScreen, ConfigurationScreen
 
 
@@ -69,6 +69,7 @@ class WhisperTui(App[None]):
         Binding("p", "pause", "Pause"),
         Binding("c", "configure", "Configure"),
         Binding("r", "reload", "Reload Config"),
+        Binding("d", "rescan_devices", "Rescan Devices"),
     ]
 
     status_message: reactive[str] = reactive("Starting...")
@@ -136,7 +137,7 @@ class WhisperTui(App[None]):
         self.call_from_thread(self.update_shortcuts_display)
         if success:
             self.controller.start_listener()
-            self.update_status("Ready")
+            self.controller.set_status("Ready")
             self.write_log("Application started successfully.")
             self.write_log(f"Press {self.controller.config['hotkey']} to record.")
         else:
@@ -234,8 +235,7 @@ class WhisperTui(App[None]):
             words1 = original_text.split()
             words2 = text.split()
 
-            s = difflib.SequenceMatcher(None, words1, words2)
-            for tag, i1, i2, j1, j2 in s.get_opcodes():
+            for tag, i1, i2, j1, j2 in diff_opcodes(words1, words2):
                 if tag == "equal":
                     diff_text.append(" ".join(words1[i1:i2]) + " ")
                 elif tag == "replace":
@@ -257,6 +257,13 @@ class WhisperTui(App[None]):
         self.controller.load_configuration()
         self.startup_controller()
 
+    def action_rescan_devices(self) -> None:
+        """Re-enumerate audio devices and reinitialize components."""
+        self.write_log("Rescanning audio devices...")
+        self.controller.stop()
+        self.controller.rescan_devices()
+        self.startup_controller()
+
     @work
     async def action_configure(self) -> None:
         """Open the configuration screen."""
@@ -278,5 +285,5 @@ class WhisperTui(App[None]):
 
     def action_quit(self) -> None:
         """Quit the application."""
-        self.controller.stop()
+        self.controller.shutdown()
         self.exit()
@@ -96,19 +96,17 @@ class ConfigurationScreen(Screen[bool]):
 
         """
         config = self.controller.config
-        devices = self.controller.list_input_devices()
+        registry = self.controller.device_registry
         mic_options: list[tuple[str, int | None]] = [
-            (name, index) for index, name in devices
+            (f"{dev.name} ({dev.hostapi})", dev.index) for dev in registry.devices()
         ]
         mic_options.insert(0, ("Default System Mic", None))
 
         current_mic = config.get("microphone_name")
         start_value = None
         if current_mic:
-            for idx, name in devices:
-                if name == current_mic:
-                    start_value = idx
-                    break
+            device = registry.find(current_mic, config.get("microphone_hostapi"))
+            start_value = device.index if device else None
         return mic_options, start_value
 
     def _get_gemini_options(self) -> tuple[list[tuple[str, str]], str]:
@@ -153,6 +151,11 @@ class ConfigurationScreen(Screen[bool]):
             ("float32 (Accurate)", "float32"),
         ]
         device_options = [("CPU", "cpu"), ("GPU (CUDA)", "cuda")]
+        backend_options = [
+            ("faster-whisper (Recommended)", "faster-whisper"),
+            ("ONNX Runtime", "onnx"),
+            ("Assisted (distilled draft model)", "assisted"),
+        ]
         gemini_models, current_gemini_model = self._get_gemini_options()
 
         yield Container(
@@ -171,6 +174,12 @@ class ConfigurationScreen(Screen[bool]):
                 value=config.get("compute_type", "auto"),
                 id="compute_type_select",
             ),
+            Label("Backend:"),
+            Select(
+                backend_options,
+                value=config.get("backend", "faster-whisper"),
+                id="backend_select",
+            ),
             Label("Gemini API Key:"),
             Input(
                 value=config.get("gemini_api_key") or "",
@@ -230,6 +239,7 @@ class ConfigurationScreen(Screen[bool]):
         refocus_checkbox = self.query_one("#refocus_checkbox", Checkbox)
         typing_wpm_input = self.query_one("#typing_wpm_input", Input)
         compute_type_select = self.query_one("#compute_type_select", Select)
+        backend_select = self.query_one("#backend_select", Select)
         model_cache_input = self.query_one("#model_cache_input", Input)
 
         try:
@@ -239,9 +249,11 @@ class ConfigurationScreen(Screen[bool]):
 
         new_config = {
             "microphone_name": None,
+            "microphone_hostapi": None,
             "model": model_select.value,
             "device": device_select.value,
             "compute_type": compute_type_select.value,
+            "backend": backend_select.value,
             "gemini_model": gemini_model_select.value,
             "debug": debug_checkbox.value,
             "refocus_window": refocus_checkbox.value,
@@ -255,11 +267,10 @@ class ConfigurationScreen(Screen[bool]):
         mic_select = self.query_one("#mic_select", Select)
         mic_idx = mic_select.value
         if mic_idx is not None:
-            devices = self.controller.list_input_devices()
-            for idx, name in devices:
-                if idx == mic_idx:
-                    new_config["microphone_name"] = name
-                    break
+            device = self.controller.device_registry.get(mic_idx)
+            if device:
+                new_config["microphone_name"] = device.name
+                new_config["microphone_hostapi"] = device.hostapi
 
         return new_config
 
@@ -0,0 +1,401 @@
+"""Benchmark CTranslate2 threading settings and cache the fastest per model."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+import ctranslate2
+from faster_whisper import WhisperModel, decode_audio
+
+from whisper_typing.backends import BACKENDS, AssistedBackend, load_backend
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import numpy as np
+
+TUNING_PATH: Final[str] = "tuning.json"
+SAMPLE_RATE: Final[int] = 16000
+# Passes decoded at once for the secondary measurement: a live pass
+# abandoned at stop can briefly overlap the final pass
+CONCURRENT_PASSES: Final[int] = 2
+
+
+class TuningSettings(NamedTuple):
+    """WhisperModel settings that affect CPU throughput."""
+
+    cpu_threads: int
+    num_workers: int
+    compute_type: str
+
+
+class TuningResult(NamedTuple):
+    """Benchmark outcome of one configuration."""
+
+    settings: TuningSettings
+    seconds: float
+    rtf: float  # Wall time per second of audio (lower is faster)
+    # Wall time per second of audio with CONCURRENT_PASSES passes at once
+    concurrent_rtf: float | None = None
+
+
+class BackendResult(NamedTuple):
+    """Benchmark outcome of one backend."""
+
+    backend: str
+    seconds: float
+    rtf: float
+    error: str | None = None  # Why the backend could not be measured
+
+
+class AssistedResult(NamedTuple):
+    """Benchmark outcome of a model decoding with and without its assistant."""
+
+    plain_seconds: float
+    assisted_seconds: float
+    plain_text: str
+    assisted_text: str
+
+    @property
+    def speedup(self) -> float:
+        """How many times faster the assisted decode was."""
+        return self.plain_seconds / self.assisted_seconds
+
+    @property
+    def identical(self) -> bool:
+        """Whether both decodes produced the same transcript."""
+        return self.plain_text == self.assisted_text
+
+
+def _cache_key(model_name: str, device: str) -> str:
+    return f"{model_name}@{device}"
+
+
+def load_tuned_settings(
+    model_name: str, device: str, path: str = TUNING_PATH
+) -> TuningSettings | None:
+    """Look up the cached best settings for a model.
+
+    Args:
+        model_name: faster-whisper model name or path.
+        device: Device the model runs on.
+        path: Path to the tuning cache.
+
+    Returns:
+        The tuned settings, or None if the model has not been tuned.
+
+    """
+    try:
+        with Path(path).open() as f:
+            entry = json.load(f)[_cache_key(model_name, device)]
+        return TuningSettings(
+            cpu_threads=int(entry["cpu_threads"]),
+            num_workers=int(entry["num_workers"]),
+            compute_type=str(entry["compute_type"]),
+        )
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def save_tuned_settings(
+    model_name: str, device: str, result: TuningResult, path: str = TUNING_PATH
+) -> None:
+    """Store the best settings for a model in the tuning cache.
+
+    Args:
+        model_name: faster-whisper model name or path.
+        device: Device the model runs on.
+        result: The winning benchmark result.
+        path: Path to the tuning cache.
+
+    """
+    cache: dict[str, Any] = {}
+    cache_path = Path(path)
+    if cache_path.exists():
+        try:
+            with cache_path.open() as f:
+                cache = json.load(f)
+        except Exception:  # noqa: BLE001
+            cache = {}
+    cache[_cache_key(model_name, device)] = {
+        **result.settings._asdict(),
+        "rtf": round(result.rtf, 4),
+    }
+    with cache_path.open("w") as f:
+        json.dump(cache, f, indent=4)
+
+
+def candidate_settings(
+    device: str = "cpu", cpu_count: int | None = None
+) -> list[TuningSettings]:
+    """List the configurations worth benchmarking on this machine.
+
+    Args:
+        device: Device the model runs on.
+        cpu_count: Number of logical CPUs (detected if None).
+
+    Returns:
+        The configurations to try.
+
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    supported = ctranslate2.get_supported_compute_types(device)
+    compute_types = [
+        ct for ct in ("int8", "int8_float32", "float16", "float32") if ct in supported
+    ]
+
+    threads = {cpu_count}
+    count = 1
+    while count < cpu_count:
+        threads.add(count)
+        count *= 2
+
+    # Workers share the cores; more threads than cores only thrash
+    return [
+        TuningSettings(cpu_threads, num_workers, compute_type)
+        for compute_type in compute_types
+        for cpu_threads in sorted(threads)
+        for num_workers in range(1, CONCURRENT_PASSES + 1)
+        if cpu_threads * num_workers <= cpu_count
+    ]
+
+
+def _run_passes(model: WhisperModel, audio: np.ndarray, passes: int) -> float:
+    """Decode the clip as concurrent passes and time them.
+
+    Args:
+        model: The model to benchmark.
+        audio: The reference clip.
+        passes: Number of passes decoding at the same time.
+
+    Returns:
+        Wall time in seconds until all passes finished.
+
+    """
+
+    def decode() -> None:
+        segments, _info = model.transcribe(
+            audio, beam_size=5, condition_on_previous_text=False
+        )
+        list(segments)  # Segments are decoded lazily
+
+    threads = [threading.Thread(target=decode) for _ in range(passes)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def benchmark(  # noqa: PLR0913
+    model_name: str,
+    audio: np.ndarray,
+    candidates: list[TuningSettings],
+    *,
+    device: str = "cpu",
+    download_root: str | None = None,
+    on_result: Callable[[TuningResult], None] | None = None,
+) -> list[TuningResult]:
+    """Benchmark each configuration on a reference clip.
+
+    Every configuration runs a warm-up pass first. It is scored on a
+    single pass, since the app decodes one pass at a time; the clip is
+    then also decoded as ``CONCURRENT_PASSES`` simultaneous passes, which
+    is reported alongside to show what extra workers buy.
+
+    Args:
+        model_name: faster-whisper model name or path.
+        audio: The reference clip (float32, 16kHz).
+        candidates: The configurations to try.
+        device: Device the model runs on.
+        download_root: Directory models are downloaded to.
+        on_result: Called with each result as soon as it is measured.
+
+    Returns:
+        The results, fastest single pass first.
+
+    """
+    duration = len(audio) / SAMPLE_RATE
+    results = []
+    for settings in candidates:
+        model = WhisperModel(
+            model_name,
+            device=device,
+            compute_type=settings.compute_type,
+            cpu_threads=settings.cpu_threads,
+            num_workers=settings.num_workers,
+            download_root=download_root,
+        )
+        segments, _info = model.transcribe(audio[:SAMPLE_RATE], beam_size=1)
+        list(segments)  # Warm-up
+
+        seconds = _run_passes(model, audio, 1)
+        concurrent = _run_passes(model, audio, CONCURRENT_PASSES)
+        result = TuningResult(
+            settings, seconds, seconds / duration, concurrent / duration
+        )
+        results.append(result)
+        if on_result:
+            on_result(result)
+        del model
+    return sorted(results, key=lambda result: result.rtf)
+
+
+def tune(  # noqa: PLR0913
+    model_name: str,
+    clip_path: str,
+    *,
+    device: str = "cpu",
+    download_root: str | None = None,
+    path: str = TUNING_PATH,
+    on_result: Callable[[TuningResult], None] | None = None,
+) -> TuningResult:
+    """Find and cache the fastest settings for a model on this machine.
+
+    Args:
+        model_name: faster-whisper model name or path.
+        clip_path: Path to a reference audio clip.
+        device: Device the model runs on.
+        download_root: Directory models are downloaded to.
+        path: Path to the tuning cache.
+        on_result: Called with each result as soon as it is measured.
+
+    Returns:
+        The winning result.
+
+    """
+    audio = decode_audio(clip_path, sampling_rate=SAMPLE_RATE)
+    results = benchmark(
+        model_name,
+        audio,
+        candidate_settings(device),
+        device=device,
+        download_root=download_root,
+        on_result=on_result,
+    )
+    best = results[0]
+    save_tuned_settings(model_name, device, best, path)
+    return best
+
+
+def compare_backends(  # noqa: PLR0913
+    model_id: str,
+    clip_path: str,
+    *,
+    backends: list[str] | None = None,
+    device: str = "cpu",
+    compute_type: str = "int8",
+    language: str | None = None,
+    download_root: str | None = None,
+    on_result: Callable[[BackendResult], None] | None = None,
+) -> list[BackendResult]:
+    """Time each backend decoding a reference clip with the same model.
+
+    Args:
+        model_id: HuggingFace model ID.
+        clip_path: Path to a reference audio clip.
+        backends: Backends to compare (if None, all but the assisted one,
+            which only decodes greedily; see ``benchmark_assisted``).
+        device: Device the model runs on.
+        compute_type: Quantization type, for backends that support it.
+        language: Language of the clip (detected if None).
+        download_root: Directory models are downloaded to.
+        on_result: Called with each result as soon as it is measured.
+
+    Returns:
+        The results, fastest first; backends that failed come last, with
+        their error.
+
+    """
+    audio = decode_audio(clip_path, sampling_rate=SAMPLE_RATE)
+    duration = len(audio) / SAMPLE_RATE
+    results = []
+    default = [name for name in BACKENDS if name != AssistedBackend.name]
+    for name in backends or default:
+        try:
+            backend = load_backend(
+                name,
+                model_id,
+                device=device,
+                compute_type=compute_type,
+                download_root=download_root,
+            )
+            segments, _info = backend.transcribe(audio[:SAMPLE_RATE], beam_size=1)
+            list(segments)  # Warm-up
+
+            start = time.perf_counter()
+            segments, _info = backend.transcribe(audio, beam_size=5, language=language)
+            list(segments)  # Segments are decoded lazily
+            seconds = time.perf_counter() - start
+            result = BackendResult(name, seconds, seconds / duration)
+            del backend
+        except Exception as e:  # noqa: BLE001
+            # One missing runtime must not abort the whole comparison
+            result = BackendResult(name, math.inf, math.inf, f"{type(e).__name__}: {e}")
+        results.append(result)
+        if on_result:
+            on_result(result)
+    return sorted(results, key=lambda result: result.rtf)
+
+
+def benchmark_assisted(  # noqa: PLR0913
+    model_id: str,
+    clip_path: str,
+    *,
+    assistant_model: str | None = None,
+    device: str = "cpu",
+    compute_type: str = "float32",
+    language: str | None = None,
+    download_root: str | None = None,
+) -> AssistedResult:
+    """Time a model decoding a reference clip with and without its assistant.
+
+    Both passes decode greedily, since assisted generation does, so the
+    transcripts should match; a difference points to numerical drift in
+    the main model's batched verification.
+
+    Args:
+        model_id: HuggingFace model ID of the main model.
+        clip_path: Path to a reference audio clip.
+        assistant_model: Draft model ID (default from ``ASSISTANT_MODELS``).
+        device: Device the models run on.
+        compute_type: Precision, see ``AssistedBackend.load``.
+        language: Language of the clip (detected once if None).
+        download_root: Directory models are downloaded to.
+
+    Returns:
+        The timings and transcripts of both passes.
+
+    """
+    audio = decode_audio(clip_path, sampling_rate=SAMPLE_RATE)
+    backend = AssistedBackend.load(
+        model_id,
+        device=device,
+        compute_type=compute_type,
+        download_root=download_root,
+        assistant_model=assistant_model,
+    )
+    language = language or backend.detect_language(audio)[0]
+    assistant = backend.assistant
+
+    def run(helper: object) -> tuple[float, str]:
+        backend.assistant = helper
+        segments, _info = backend.transcribe(
+            audio[:SAMPLE_RATE], beam_size=1, language=language
+        )
+        list(segments)  # Warm-up
+        start = time.perf_counter()
+        segments, _info = backend.transcribe(audio, beam_size=1, language=language)
+        text = "".join(segment.text for segment in segments).strip()
+        return time.perf_counter() - start, text
+
+    plain_seconds, plain_text = run(None)
+    assisted_seconds, assisted_text = run(assistant)
+    return AssistedResult(plain_seconds, assisted_seconds, plain_text, assisted_text)
@@ -5,7 +5,9 @@ import threading
 import time
 from collections.abc import Callable
 
-from pynput.keyboard import Controller
+from pynput.keyboard import Controller, Key
+
+from whisper_typing.text_diff import build_edit_script, edit_script_cost
 
 
 class Typer:
@@ -31,6 +33,9 @@ class Typer:
     PAUSE_INTERVAL_MIN: int = 15
     PAUSE_INTERVAL_MAX: int = 30
 
+    # Cursor movement and deletions are not paced like typing
+    EDIT_KEY_DELAY: float = 0.01
+
     def __init__(self, wpm: int = 40) -> None:
         """Initialize the Typer with a specific words per minute.
 
@@ -46,7 +51,7 @@ class Typer:
         text: str,
         stop_event: threading.Event | None = None,
         check_focus: Callable[[], bool] | None = None,
-    ) -> None:
+    ) -> int:
         """Simulate human-like typing into the active window.
 
         Args:
@@ -54,9 +59,13 @@ class Typer:
             stop_event: Optional event to stop typing midway.
             check_focus: Optional callback to check if window still has focus.
 
+        Returns:
+            The number of characters actually typed.
+
         """
+        typed = 0
         if not text:
-            return
+            return typed
 
         try:
             # WPM = Characters Per Minute (assuming 5 chars per word)
@@ -68,12 +77,13 @@ class Typer:
             for i, char in enumerate(text):
                 # Check for cancellation
                 if stop_event and stop_event.is_set():
-                    return
+                    return typed
 
                 if check_focus and not check_focus():
-                    return
+                    return typed
 
                 self.keyboard.type(char)
+                typed += 1
 
                 delay = base_char_delay * random.uniform(  # noqa: S311
                     self.JITTER_MIN, self.JITTER_MAX
@@ -102,3 +112,75 @@ class Typer:
         except Exception:  # noqa: BLE001, S110
             # Emergency fallback removed to respect cancellation/focus rules
             pass
+        return typed
+
+    def correct_text(
+        self,
+        typed_text: str,
+        new_text: str,
+        stop_event: threading.Event | None = None,
+        check_focus: Callable[[], bool] | None = None,
+    ) -> bool:
+        """Turn already typed text into new text with as few keystrokes as possible.
+
+        The cursor is assumed to be at the end of ``typed_text``. Only the
+        differing characters are deleted and retyped; a full retype is used
+        instead when that is cheaper.
+
+        Args:
+            typed_text: The text previously typed into the active window.
+            new_text: The text it should become.
+            stop_event: Optional event to stop typing midway.
+            check_focus: Optional callback to check if window still has focus.
+
+        Returns:
+            True if the correction was fully applied, False if interrupted.
+
+        """
+        script = build_edit_script(typed_text, new_text)
+        retype = [("backspace", len(typed_text)), ("type", new_text)]
+        if edit_script_cost(script) > edit_script_cost(retype):
+            script = [step for step in retype if step[1]]
+
+        keys = {"left": Key.left, "right": Key.right, "backspace": Key.backspace}
+        for action, value in script:
+            if isinstance(value, str):
+                if self.type_text(value, stop_event, check_focus) < len(value):
+                    return False
+            elif not self._press_key(keys[action], value, stop_event, check_focus):
+                return False
+        return True
+
+    def _press_key(
+        self,
+        key: Key,
+        count: int,
+        stop_event: threading.Event | None = None,
+        check_focus: Callable[[], bool] | None = None,
+    ) -> bool:
+        """Press a navigation or editing key a number of times.
+
+        Args:
+            key: The key to press.
+            count: How many times to press it.
+            stop_event: Optional event to stop midway.
+            check_focus: Optional callback to check if window still has focus.
+
+        Returns:
+            True if all presses were sent, False if interrupted.
+
+        """
+        try:
+            for _ in range(count):
+                if stop_event and stop_event.is_set():
+                    return False
+
+                if check_focus and not check_focus():
+                    return False
+
+                self.keyboard.press(key)
+                self.keyboard.release(key)
+                time.sleep(self.EDIT_KEY_DELAY)
+        except Exception:  # noqa: BLE001
+            return False
+        return True
@@ -1,13 +1,21 @@
 """Tests for app_controller module."""
 
 import threading
+import time
 from collections.abc import Generator
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 
-from whisper_typing.app_controller import DEFAULT_CONFIG, WhisperAppController
+from whisper_typing.app_controller import (
+    DEFAULT_CONFIG,
+    SPILL_LIVE_WINDOW_SECONDS,
+    WhisperAppController,
+)
+from whisper_typing.long_form import SAMPLE_RATE
+from whisper_typing.transcriber import DecodeMetrics
 
 
 @pytest.fixture
@@ -20,8 +28,16 @@ def mock_dependencies() -> Generator[dict[str, Any]]:
         patch("whisper_typing.app_controller.AIImprover") as mock_improver,
         patch("whisper_typing.app_controller.WindowManager") as mock_window_manager,
         patch("pynput.keyboard.GlobalHotKeys") as mock_hotkeys,
-        patch("whisper_typing.app_controller.sd") as mock_sd,
+        patch("whisper_typing.app_controller.DeviceRegistry") as mock_registry,
     ):
+        mock_recorder.return_value.recording = False
+        mock_recorder.return_value.metrics.snapshot.return_value = {
+            "input_overflows": 0,
+            "max_gap_ms": 0.0,
+            "callback_ms_max": 0.0,
+        }
+        mock_transcriber.return_value.greedy_first = False
+        mock_transcriber.return_value.decode_metrics = DecodeMetrics()
         yield {
             "recorder": mock_recorder,
             "transcriber": mock_transcriber,
@@ -29,11 +45,9 @@ def mock_dependencies() -> Generator[dict[str, Any]]:
             "improver": mock_improver,
             "window_manager": mock_window_manager,
             "hotkeys": mock_hotkeys,
-            "sd": mock_sd,
+            "device_registry": mock_registry,
         }
 
-    mock_sd.query_devices.return_value = []
-
 
 def test_initialization(mock_dependencies: dict[str, Any]) -> None:  # noqa: ARG001
     """Test controller initialization."""
@@ -56,6 +70,9 @@ def test_initialize_components(mock_dependencies: dict[str, Any]) -> None:  # no
     assert controller.recorder is not None
     assert controller.transcriber is not None
     assert controller.typer is not None
+    # The AI client may still be starting once the app is ready
+    assert controller.improver_init is not None
+    controller.improver_init.result(timeout=5)
     assert controller.improver is not None
     assert controller.window_manager is not None
 
@@ -150,3 +167,552 @@ def test_on_improve_text(mock_dependencies: dict[str, Any]) -> None:  # noqa: AR
     with patch("threading.Thread") as mock_thread:
         controller.on_improve_text()
         mock_thread.assert_called_once()
+
+
+def test_improve_ignored_while_typing(mock_dependencies: dict[str, Any]) -> None:  # noqa: ARG001
+    """Test the improve hotkey doesn't start a second typer mid-correction."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.config["gemini_api_key"] = "fake"
+    controller.initialize_components()
+    logs: list[str] = []
+    controller.on_log = logs.append
+    controller.pending_text = "Bad text"
+    controller._is_typing = True  # noqa: SLF001
+
+    with patch("threading.Thread") as mock_thread:
+        controller.on_improve_text()
+        mock_thread.assert_not_called()
+    assert controller.is_processing is False
+    assert any("Busy typing" in line for line in logs)
+
+
+def test_type_after_improve_applies_correction(
+    mock_dependencies: dict[str, Any],  # noqa: ARG001
+) -> None:
+    """Test improving already typed text corrects it instead of retyping."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.config["refocus_window"] = False
+    controller.initialize_components()
+    controller.typer.type_text.return_value = len("helo world")
+
+    controller._async_typing_wrapper("helo world")  # noqa: SLF001
+    assert controller.typed_text == "helo world"
+
+    controller._apply_improvement("Hello world.", "helo world")  # noqa: SLF001
+    assert controller.correction_base == "helo world"
+
+    controller.typer.correct_text.return_value = True
+    with patch("threading.Thread") as mock_thread:
+        controller.on_type_confirm()
+        _, kwargs = mock_thread.call_args
+        assert kwargs["args"] == ("Hello world.", "helo world")
+
+    controller._async_typing_wrapper(*kwargs["args"])  # noqa: SLF001
+    controller.typer.correct_text.assert_called_once()
+    assert controller.typed_text == "Hello world."
+    assert controller.correction_base is None
+
+
+def test_capture_overflow_warning(mock_dependencies: dict[str, Any]) -> None:  # noqa: ARG001
+    """Test new input overflows are logged once and exposed as metrics."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.initialize_components()
+    logs: list[str] = []
+    controller.on_log = logs.append
+
+    snapshot = {"input_overflows": 2, "max_gap_ms": 250.0, "callback_ms_max": 3.5}
+    controller.recorder.metrics.snapshot.return_value = snapshot
+
+    controller._check_capture_health()  # noqa: SLF001
+    controller._check_capture_health()  # noqa: SLF001
+
+    warnings = [line for line in logs if "overflow" in line]
+    assert len(warnings) == 1
+    assert "2 input overflow(s)" in warnings[0]
+    assert controller.get_metrics()["capture"] == snapshot
+
+
+def test_overflow_warned_while_live_passes_paused(
+    mock_dependencies: dict[str, Any],  # noqa: ARG001
+) -> None:
+    """Test overflows reach the log during a recording, even with no live pass."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.initialize_components()
+    logs: list[str] = []
+    controller.on_log = logs.append
+    assert controller.recorder is not None
+    snapshot = {"input_overflows": 1, "max_gap_ms": 250.0, "callback_ms_max": 3.5}
+    controller.recorder.metrics.snapshot.return_value = snapshot
+
+    stop = threading.Event()
+    loop = threading.Thread(target=controller._live_transcription_loop, args=(stop,))  # noqa: SLF001
+    with controller.governor.hold("typing"):
+        loop.start()
+        for _ in range(200):
+            if any("overflow" in line for line in logs):
+                break
+            time.sleep(0.01)
+        stop.set()
+        loop.join(timeout=5)
+
+    assert any("1 input overflow(s)" in line for line in logs)
+
+
+def test_decode_guard_logged_once_per_firing(
+    mock_dependencies: dict[str, Any],  # noqa: ARG001
+) -> None:
+    """Test guard firings are logged when new and exposed as metrics."""
+    assert DEFAULT_CONFIG["decode_guard"] is False  # Opt-in
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.config["decode_guard"] = True
+    controller.initialize_components()
+    logs: list[str] = []
+    controller.on_log = logs.append
+    assert controller.transcriber is not None
+    assert controller.transcriber.decode_guard is True
+
+    controller.transcriber.decode_metrics.record_guard("repetition", 1.5)
+    controller._log_decoding()  # noqa: SLF001
+    controller._log_decoding()  # noqa: SLF001
+
+    reports = [line for line in logs if "guard" in line]
+    assert len(reports) == 1
+    assert "repetition 1" in reports[0]
+    assert "1.5s" in reports[0]
+    assert controller.get_metrics()["decoding"]["guard_fired"] == 1
+
+
+def test_mic_lookup_uses_registry(mock_dependencies: dict[str, Any]) -> None:
+    """Test microphone lookup and listing go through the device registry."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.config["microphone_name"] = "Mic"
+    controller.config["microphone_hostapi"] = "Windows WASAPI"
+    registry = mock_dependencies["device_registry"].return_value
+    registry.find.return_value.index = 2
+
+    assert controller.get_mic_index_from_config() == 2  # noqa: PLR2004
+    registry.find.assert_called_once_with("Mic", "Windows WASAPI")
+
+    controller.list_input_devices()
+    registry.input_devices.assert_called_once()
+
+    controller.rescan_devices()
+    registry.rescan.assert_called_once()
+
+    registry.find.return_value = None
+    assert controller.get_mic_index_from_config() is None
+
+
+def test_model_switch_back_uses_pool(mock_dependencies: dict[str, Any]) -> None:
+    """Test switching back to a recently used model does not reload it."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    mock_transcriber = mock_dependencies["transcriber"]
+    mock_transcriber.side_effect = lambda **_kwargs: MagicMock()
+
+    controller.initialize_components()
+    base = controller.transcriber
+    controller.config["model"] = "openai/whisper-small.en"
+    controller.initialize_components()
+    assert controller.model_load_thread is not None
+    controller.model_load_thread.join()
+    assert controller.transcriber is not base
+    controller.config["model"] = DEFAULT_CONFIG["model"]
+    controller.initialize_components()
+
+    assert controller.transcriber is base
+    assert mock_transcriber.call_count == 2  # noqa: PLR2004
+    assert len(controller.get_metrics()["models_mb"]) == 2  # noqa: PLR2004
+
+
+def test_model_hot_swap_waits_for_recording(
+    mock_dependencies: dict[str, Any],
+) -> None:
+    """Test a new model loads in the background and swaps in between recordings."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    statuses: list[str] = []
+    controller.on_status_change = statuses.append
+    loaded = threading.Event()
+    release = threading.Event()
+
+    def create(**kwargs: Any) -> MagicMock:  # noqa: ANN401
+        if kwargs["model_id"] != DEFAULT_CONFIG["model"]:
+            loaded.set()
+            release.wait(timeout=5)
+        return MagicMock(name=kwargs["model_id"])
+
+    mock_dependencies["transcriber"].side_effect = create
+    controller.initialize_components()
+    base = controller.transcriber
+
+    controller.config["model"] = "openai/whisper-small.en"
+    assert controller.initialize_components() is True
+    assert loaded.wait(timeout=5)
+    controller.set_status("Ready")
+    assert statuses[-1] == (
+        "Loading openai/whisper-small.en (still serving openai/whisper-base)"
+    )
+    assert controller.transcriber is base  # Old model keeps serving
+
+    # Finish loading while a recording is running: the swap is deferred
+    assert controller.recorder is not None
+    controller.recorder.recording = True
+    release.set()
+    assert controller.model_load_thread is not None
+    controller.model_load_thread.join()
+    assert controller.transcriber is base
+
+    controller.recorder.recording = False
+    controller.recorder.stop.return_value = None
+    controller.recorder.last_error = None
+    controller._stop_recording()  # noqa: SLF001
+
+    assert controller.transcriber is not base
+    assert controller.current_model_id == "openai/whisper-small.en"
+    assert statuses[-1] == "Ready"
+
+
+def test_reinitialize_during_background_load_returns_promptly(
+    mock_dependencies: dict[str, Any],
+) -> None:
+    """Test re-initializing doesn't wait for a model loading in the background."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    loading = threading.Event()
+    release = threading.Event()
+
+    def create(**kwargs: Any) -> MagicMock:  # noqa: ANN401
+        if kwargs["model_id"] == "openai/whisper-small.en":
+            loading.set()
+            release.wait(timeout=5)
+        return MagicMock(name=kwargs["model_id"])
+
+    mock_dependencies["transcriber"].side_effect = create
+    controller.initialize_components()
+    base = controller.transcriber
+    controller.config["model"] = "openai/whisper-small.en"
+    controller.initialize_components()
+    assert loading.wait(timeout=5)
+    first_load = controller.model_load_thread
+
+    try:
+        start = time.monotonic()
+        assert controller.initialize_components() is True  # Same model again
+        assert controller.transcriber is base  # Old model keeps serving
+        # A newer choice supersedes the slow load rather than queueing behind it
+        controller.config["model"] = "openai/whisper-medium.en"
+        assert controller.initialize_components() is True
+        assert time.monotonic() - start < 1
+    finally:
+        release.set()
+    assert first_load is not None
+    first_load.join()
+    assert controller.model_load_thread is not None
+    controller.model_load_thread.join()
+    assert controller.current_model_id == "openai/whisper-medium.en"
+
+
+def test_model_hot_swap_failure_keeps_serving(
+    mock_dependencies: dict[str, Any],
+) -> None:
+    """Test a failed background load leaves the current model in place."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    logs: list[str] = []
+    controller.on_log = logs.append
+    controller.initialize_components()
+    base = controller.transcriber
+
+    mock_dependencies["transcriber"].side_effect = RuntimeError("no such model")
+    controller.config["model"] = "openai/whisper-bogus"
+    controller.initialize_components()
+    assert controller.model_load_thread is not None
+    controller.model_load_thread.join()
+
+    assert controller.transcriber is base
+    assert controller.current_model_id == DEFAULT_CONFIG["model"]
+    assert any("Error loading openai/whisper-bogus" in line for line in logs)
+
+
+def test_long_recording_uses_parallel_decoder(
+    mock_dependencies: dict[str, Any],  # noqa: ARG001
+) -> None:
+    """Test long recordings go to the long-form workers with the pinned language."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.config["long_form_workers"] = 2
+    with patch("whisper_typing.app_controller.ParallelDecoder") as mock_decoder:
+        controller.initialize_components()
+        for _ in range(50):
+            if controller.long_form is not None:
+                break
+            time.sleep(0.01)
+    decoder = mock_decoder.start.return_value
+    assert controller.long_form is decoder
+    assert mock_decoder.start.call_args.args == (2,)
+
+    assert controller.transcriber is not None
+    controller.transcriber.pinned_language = "de"
+    short = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    long = np.zeros(31 * SAMPLE_RATE, dtype=np.float32)
+
+    controller._transcribe_final(short)  # noqa: SLF001
+    decoder.transcribe.assert_not_called()
+    controller._transcribe_final(long)  # noqa: SLF001
+    audio, options = decoder.transcribe.call_args.args
+    assert audio is long
+    assert options["language"] == "de"
+
+    controller.shutdown()
+    decoder.close.assert_called_once()
+
+
+def test_idle_unload_and_reload_on_hotkey(
+    mock_dependencies: dict[str, Any],
+) -> None:
+    """Test an idle model is released and reloaded when recording starts."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.config["idle_unload_minutes"] = 10
+    logs: list[str] = []
+    controller.on_log = logs.append
+    mock_dependencies["transcriber"].side_effect = lambda **_kwargs: MagicMock()
+    controller.initialize_components()
+    assert controller._idle_timer is not None  # noqa: SLF001
+
+    mb = 1024 * 1024
+    with patch(
+        "whisper_typing.app_controller.process_memory_bytes",
+        side_effect=[900 * mb, 600 * mb],
+    ):
+        controller._unload_if_idle()  # noqa: SLF001
+
+    assert controller.transcriber is None
+    assert controller.get_metrics()["models_mb"] == {}
+    assert controller.get_metrics()["idle"]["reclaimed_mb"] == 300  # noqa: PLR2004
+    assert any("reclaimed 300 MB" in line for line in logs)
+
+    controller.on_record_toggle()
+    assert controller.idle_reload_thread is not None
+    controller.idle_reload_thread.join()
+
+    assert controller.transcriber is not None
+    assert controller.current_model_id == DEFAULT_CONFIG["model"]
+    assert controller.get_metrics()["idle"]["unloaded"] is False
+    assert controller.last_reload_seconds is not None
+    controller.stop_live_transcribe.set()
+    controller.shutdown()
+
+
+def test_failed_reload_keeps_recording(
+    mock_dependencies: dict[str, Any],
+) -> None:
+    """Test a recording is kept, not dropped, when the model can't reload."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.config["idle_unload_minutes"] = 10
+    statuses: list[str] = []
+    controller.on_status_change = statuses.append
+    controller.initialize_components()
+    with patch("whisper_typing.app_controller.process_memory_bytes", return_value=0):
+        controller._unload_if_idle()  # noqa: SLF001
+    assert controller.recorder is not None
+    first = np.ones(SAMPLE_RATE, dtype=np.float32)
+    second = np.zeros(SAMPLE_RATE, dtype=np.float32)
+
+    def record(audio: np.ndarray) -> None:
+        assert controller.recorder is not None
+        controller._start_recording()  # noqa: SLF001
+        controller.recorder.recording = True
+        controller.recorder.stop.return_value = audio
+        controller._stop_recording()  # noqa: SLF001
+        controller.recorder.recording = False
+        for _ in range(100):
+            if not controller.is_processing:
+                break
+            time.sleep(0.01)
+
+    mock_dependencies["transcriber"].side_effect = RuntimeError("out of memory")
+    record(first)
+
+    # Retried for the final pass, then the audio is kept
+    assert controller.transcriber is None
+    assert statuses[-1] == "Error"
+    assert controller.untranscribed_audio is first
+
+    loaded = MagicMock()
+    loaded.decode_metrics = DecodeMetrics()
+    loaded.transcribe.return_value = "both recordings"
+    mock_dependencies["transcriber"].side_effect = None
+    mock_dependencies["transcriber"].return_value = loaded
+    record(second)
+
+    (audio,) = loaded.transcribe.call_args.args
+    np.testing.assert_array_equal(audio, np.concatenate([first, second]))
+    assert controller.untranscribed_audio is None
+    assert controller.pending_text == "both recordings"
+    controller.shutdown()
+
+
+def test_idle_unload_waits_while_busy(
+    mock_dependencies: dict[str, Any],  # noqa: ARG001
+) -> None:
+    """Test the model stays loaded while recording."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.config["idle_unload_minutes"] = 10
+    controller.initialize_components()
+    assert controller.recorder is not None
+    controller.recorder.recording = True
+
+    controller._unload_if_idle()  # noqa: SLF001
+
+    assert controller.transcriber is not None
+    controller.shutdown()
+
+
+def test_final_pass_holds_live_preview(
+    mock_dependencies: dict[str, Any],  # noqa: ARG001
+) -> None:
+    """Test the governor pauses live passes during the final pass."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.initialize_components()
+    assert controller.transcriber is not None
+    paused_for: list[str | None] = []
+    controller.transcriber.transcribe.side_effect = lambda *_args, **_kwargs: (
+        paused_for.append(controller.governor.paused_for()) or "text"
+    )
+    assert controller.recorder is not None
+    controller.recorder.recording = True
+    controller.recorder.stop.return_value = np.zeros(SAMPLE_RATE, dtype=np.float32)
+
+    controller._stop_recording()  # noqa: SLF001
+    for _ in range(100):
+        if not controller.is_processing:
+            break
+        time.sleep(0.01)
+
+    assert paused_for == ["final"]
+    assert controller.get_metrics()["governor"]["live_paused_for"] is None
+
+
+def test_stop_abandons_live_pass(
+    mock_dependencies: dict[str, Any],  # noqa: ARG001
+) -> None:
+    """Test stopping starts the final pass without waiting for a live pass."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.initialize_components()
+    assert controller.transcriber is not None
+    assert controller.recorder is not None
+    controller.recorder.get_current_data.return_value = np.zeros(
+        SAMPLE_RATE, dtype=np.float32
+    )
+    controller.recorder.stop.return_value = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    live_started = threading.Event()
+    release = threading.Event()
+    final_started = threading.Event()
+
+    def transcribe(
+        _audio: np.ndarray,
+        *,
+        streaming: bool = False,  # noqa: ARG001
+        cancel: threading.Event | None = None,
+    ) -> str:
+        if cancel is None:  # Only live passes can be abandoned
+            final_started.set()
+            return "final text"
+        live_started.set()
+        release.wait(timeout=5)
+        return "stale preview"
+
+    controller.transcriber.transcribe.side_effect = transcribe
+    controller._start_recording()  # noqa: SLF001
+    controller.recorder.recording = True
+    assert live_started.wait(timeout=5)
+
+    try:
+        controller._stop_recording()  # noqa: SLF001
+        # The final pass runs while the live pass is still decoding
+        assert final_started.wait(timeout=1)
+    finally:
+        release.set()
+    assert controller.live_transcribe_thread is not None
+    controller.live_transcribe_thread.join(timeout=5)
+    for _ in range(100):
+        if not controller.is_processing:
+            break
+        time.sleep(0.01)
+
+    assert controller.pending_text == "final text"  # Live result discarded
+
+
+def test_spilling_bounds_live_window(
+    mock_dependencies: dict[str, Any],  # noqa: ARG001
+) -> None:
+    """Test live passes over a spilled session read only its recent audio."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    controller.config["spill_chunk_seconds"] = 30
+    controller.initialize_components()
+    assert controller.recorder is not None
+    controller.recorder.recording = True
+    controller.recorder.sample_rate = SAMPLE_RATE
+    controller.recorder.sample_count = 120 * SAMPLE_RATE
+    stop = threading.Event()
+    starts: list[int] = []
+
+    def current_data(start: int, **_kwargs: Any) -> None:  # noqa: ANN401
+        starts.append(start)
+        stop.set()
+
+    controller.recorder.get_current_data.side_effect = current_data
+    controller._live_transcription_loop(stop)  # noqa: SLF001
+
+    assert starts == [int((120 - SPILL_LIVE_WINDOW_SECONDS) * SAMPLE_RATE)]
+
+
+def test_slow_or_failing_improver_does_not_block_startup(
+    mock_dependencies: dict[str, Any],
+) -> None:
+    """Test the app is ready before the AI client, which fails on its own."""
+    controller = WhisperAppController()
+    controller.config = DEFAULT_CONFIG.copy()
+    logs: list[str] = []
+    controller.on_log = logs.append
+    release = threading.Event()
+
+    def slow_client(**_kwargs: Any) -> None:  # noqa: ANN401
+        release.wait(timeout=5)
+        msg = "quota exceeded"
+        raise RuntimeError(msg)
+
+    mock_dependencies["improver"].side_effect = slow_client
+
+    assert controller.initialize_components() is True
+    assert controller.improver is None
+    assert set(controller.get_metrics()["startup_seconds"]) == {
+        "recorder",
+        "typer",
+        "transcriber",
+    }
+
+    release.set()
+    assert controller.improver_init is not None
+    with pytest.raises(RuntimeError):
+        controller.improver_init.result(timeout=5)
+    assert controller.recorder is not None
+    # Reported by a callback that may run just after the future resolves
+    for _ in range(100):
+        if any("AI improvement unavailable: quota exceeded" in x for x in logs):
+            break
+        time.sleep(0.01)
+    assert any("AI improvement unavailable: quota exceeded" in x for x in logs)
@@ -1,9 +1,14 @@
 """Tests for audio_capture module."""
 
+import threading
 import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Self
 from unittest.mock import MagicMock, patch
 
 import numpy as np
+import pytest
 
 from whisper_typing.audio_capture import AudioRecorder
 
@@ -13,6 +18,17 @@ TOTAL_DATA_SIZE = 200
 SLEEP_DURATION = 0.5
 TIMEOUT = 1
 EXPECTED_DEVICE_COUNT = 2
+SHORT_WAIT = 0.05
+FAKE_BLOCK_SIZE = 160
+FAKE_BLOCK_PERIOD = 0.01
+NATIVE_RATE = 48000
+NATIVE_BLOCK = 4800
+SPILL_BLOCKS = 25
+PREROLL_MS = 100
+PREROLL_SAMPLES = 1600
+PREROLL_BLOCK = 1000
+PREROLL_BLOCK_VALUE = 2
+PREROLL_FRAME_COUNT = 2
 
 
 @patch("sounddevice.query_devices")
@@ -120,25 +136,365 @@ def test_record_exception_handling() -> None:
         assert recorder.recording is False
 
 
-def test_record_loop_with_sleep() -> None:
-    """Test _record loop executes with sd.sleep."""
-    with (
-        patch("sounddevice.InputStream") as mock_stream_cls,
-        patch("sounddevice.sleep") as mock_sleep,
-    ):
-        mock_stream = MagicMock()
-        mock_stream_cls.return_value.__enter__.return_value = mock_stream
-
+def test_record_waits_for_stop_event() -> None:
+    """Test _record holds the stream open until stop is signalled."""
+    with patch("sounddevice.InputStream") as mock_stream_cls:
         recorder = AudioRecorder()
-        recorder.recording = True
+        recorder.start()
+        assert recorder.thread is not None
+        time.sleep(SHORT_WAIT)
+        assert recorder.thread.is_alive()
+        mock_stream_cls.return_value.__exit__.assert_not_called()
+
+        recorder.stop()
+        assert not recorder.thread.is_alive()
+        mock_stream_cls.return_value.__exit__.assert_called_once()
+
+
+class FakeInputStream:
+    """Stream that delivers callbacks from a thread and flushes on exit."""
+
+    opened: list[Self] = []  # noqa: RUF012
+
+    def __init__(self, callback: Callable[..., None], **_kwargs: object) -> None:
+        self.callback = callback
+        self.running = threading.Event()
+        self.thread = threading.Thread(target=self._run)
+        self.delivered = 0
+        FakeInputStream.opened.append(self)
+
+    def _run(self) -> None:
+        block = np.ones((FAKE_BLOCK_SIZE, 1), dtype=np.float32)
+        while not self.running.wait(FAKE_BLOCK_PERIOD):
+            self.callback(block, FAKE_BLOCK_SIZE, None, None)
+            self.delivered += 1
+        # Final callback still in flight when the stream is stopped
+        self.callback(block, FAKE_BLOCK_SIZE, None, None)
+        self.delivered += 1
+
+    def __enter__(self) -> Self:
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.running.set()
+        self.thread.join()
+
+
+def test_stop_returns_once_the_stream_has_drained() -> None:
+    """Test stop wakes the capture thread and returns every delivered block."""
+    FakeInputStream.opened.clear()
+    with patch("sounddevice.InputStream", FakeInputStream):
+        # At the model's rate, so no host microphone's rate resamples blocks
+        recorder = AudioRecorder(capture_rate=16000)
+        recorder.start()
+        time.sleep(SHORT_WAIT)
+        data = recorder.stop()
+
+    # Woken by the event rather than polling, and finished when stop returns
+    assert recorder._stop_event.is_set()  # noqa: SLF001
+    assert recorder.thread is not None
+    assert not recorder.thread.is_alive()
+    (stream,) = FakeInputStream.opened
+    assert not stream.thread.is_alive()
+    # Including the block still in flight when the stream was stopped
+    assert data is not None
+    assert len(data) == stream.delivered * FAKE_BLOCK_SIZE
+    assert stream.delivered > 1
+
+
+@patch("sounddevice.InputStream")
+def test_preroll_stream_stays_open(mock_input_stream: MagicMock) -> None:
+    """Test pre-roll mode opens the stream once and records without a thread."""
+    recorder = AudioRecorder(preroll_ms=PREROLL_MS)
+
+    assert recorder.open() is True
+    assert recorder.open() is True
+    mock_input_stream.assert_called_once()
+    mock_input_stream.return_value.start.assert_called_once()
+
+    recorder.start()
+    assert recorder.recording is True
+    assert recorder.thread is None
+
+    recorder.stop()
+    recorder.close()
+    mock_input_stream.return_value.close.assert_called_once()
+    assert recorder.stream is None
+
+
+@patch("sounddevice.InputStream")
+def test_preroll_prepended_to_recording(mock_input_stream: MagicMock) -> None:  # noqa: ARG001
+    """Test the last pre-roll audio is prepended to the new recording."""
+    # 1600 samples of pre-roll, captured without resampling
+    recorder = AudioRecorder(preroll_ms=PREROLL_MS, capture_rate=16000)
+    recorder.open()
+
+    # Idle blocks wrap around the ring; only the newest 1600 samples remain
+    for value in range(1, 4):
+        block = np.full((PREROLL_BLOCK, 1), value, dtype=np.float32)
+        recorder._callback(block, PREROLL_BLOCK, MagicMock(), MagicMock())  # noqa: SLF001
+
+    recorder.start()
+    live = np.full((FAKE_FRAME_SIZE, 1), 9, dtype=np.float32)
+    recorder._callback(live, FAKE_FRAME_SIZE, MagicMock(), MagicMock())  # noqa: SLF001
+    data = recorder.stop()
+
+    assert data is not None
+    preroll_len = len(data) - FAKE_FRAME_SIZE
+    assert preroll_len == PREROLL_SAMPLES
+    assert np.all(data[: PREROLL_SAMPLES - PREROLL_BLOCK] == PREROLL_BLOCK_VALUE)
+    assert np.all(data[PREROLL_SAMPLES - PREROLL_BLOCK : preroll_len] == 3)  # noqa: PLR2004
+    assert np.all(data[preroll_len:] == 9)  # noqa: PLR2004
+
+    # Blocks after stop go back to the pre-roll, not the recording
+    recorder._callback(live, FAKE_FRAME_SIZE, MagicMock(), MagicMock())  # noqa: SLF001
+    assert len(recorder.frames) == PREROLL_FRAME_COUNT
+
+
+@patch("sounddevice.InputStream")
+def test_preroll_open_failure_falls_back(mock_input_stream: MagicMock) -> None:
+    """Test a failing always-open stream falls back to per-recording capture."""
+    mock_input_stream.side_effect = Exception("Device busy")
+    recorder = AudioRecorder(preroll_ms=PREROLL_MS)
+
+    assert recorder.open() is False
+    assert isinstance(recorder.last_error, Exception)
+
+    with patch.object(AudioRecorder, "_record"):
+        recorder.start()
+        assert recorder.thread is not None
+        recorder.stop()
+
+
+def test_open_without_preroll() -> None:
+    """Test open is a no-op when pre-roll is disabled."""
+    recorder = AudioRecorder()
+    assert recorder.open() is False
+    recorder.close()
+    assert recorder.stream is None
+
+
+@patch("sounddevice.InputStream")
+def test_close_error_is_recorded(mock_input_stream: MagicMock) -> None:
+    """Test errors while closing the stream are kept, not raised."""
+    mock_input_stream.return_value.stop.side_effect = Exception("Gone")
+    recorder = AudioRecorder(preroll_ms=PREROLL_MS)
+    recorder.open()
+    recorder.close()
+    assert recorder.stream is None
+    assert isinstance(recorder.last_error, Exception)
+
+
+@patch("sounddevice.InputStream")
+@patch("sounddevice.query_devices")
+def test_capture_at_native_rate(
+    mock_query_devices: MagicMock, mock_input_stream: MagicMock
+) -> None:
+    """Test the stream opens at the device rate and blocks are resampled."""
+    mock_query_devices.return_value = {"default_samplerate": NATIVE_RATE}
+    recorder = AudioRecorder()
+    recorder.recording = True
+
+    stream = recorder._create_stream()  # noqa: SLF001
+    assert stream is mock_input_stream.return_value
+    _, kwargs = mock_input_stream.call_args
+    assert kwargs["samplerate"] == NATIVE_RATE
+
+    block = np.ones((NATIVE_BLOCK, 1), dtype=np.float32)
+    recorder._callback(block, NATIVE_BLOCK, MagicMock(), MagicMock())  # noqa: SLF001
 
-        # Make sleep stop recording after first call
-        def stop_recording(*args: object) -> None:  # noqa: ARG001
-            recorder.recording = False
+    # Output is at 16 kHz, minus the few samples held back by the filter
+    data = recorder.get_current_data()
+    assert data is not None
+    assert NATIVE_BLOCK // 3 - len(data) == recorder._resampler.delay  # noqa: SLF001
+
+
+@patch("sounddevice.InputStream")
+def test_capture_rate_matching_sample_rate(mock_input_stream: MagicMock) -> None:
+    """Test no resampling happens when the capture rate is already 16 kHz."""
+    recorder = AudioRecorder(capture_rate=16000)
+    recorder._create_stream()  # noqa: SLF001
+    _, kwargs = mock_input_stream.call_args
+    assert kwargs["samplerate"] == 16000  # noqa: PLR2004
+    assert recorder._resampler is None  # noqa: SLF001
+
+
+@patch("sounddevice.query_devices")
+def test_native_rate_unknown_falls_back(mock_query_devices: MagicMock) -> None:
+    """Test the recording rate is used when the device cannot be queried."""
+    mock_query_devices.side_effect = Exception("No device")
+    recorder = AudioRecorder()
+    assert recorder._native_rate() == recorder.sample_rate  # noqa: SLF001
+
+
+@patch("sounddevice.InputStream")
+def test_resampled_stream_flushes_tail_on_stop(mock_input_stream: MagicMock) -> None:  # noqa: ARG001
+    """Test the samples held back by the filter are appended after stop."""
+    recorder = AudioRecorder(capture_rate=NATIVE_RATE)
+    recorder._stop_event.set()  # noqa: SLF001
 
-        mock_sleep.side_effect = stop_recording
+    def feed() -> None:
+        block = np.ones((NATIVE_BLOCK, 1), dtype=np.float32)
+        recorder._callback(block, NATIVE_BLOCK, MagicMock(), MagicMock())  # noqa: SLF001
 
+    with patch.object(recorder._stop_event, "wait", side_effect=feed):  # noqa: SLF001
         recorder._record()  # noqa: SLF001
 
-        # Verify sleep was called
-        mock_sleep.assert_called()
+    data = recorder.get_current_data()
+    assert data is not None
+    assert len(data) == NATIVE_BLOCK // 3
+
+
+@patch("sounddevice.InputStream")
+def test_int16_storage(mock_input_stream: MagicMock) -> None:
+    """Test int16 capture is stored as int16 and read back as float32."""
+    recorder = AudioRecorder(capture_rate=16000, dtype="int16")
+    recorder._create_stream()  # noqa: SLF001
+    _, kwargs = mock_input_stream.call_args
+    assert kwargs["dtype"] == "int16"
+
+    block = np.full((FAKE_FRAME_SIZE, 1), 16384, dtype=np.int16)
+    recorder._callback(block, FAKE_FRAME_SIZE, MagicMock(), MagicMock())  # noqa: SLF001
+    assert recorder.frames[0].dtype == np.int16
+
+    data = recorder.get_current_data()
+    assert data is not None
+    assert data.dtype == np.float32
+    np.testing.assert_array_equal(data, 0.5)
+
+
+@patch("sounddevice.InputStream")
+def test_int16_storage_with_resampling(mock_input_stream: MagicMock) -> None:
+    """Test resampled float blocks are quantized to int16 for storage."""
+    recorder = AudioRecorder(capture_rate=NATIVE_RATE, dtype="int16")
+    recorder._create_stream()  # noqa: SLF001
+    _, kwargs = mock_input_stream.call_args
+    assert kwargs["dtype"] == "float32"
+
+    recorder.recording = True
+    block = np.full((NATIVE_BLOCK, 1), 2.0, dtype=np.float32)  # clipped
+    recorder._callback(block, NATIVE_BLOCK, MagicMock(), MagicMock())  # noqa: SLF001
+    assert recorder.frames[0].dtype == np.int16
+    assert recorder.frames[0].max() == np.iinfo(np.int16).max
+
+
+def test_get_current_data_region_and_scratch() -> None:
+    """Test reading a region converts only that region into a reused buffer."""
+    recorder = AudioRecorder(dtype="int16")
+    with recorder._lock:  # noqa: SLF001
+        recorder.frames = [
+            np.full((LARGE_FRAME_SIZE, 1), value, dtype=np.int16)
+            for value in (0, 8192, 16384)
+        ]
+
+    region = recorder.get_current_data(start=150, reuse_buffer=True)
+    assert region is not None
+    assert len(region) == TOTAL_DATA_SIZE - 50
+    np.testing.assert_array_equal(region[:50], 0.25)
+    np.testing.assert_array_equal(region[50:], 0.5)
+
+    again = recorder.get_current_data(start=200, reuse_buffer=True)
+    assert again is not None
+    assert np.shares_memory(region, again)
+    assert recorder.get_current_data(start=300) is None
+
+
+def test_get_current_data_multichannel() -> None:
+    """Test multichannel data keeps its channel axis."""
+    recorder = AudioRecorder(channels=2)
+    with recorder._lock:  # noqa: SLF001
+        recorder.frames = [np.ones((FAKE_FRAME_SIZE, 2), dtype=np.float32)]
+    data = recorder.get_current_data()
+    assert data is not None
+    assert data.shape == (FAKE_FRAME_SIZE, 2)
+
+
+def test_spill_to_disk_recording(tmp_path: Path) -> None:
+    """Test long-session mode keeps audio in a spill file, not in frames."""
+    recorder = AudioRecorder(spill_chunk_seconds=0.1, spill_dir=str(tmp_path))
+    with patch.object(AudioRecorder, "_record"):
+        recorder.start()
+    assert recorder.store is not None
+
+    block = np.ones((FAKE_BLOCK_SIZE, 1), dtype=np.float32)
+    for _ in range(SPILL_BLOCKS):
+        recorder._callback(block, FAKE_BLOCK_SIZE, MagicMock(), MagicMock())  # noqa: SLF001
+
+    assert recorder.frames == []
+    assert recorder.store.resident_samples < recorder.spill_chunk_samples
+    assert recorder.sample_count == FAKE_BLOCK_SIZE * SPILL_BLOCKS
+
+    live = recorder.get_current_data(start=FAKE_BLOCK_SIZE, reuse_buffer=True)
+    assert live is not None
+    assert len(live) == FAKE_BLOCK_SIZE * (SPILL_BLOCKS - 1)
+
+    data = recorder.stop()
+    assert isinstance(data, np.memmap)
+    assert len(data) == FAKE_BLOCK_SIZE * SPILL_BLOCKS
+    assert recorder.get_current_data(start=len(data)) is None
+
+    spill_file = recorder.store.path
+    recorder.close()
+    assert recorder.store is None
+    assert not spill_file.exists()
+
+
+def test_capture_metrics_counts_overflows_and_gaps() -> None:
+    """Test the callback records overflows, timing and late blocks."""
+    recorder = AudioRecorder(capture_rate=16000)
+    block = np.zeros((FAKE_BLOCK_SIZE, 1), dtype=np.float32)  # 10 ms blocks
+    ok = MagicMock(input_overflow=False, input_underflow=False)
+    overflow = MagicMock(input_overflow=True, input_underflow=True)
+
+    for adc_time, status in [(1.0, ok), (1.01, ok), (1.2, overflow)]:
+        time_info = MagicMock(inputBufferAdcTime=adc_time)
+        recorder._callback(block, FAKE_BLOCK_SIZE, time_info, status)  # noqa: SLF001
+
+    metrics = recorder.metrics.snapshot()
+    assert metrics["callbacks"] == 3  # noqa: PLR2004
+    assert metrics["input_overflows"] == 1
+    assert metrics["input_underflows"] == 1
+    assert metrics["late_callbacks"] == 1
+    assert metrics["max_gap_ms"] == pytest.approx(190.0)
+    assert metrics["callback_ms_max"] >= metrics["callback_ms_mean"] > 0
+
+    recorder.metrics.reset()
+    assert recorder.metrics.snapshot()["callbacks"] == 0
+    assert recorder.metrics.snapshot()["callback_ms_mean"] == 0
+
+
+def test_capture_gaps_timed_by_arrival_without_adc_time() -> None:
+    """Test gaps are still measured when the host API reports no ADC time."""
+    recorder = AudioRecorder(capture_rate=16000)
+    block = np.zeros((FAKE_BLOCK_SIZE, 1), dtype=np.float32)  # 10 ms blocks
+    ok = MagicMock(input_overflow=False, input_underflow=False)
+    time_info = MagicMock(inputBufferAdcTime=0.0)  # As on MME and DirectSound
+
+    # Entry and exit of each callback
+    arrivals = [1.0, 1.001, 1.01, 1.011, 1.2, 1.201]
+    with patch("whisper_typing.audio_capture.time.perf_counter", side_effect=arrivals):
+        for _ in range(3):
+            recorder._callback(block, FAKE_BLOCK_SIZE, time_info, ok)  # noqa: SLF001
+
+    metrics = recorder.metrics.snapshot()
+    assert metrics["late_callbacks"] == 1
+    assert metrics["max_gap_ms"] == pytest.approx(190.0)
+
+
+@patch("sounddevice.InputStream")
+def test_preprocessing_applied_before_storage(mock_input_stream: MagicMock) -> None:
+    """Test captured blocks are preprocessed in float and stored as int16."""
+    recorder = AudioRecorder(capture_rate=16000, dtype="int16", preprocess=True)
+    recorder._create_stream()  # noqa: SLF001
+    _, kwargs = mock_input_stream.call_args
+    assert kwargs["dtype"] == "float32"
+
+    recorder.recording = True
+    block = np.full((NATIVE_BLOCK, 1), 0.25, dtype=np.float32)  # DC offset
+    recorder._callback(block, NATIVE_BLOCK, MagicMock(), MagicMock())  # noqa: SLF001
+
+    assert recorder.frames[0].dtype == np.int16
+    data = recorder.get_current_data()
+    assert data is not None
+    assert abs(data[-1]) < 0.01  # noqa: PLR2004
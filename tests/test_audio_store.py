@@ -0,0 +1,101 @@
+"""Tests for audio_store module."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from whisper_typing.audio_store import SpillingAudioStore
+
+CHUNK = 1000
+BLOCK = 160
+BLOCK_COUNT = 500
+
+
+def make_store(tmp_path: Path, dtype: str = "float32") -> SpillingAudioStore:
+    return SpillingAudioStore(CHUNK, dtype=dtype, directory=str(tmp_path))
+
+
+def fill(store: SpillingAudioStore, blocks: int) -> np.ndarray:
+    """Append numbered blocks and return the expected concatenation."""
+    data = np.arange(blocks * BLOCK, dtype=store.dtype).reshape(-1, 1)
+    for i in range(blocks):
+        store.append(data[i * BLOCK : (i + 1) * BLOCK])
+    return data
+
+
+def test_resident_memory_stays_bounded(tmp_path: Path) -> None:
+    """Test only less than one chunk is ever kept in memory."""
+    store = make_store(tmp_path)
+    data = np.zeros((BLOCK, 1), dtype=np.float32)
+    for _ in range(BLOCK_COUNT):
+        store.append(data)
+        assert store.resident_samples < CHUNK
+
+    assert len(store) == BLOCK * BLOCK_COUNT
+    assert store.path.stat().st_size == (len(store) // CHUNK) * CHUNK * 4
+    store.close()
+
+
+def test_read_spilled_range_is_zero_copy(tmp_path: Path) -> None:
+    """Test ranges inside the spill file are memory-mapped views."""
+    store = make_store(tmp_path)
+    expected = fill(store, 20)
+
+    view = store.read(100, 1900)
+    assert isinstance(view, np.memmap)
+    np.testing.assert_array_equal(view, expected[100:1900])
+    store.close()
+
+
+def test_read_across_resident_boundary(tmp_path: Path) -> None:
+    """Test ranges spanning disk and memory are stitched in order."""
+    store = make_store(tmp_path, dtype="int16")
+    expected = fill(store, 20)  # 3200 samples: 3000 on disk, 200 in memory
+
+    np.testing.assert_array_equal(store.read(), expected)
+    np.testing.assert_array_equal(store.read(2900, 3100), expected[2900:3100])
+    np.testing.assert_array_equal(store.read(3050), expected[3050:])
+    assert len(store.read(5000)) == 0
+    store.close()
+
+
+def test_flush_spills_everything(tmp_path: Path) -> None:
+    """Test flushing makes the whole recording a single file view."""
+    store = make_store(tmp_path)
+    expected = fill(store, 7)
+    store.flush()
+    store.flush()
+
+    assert store.resident_samples == 0
+    full = store.read()
+    assert isinstance(full, np.memmap)
+    np.testing.assert_array_equal(full, expected)
+    store.close()
+
+
+def test_empty_store_and_close(tmp_path: Path) -> None:
+    """Test an empty store reads nothing and close removes the file."""
+    store = make_store(tmp_path)
+    assert len(store.read()) == 0
+    path = store.path
+    store.close()
+    assert not path.exists()
+
+
+def test_file_still_mapped_at_close_deleted_later(tmp_path: Path) -> None:
+    """Test a spill file Windows won't delete yet is removed by the next store."""
+    store = make_store(tmp_path)
+    fill(store, 10)
+    view = store.read(0, CHUNK)
+    path = store.path
+
+    # Windows: the file can't be deleted while the view maps it
+    with patch.object(Path, "unlink", side_effect=PermissionError("in use")):
+        store.close()
+    assert path.exists()
+
+    del view
+    make_store(tmp_path).close()
+    assert not path.exists()
+    assert list(tmp_path.iterdir()) == []
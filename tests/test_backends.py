@@ -0,0 +1,181 @@
+"""Tests for backends module."""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+import torch
+
+from whisper_typing.backends import (
+    SAMPLE_RATE,
+    AssistedBackend,
+    FasterWhisperBackend,
+    OnnxBackend,
+    load_backend,
+)
+
+EOT = 50257
+SOT = 50258
+LANGUAGE_IDS = {"<|en|>": 50259, "<|de|>": 50261}
+VOCAB_SIZE = 50300
+
+
+def fake_processor() -> MagicMock:
+    """Build a WhisperProcessor stand-in with English and German tokens."""
+    processor = MagicMock()
+    tokens = {"<|startoftranscript|>": SOT, **LANGUAGE_IDS}
+    processor.tokenizer.additional_special_tokens = list(tokens)
+    processor.tokenizer.convert_tokens_to_ids.side_effect = tokens.__getitem__
+    processor.tokenizer.eos_token_id = EOT
+    processor.return_value = SimpleNamespace(input_features=torch.zeros(1, 80, 3000))
+    processor.batch_decode.return_value = [" Hallo Welt"]
+    return processor
+
+
+def test_unknown_backend_rejected() -> None:
+    """Test selecting a backend that doesn't exist fails clearly."""
+    with pytest.raises(ValueError, match="Unknown backend"):
+        load_backend("tflite", "openai/whisper-base", device="cpu", compute_type="int8")
+
+
+@patch("whisper_typing.backends.ModelManager")
+@patch("whisper_typing.backends.WhisperModel")
+def test_faster_whisper_backend_selected(
+    mock_whisper_model: MagicMock, mock_manager: MagicMock
+) -> None:
+    """Test the default backend loads a faster-whisper model by name."""
+    mock_manager.return_value.local_path.return_value = None
+    mock_manager.return_value.convert.return_value = None
+
+    backend = load_backend(
+        "faster-whisper", "openai/whisper-base", device="cpu", compute_type="int8"
+    )
+
+    assert isinstance(backend, FasterWhisperBackend)
+    assert backend.model_path == "base"
+    assert mock_whisper_model.call_args.args[0] == "base"
+
+
+def test_onnx_load_exports_once(tmp_path: Path) -> None:
+    """Test the ONNX backend exports through optimum-onnx, then reuses it."""
+    ort_model = MagicMock()
+    modules = {
+        "onnxruntime": MagicMock(),
+        "optimum": MagicMock(),
+        "optimum.onnxruntime": MagicMock(ORTModelForSpeechSeq2Seq=ort_model),
+        "transformers": MagicMock(),
+    }
+    export_dir = tmp_path / "onnx" / "openai--whisper-base"
+
+    with patch.dict(sys.modules, modules):
+        backend = OnnxBackend.load(
+            "openai/whisper-base",
+            device="cpu",
+            compute_type="int8",
+            cpu_threads=2,
+            download_root=str(tmp_path),
+        )
+        _, kwargs = ort_model.from_pretrained.call_args
+        assert kwargs["export"] is True
+        assert kwargs["provider"] == "CPUExecutionProvider"
+        assert kwargs["session_options"].intra_op_num_threads == 2  # noqa: PLR2004
+        ort_model.from_pretrained.return_value.save_pretrained.assert_called_once_with(
+            export_dir
+        )
+
+        export_dir.mkdir(parents=True)
+        (export_dir / "config.json").write_text("{}")
+        OnnxBackend.load(
+            "openai/whisper-base",
+            device="cuda",
+            compute_type="int8",
+            download_root=str(tmp_path),
+        )
+        args, kwargs = ort_model.from_pretrained.call_args
+        assert args == (export_dir,)
+        assert "export" not in kwargs
+        assert kwargs["provider"] == "CUDAExecutionProvider"
+
+    assert backend.model_path == str(export_dir)
+
+
+def test_onnx_detects_language_from_first_step() -> None:
+    """Test language probabilities come from the language token logits."""
+    model = MagicMock()
+    logits = torch.zeros(1, 1, VOCAB_SIZE)
+    logits[0, 0, LANGUAGE_IDS["<|de|>"]] = 5.0
+    model.return_value = SimpleNamespace(logits=logits)
+    backend = OnnxBackend(model, fake_processor(), "export")
+
+    language, probability, ranked = backend.detect_language(
+        np.zeros(SAMPLE_RATE, dtype=np.float32)
+    )
+
+    assert language == "de"
+    assert probability > 0.9  # noqa: PLR2004
+    assert [code for code, _ in ranked] == ["de", "en"]
+    decoder_ids = model.call_args.kwargs["decoder_input_ids"]
+    assert decoder_ids.tolist() == [[SOT]]
+
+
+def test_onnx_decodes_windows_as_segments() -> None:
+    """Test each 30 second window becomes a faster-whisper style segment."""
+    model = MagicMock()
+    model.generate.return_value = SimpleNamespace(
+        sequences=torch.tensor([[SOT, LANGUAGE_IDS["<|de|>"], 400, 401, EOT]]),
+        scores=(),
+    )
+    model.compute_transition_scores.return_value = torch.tensor([[-0.2, -0.4]])
+    backend = OnnxBackend(model, fake_processor(), "export")
+    audio = np.zeros(45 * SAMPLE_RATE, dtype=np.float32)
+
+    segments, info = backend.transcribe(audio, beam_size=2, language="de")
+    segments = list(segments)
+
+    assert info.language == "de"
+    assert [(s.start, s.end) for s in segments] == [(0.0, 30.0), (30.0, 45.0)]
+    assert segments[0].text == " Hallo Welt"
+    assert segments[0].tokens == [400, 401]
+    assert segments[0].avg_logprob == pytest.approx(-0.3)
+    assert segments[0].temperature == 0.0
+    kwargs = model.generate.call_args.kwargs
+    assert kwargs["num_beams"] == 2  # noqa: PLR2004
+    assert kwargs["language"] == "de"
+
+
+def test_assisted_requires_known_assistant() -> None:
+    """Test a model without a default assistant needs one configured."""
+    with pytest.raises(ValueError, match="assistant_model"):
+        load_backend(
+            "assisted", "openai/whisper-base", device="cpu", compute_type="int8"
+        )
+
+
+def test_assisted_drafts_greedily_with_assistant() -> None:
+    """Test generate gets the assistant and a single hypothesis."""
+    model = MagicMock()
+    model.device = torch.device("cpu")
+    model.dtype = torch.float32
+    model.generate.return_value = SimpleNamespace(
+        sequences=torch.tensor([[SOT, 400, EOT]]), scores=()
+    )
+    model.compute_transition_scores.return_value = torch.tensor([[-0.1]])
+    assistant = MagicMock()
+    backend = AssistedBackend(model, fake_processor(), "large", assistant)
+    audio = np.zeros(SAMPLE_RATE, dtype=np.float32)
+
+    segments, _info = backend.transcribe(audio, beam_size=5, language="de")
+    list(segments)
+    kwargs = model.generate.call_args.kwargs
+    assert kwargs["num_beams"] == 1
+    assert kwargs["assistant_model"] is assistant
+
+    backend.assistant = None
+    segments, _info = backend.transcribe(audio, beam_size=5, language="de")
+    list(segments)
+    kwargs = model.generate.call_args.kwargs
+    assert kwargs["num_beams"] == 5  # noqa: PLR2004
+    assert "assistant_model" not in kwargs
@@ -0,0 +1,87 @@
+"""Tests for device_registry module."""
+
+from unittest.mock import MagicMock, patch
+
+from whisper_typing.device_registry import DeviceRegistry, InputDevice
+
+DEVICES = [
+    {"name": "Mic", "max_input_channels": 1, "hostapi": 0, "default_samplerate": 44100},
+    {"name": "Speaker", "max_input_channels": 0, "hostapi": 0},
+    {"name": "Mic", "max_input_channels": 2, "hostapi": 1, "default_samplerate": 48000},
+    {"name": "USB Headset Mic", "max_input_channels": 1, "hostapi": 1},
+]
+HOSTAPIS = [{"name": "MME"}, {"name": "Windows WASAPI"}]
+
+
+def query_devices(_device: object = None, kind: str | None = None) -> object:
+    if kind == "input":
+        return {"index": 2}
+    return DEVICES
+
+
+@patch("sounddevice.query_hostapis", return_value=HOSTAPIS)
+@patch("sounddevice.query_devices", side_effect=query_devices)
+def test_enumerates_once(mock_query: MagicMock, mock_hostapis: MagicMock) -> None:  # noqa: ARG001
+    """Test repeated lookups are served from the cache."""
+    registry = DeviceRegistry()
+
+    assert registry.input_devices() == [(0, "Mic"), (2, "Mic"), (3, "USB Headset Mic")]
+    registry.find("Mic")
+    registry.get(0)
+    registry.devices()
+
+    # One full listing plus the default input lookup
+    assert mock_query.call_count == 2  # noqa: PLR2004
+
+
+@patch("sounddevice.query_hostapis", return_value=HOSTAPIS)
+@patch("sounddevice.query_devices", side_effect=query_devices)
+def test_find_prefers_host_api(mock_query: MagicMock, mock_hostapis: MagicMock) -> None:  # noqa: ARG001
+    """Test name plus host API gives a stable match across duplicates."""
+    registry = DeviceRegistry()
+
+    assert registry.find("Mic", "Windows WASAPI") == InputDevice(
+        2, "Mic", "Windows WASAPI", 48000
+    )
+    assert registry.find("Mic", "MME").index == 0
+    assert registry.find("Mic", "Unknown API").index == 0
+    assert registry.find("Headset").index == 3  # noqa: PLR2004
+    assert registry.find("Missing") is None
+
+
+@patch("sounddevice.query_hostapis", return_value=HOSTAPIS)
+@patch("sounddevice.query_devices", side_effect=query_devices)
+def test_get_default_and_unknown(
+    mock_query: MagicMock,  # noqa: ARG001
+    mock_hostapis: MagicMock,  # noqa: ARG001
+) -> None:
+    """Test None resolves to the default input device."""
+    registry = DeviceRegistry()
+
+    assert registry.get(None).index == 2  # noqa: PLR2004
+    assert registry.get(3).default_samplerate == 0
+    assert registry.get(99) is None
+
+
+@patch("sounddevice._initialize", create=True)
+@patch("sounddevice._terminate", create=True)
+@patch("sounddevice.query_hostapis", return_value=HOSTAPIS)
+@patch("sounddevice.query_devices", side_effect=query_devices)
+def test_rescan_reinitializes_portaudio(
+    mock_query: MagicMock,
+    mock_hostapis: MagicMock,  # noqa: ARG001
+    mock_terminate: MagicMock,
+    mock_initialize: MagicMock,
+) -> None:
+    """Test rescan and invalidate force a fresh enumeration."""
+    registry = DeviceRegistry()
+    registry.devices()
+    mock_terminate.assert_not_called()
+
+    registry.rescan()
+    mock_terminate.assert_called_once()
+    mock_initialize.assert_called_once()
+
+    registry.invalidate()
+    registry.devices()
+    assert mock_query.call_count == 6  # noqa: PLR2004
@@ -0,0 +1,64 @@
+"""Tests for features module."""
+
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor
+
+from whisper_typing.features import IncrementalFeatures, StreamingFeatureExtractor
+
+SAMPLE_RATE = 16000
+TOLERANCE = 1e-6
+MAX_TAIL_FRAMES = 3
+
+
+def noise(seconds: float, seed: int = 0) -> np.ndarray:
+    """Build a reproducible test signal."""
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * 0.1).astype(np.float32)
+
+
+def test_incremental_matches_full_extraction() -> None:
+    """Test features built block by block equal a full recomputation."""
+    extractor = FeatureExtractor()
+    incremental = IncrementalFeatures(extractor)
+    audio = noise(6)
+    # Odd block sizes exercise frames straddling block edges
+    position = 0
+    for step in (1, 199, 200, 201, 513, 12800, 3333, 16000, 40000):
+        position += step
+        buffer = audio[:position]
+        expected = extractor(buffer)
+        features = incremental.update(buffer)
+        assert features.shape == expected.shape
+        np.testing.assert_allclose(features, expected, rtol=0, atol=TOLERANCE)
+
+    # Only the frames touching the zero padding are recomputed
+    assert expected.shape[1] - incremental.cached_frames <= MAX_TAIL_FRAMES
+
+
+def test_incremental_rebuilds_for_other_audio() -> None:
+    """Test a buffer that does not extend the previous one resets the cache."""
+    extractor = FeatureExtractor()
+    incremental = IncrementalFeatures(extractor)
+    incremental.update(noise(2, seed=1))
+
+    other = noise(3, seed=2)
+    np.testing.assert_allclose(
+        incremental.update(other), extractor(other), rtol=0, atol=TOLERANCE
+    )
+
+
+def test_streaming_extractor_serves_prepared_buffer_only() -> None:
+    """Test precomputed features are only used for the prepared buffer."""
+    extractor = FeatureExtractor()
+    streaming = StreamingFeatureExtractor(extractor)
+    live = noise(2)
+    streaming.prepare(live)
+
+    assert streaming(live) is streaming(live)  # Served from the cache
+    np.testing.assert_allclose(streaming(live), extractor(live), atol=TOLERANCE)
+    other = live[:SAMPLE_RATE]
+    assert streaming(other).shape == extractor(other).shape
+    assert streaming.nb_max_frames == extractor.nb_max_frames
+
+    streaming.release()
+    assert streaming(live) is not streaming(live)
@@ -0,0 +1,97 @@
+"""Tests for governor module."""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from whisper_typing.governor import (
+    ResourceGovernor,
+    available_cores,
+    pin_process,
+    pinned_to,
+)
+
+CORES = [0, 1, 2, 3, 4, 5, 6, 7]
+
+
+@patch("whisper_typing.governor.available_cores", return_value=CORES)
+def test_budgets_follow_share_and_pinning(mock_cores: object) -> None:  # noqa: ARG001
+    """Test the decoder threads follow the pinned cores."""
+    governor = ResourceGovernor(live_share=0.25)
+    assert governor.decoder_cores is None
+    assert governor.pinned_threads == 0
+
+    # Cores the process can't use are ignored
+    governor.configure(live_share=0.5, decoder_cores=[2, 3, 4, 5, 99])
+    snapshot = governor.snapshot()
+    assert snapshot["decoder_cores"] == [2, 3, 4, 5]
+    assert snapshot["live_share"] == 0.5  # noqa: PLR2004
+    assert governor.pinned_threads == 4  # noqa: PLR2004
+
+
+def test_final_pass_and_typing_pause_live_passes() -> None:
+    """Test live passes wait while higher priority work runs."""
+    governor = ResourceGovernor()
+    assert governor.live_ready()
+
+    with governor.hold("final"):
+        assert not governor.live_ready()
+        assert governor.snapshot()["live_paused_for"] == "final"
+        with governor.hold("typing"):
+            assert not governor.live_ready()
+    assert governor.live_ready()
+    assert governor.snapshot()["live_paused"] == 2  # noqa: PLR2004
+
+
+def test_live_pass_rests_in_proportion() -> None:
+    """Test a live pass is followed by a rest matching the live share."""
+    governor = ResourceGovernor(live_share=0.25)
+
+    with (
+        patch("whisper_typing.governor.time.monotonic", side_effect=[10.0, 11.0, 11.0]),
+        governor.live_pass(),
+    ):
+        pass
+
+    assert governor.live_rest_seconds == 3.0  # noqa: PLR2004
+    with patch("whisper_typing.governor.time.monotonic", return_value=13.0):
+        assert not governor.live_ready()
+    with patch("whisper_typing.governor.time.monotonic", return_value=14.0):
+        assert governor.live_ready()
+
+
+def test_live_passes_run_back_to_back_by_default() -> None:
+    """Test the live preview doesn't rest unless its share is limited."""
+    governor = ResourceGovernor()
+
+    with (
+        patch("whisper_typing.governor.time.monotonic", side_effect=[10.0, 11.0, 11.0]),
+        governor.live_pass(),
+    ):
+        pass
+
+    assert governor.live_rest_seconds == 0
+    with patch("whisper_typing.governor.time.monotonic", return_value=11.0):
+        assert governor.live_ready()
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="Linux only")
+def test_pinning_is_restored() -> None:
+    """Test the affinity only applies inside the block."""
+    before = available_cores()
+
+    with pinned_to(before[:1]):
+        assert available_cores() == before[:1]
+    assert available_cores() == before
+
+
+@patch("whisper_typing.governor.psutil.Process")
+def test_worker_process_pinned_through_psutil(mock_process: MagicMock) -> None:
+    """Test a decoder worker pins itself the way Windows supports."""
+    pin_process([2, 3])
+    mock_process.return_value.cpu_affinity.assert_called_once_with([2, 3])
+
+    mock_process.reset_mock()
+    pin_process(None)
+    mock_process.return_value.cpu_affinity.assert_not_called()
@@ -0,0 +1,107 @@
+"""Tests for long_form module."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from whisper_typing.long_form import (
+    SAMPLE_RATE,
+    Chunk,
+    ParallelDecoder,
+    split_at_pauses,
+    stitch,
+)
+
+WINDOW = 10 * SAMPLE_RATE
+
+
+def speech(start_s: float, end_s: float) -> dict[str, int]:
+    """Build a VAD speech timestamp."""
+    return {"start": int(start_s * SAMPLE_RATE), "end": int(end_s * SAMPLE_RATE)}
+
+
+@patch("whisper_typing.long_form.get_speech_timestamps")
+def test_split_cuts_in_latest_pause(mock_vad: MagicMock) -> None:
+    """Test chunks end in the middle of the last pause inside each window."""
+    audio = np.zeros(25 * SAMPLE_RATE, dtype=np.float32)
+    mock_vad.return_value = [
+        speech(0, 4),
+        speech(5, 8),  # Pause 8-9 -> cut at 8.5s
+        speech(9, 17),
+        speech(18, 25),  # Pause 17-18 -> cut at 17.5s
+    ]
+
+    chunks = split_at_pauses(audio, max_seconds=10)
+
+    assert [c.start for c in chunks] == [
+        0,
+        int(8.5 * SAMPLE_RATE),
+        int(17.5 * SAMPLE_RATE),
+    ]
+    assert chunks[-1].end == len(audio)
+    assert not any(c.overlaps_previous for c in chunks)
+
+
+@patch("whisper_typing.long_form.get_speech_timestamps")
+def test_split_without_pause_overlaps(mock_vad: MagicMock) -> None:
+    """Test continuous speech is cut hard with overlapping chunks."""
+    audio = np.zeros(15 * SAMPLE_RATE, dtype=np.float32)
+    mock_vad.return_value = [speech(0, 15)]
+
+    chunks = split_at_pauses(audio, max_seconds=10, overlap_seconds=1)
+
+    assert chunks == [
+        Chunk(0, WINDOW, overlaps_previous=False),
+        Chunk(9 * SAMPLE_RATE, len(audio), overlaps_previous=True),
+    ]
+
+
+def test_short_audio_is_one_chunk() -> None:
+    """Test audio within the window is not split."""
+    audio = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    assert split_at_pauses(audio) == [Chunk(0, SAMPLE_RATE, overlaps_previous=False)]
+
+
+def test_stitch_drops_overlapping_words() -> None:
+    """Test words repeated across a hard cut appear once."""
+    chunks = [
+        Chunk(0, 1, overlaps_previous=False),
+        Chunk(1, 2, overlaps_previous=True),
+        Chunk(2, 3, overlaps_previous=False),
+    ]
+    texts = ["we went to the", "The market, and then", "home again"]
+
+    assert stitch(texts, chunks) == "we went to the market, and then home again"
+
+
+def test_parallel_decoder_runs_chunks_concurrently() -> None:
+    """Test chunks are decoded at the same time and stitched in order."""
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def decode(audio: np.ndarray) -> str:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return f"chunk{int(audio[0])}"
+
+    workers = [MagicMock(transcribe=MagicMock(side_effect=decode)) for _ in range(3)]
+    decoder = ParallelDecoder(workers)
+    audio = np.repeat(np.arange(3, dtype=np.float32), WINDOW)
+    chunks = [
+        Chunk(i * WINDOW, (i + 1) * WINDOW, overlaps_previous=False) for i in range(3)
+    ]
+
+    with patch("whisper_typing.long_form.split_at_pauses", return_value=chunks):
+        text = decoder.transcribe(audio, {"language": "en"})
+
+    assert text == "chunk0 chunk1 chunk2"
+    assert peak > 1
+    assert all(worker.language == "en" for worker in workers)
@@ -0,0 +1,141 @@
+"""Tests for model_manager module."""
+
+import hashlib
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from whisper_typing.model_manager import REQUIRED_FILES, ModelManager
+
+MODEL_BYTES = 2048
+
+
+def make_model(directory: Path, size: int = MODEL_BYTES) -> Path:
+    """Create a fake CTranslate2 model directory."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in REQUIRED_FILES:
+        (directory / name).write_bytes(b"x" * size)
+    return directory
+
+
+def make_cached_repo(cache: Path, repo_id: str) -> Path:
+    """Create a fake Hugging Face cache entry for a model repository."""
+    repo = cache / f"models--{repo_id.replace('/', '--')}"
+    revision = hashlib.sha1(repo_id.encode()).hexdigest()  # noqa: S324
+    (repo / "refs").mkdir(parents=True)
+    (repo / "refs" / "main").write_text(revision)
+    (repo / "blobs").mkdir()
+    return make_model(repo / "snapshots" / revision)
+
+
+@patch("whisper_typing.model_manager.download_model")
+def test_resolve_prefers_complete_local_copy(
+    mock_download: MagicMock, tmp_path: Path
+) -> None:
+    """Test a complete cached model resolves to its directory without network."""
+    path = make_model(tmp_path / "base")
+    mock_download.return_value = str(path)
+    manager = ModelManager(str(tmp_path))
+
+    assert manager.resolve("openai/whisper-base") == str(path)
+    mock_download.assert_called_once_with(
+        "base", local_files_only=True, cache_dir=str(tmp_path)
+    )
+
+    # A partial download is not usable offline
+    (path / "model.bin").write_bytes(b"")
+    assert not manager.verify("openai/whisper-base")
+    assert manager.resolve("openai/whisper-base") == "base"
+
+    mock_download.side_effect = FileNotFoundError
+    assert manager.local_path("openai/whisper-small") is None
+
+
+def test_list_and_prune_cached_models(tmp_path: Path) -> None:
+    """Test cached Whisper models are listed and pruned, others kept."""
+    make_cached_repo(tmp_path, "Systran/faster-whisper-base")
+    make_cached_repo(tmp_path, "Systran/faster-whisper-small")
+    make_cached_repo(tmp_path, "google/unrelated-model")
+    manager = ModelManager(str(tmp_path))
+
+    cached = {model.repo_id for model in manager.cached_models()}
+    assert cached == {"Systran/faster-whisper-base", "Systran/faster-whisper-small"}
+
+    freed = manager.prune(["openai/whisper-base"])
+
+    assert freed == MODEL_BYTES * len(REQUIRED_FILES)
+    cached = {model.repo_id for model in manager.cached_models()}
+    assert cached == {"Systran/faster-whisper-base"}
+    assert (tmp_path / "models--google--unrelated-model").exists()
+
+
+@patch("whisper_typing.model_manager.download_model")
+def test_local_path_accepts_model_directory(
+    mock_download: MagicMock, tmp_path: Path
+) -> None:
+    """Test a model directory is used as is."""
+    path = make_model(tmp_path / "custom")
+
+    assert ModelManager().local_path(str(path)) == str(path)
+    mock_download.assert_not_called()
+
+
+def make_checkpoint(directory: Path) -> Path:
+    """Create a fake transformers Whisper checkpoint."""
+    directory.mkdir(parents=True)
+    (directory / "config.json").write_text('{"model_type": "whisper"}')
+    (directory / "model.safetensors").write_bytes(b"x" * MODEL_BYTES)
+    (directory / "tokenizer.json").write_text("{}")
+    return directory
+
+
+@patch("ctranslate2.converters.TransformersConverter")
+def test_checkpoint_converted_once_per_revision(
+    mock_converter: MagicMock, tmp_path: Path
+) -> None:
+    """Test a transformers checkpoint is converted to int8 and then reused."""
+    source = make_checkpoint(tmp_path / "my-finetune")
+    manager = ModelManager(str(tmp_path / "cache"))
+    mock_converter.return_value.convert.side_effect = lambda output, **_: make_model(
+        Path(output)
+    )
+
+    assert manager.is_checkpoint(str(source))
+    assert manager.local_path(str(source)) is None
+    converted = manager.convert(str(source))
+
+    assert converted is not None
+    assert manager.is_complete(converted)
+    assert mock_converter.call_args.kwargs["copy_files"] == ["tokenizer.json"]
+    assert mock_converter.return_value.convert.call_args.kwargs["quantization"] == (
+        "int8"
+    )
+    # Reused offline, and by later conversions of the same revision
+    assert manager.local_path(str(source)) == converted
+    assert manager.convert(str(source)) == converted
+    assert mock_converter.call_count == 1
+
+    # New weights are a new revision
+    (source / "model.safetensors").write_bytes(b"y" * (MODEL_BYTES + 1))
+    assert manager.local_path(str(source)) is None
+    assert manager.convert(str(source)) != converted
+
+
+def test_converted_models_are_not_checkpoints(tmp_path: Path) -> None:
+    """Test CTranslate2 models and official names are never converted."""
+    path = make_model(tmp_path / "custom")
+
+    assert not ModelManager.is_checkpoint(str(path))
+    assert ModelManager(str(tmp_path)).convert(str(path)) is None
+    assert ModelManager(str(tmp_path)).convert("openai/whisper-base") is None
+
+
+@patch("whisper_typing.model_manager.snapshot_download")
+def test_ctranslate2_repositories_skip_the_hub(
+    mock_snapshot: MagicMock, tmp_path: Path
+) -> None:
+    """Test repositories faster-whisper loads directly are never fetched to convert."""
+    manager = ModelManager(str(tmp_path))
+
+    assert manager.convert("Systran/faster-distil-whisper-large-v3") is None
+    assert manager._converted_copy("Systran/faster-whisper-base") is None  # noqa: SLF001
+    mock_snapshot.assert_not_called()
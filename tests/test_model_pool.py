@@ -0,0 +1,200 @@
+"""Tests for model_pool module."""
+
+import threading
+from itertools import count
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from whisper_typing.model_pool import BYTES_PER_MB, ModelKey, ModelPool
+from whisper_typing.process_transcriber import ProcessTranscriber
+
+BASE = ModelKey("openai/whisper-base.en", "cpu", "int8")
+SMALL = ModelKey("openai/whisper-small.en", "cpu", "int8")
+MEDIUM = ModelKey("openai/whisper-medium.en", "cpu", "int8")
+MODEL_MB = 100
+
+
+def fake_rss() -> MagicMock:
+    """RSS that grows by MODEL_MB on every load (two reads per load)."""
+    steps = count()
+    return MagicMock(
+        side_effect=lambda: (next(steps) + 1) // 2 * MODEL_MB * BYTES_PER_MB
+    )
+
+
+@patch("whisper_typing.model_pool.process_memory_bytes", new_callable=fake_rss)
+def test_hit_returns_resident_model(mock_rss: MagicMock) -> None:  # noqa: ARG001
+    """Test switching back to a resident model does not reload it."""
+    pool = ModelPool(max_models=2)
+    loader = MagicMock(side_effect=MagicMock)
+
+    first = pool.get(BASE, loader)
+    pool.get(SMALL, loader)
+    assert pool.get(BASE, loader) is first
+    assert loader.call_count == 2  # noqa: PLR2004
+    assert BASE in pool
+
+
+@patch("whisper_typing.model_pool.process_memory_bytes", new_callable=fake_rss)
+def test_lru_eviction_by_count(mock_rss: MagicMock) -> None:  # noqa: ARG001
+    """Test the least recently used model is evicted first."""
+    pool = ModelPool(max_models=2)
+    loader = MagicMock(side_effect=MagicMock)
+
+    pool.get(BASE, loader)
+    pool.get(SMALL, loader)
+    pool.get(BASE, loader)  # SMALL is now least recently used
+    pool.get(MEDIUM, loader)
+
+    assert list(pool.resident_memory()) == [BASE, MEDIUM]
+
+
+@patch("whisper_typing.model_pool.process_memory_bytes", new_callable=fake_rss)
+def test_eviction_by_memory_budget(mock_rss: MagicMock) -> None:  # noqa: ARG001
+    """Test models are evicted to stay within the memory budget."""
+    pool = ModelPool(max_models=5, max_memory_mb=int(MODEL_MB * 1.5))
+    loader = MagicMock(side_effect=MagicMock)
+
+    pool.get(BASE, loader)
+    pool.get(SMALL, loader)
+
+    assert pool.resident_memory() == {SMALL: MODEL_MB * BYTES_PER_MB}
+
+
+@patch("whisper_typing.model_pool.process_memory_bytes", new_callable=fake_rss)
+def test_evict_and_clear(mock_rss: MagicMock) -> None:  # noqa: ARG001
+    """Test explicit eviction reports the memory attributed to the model."""
+    pool = ModelPool()
+    pool.get(BASE, MagicMock)
+
+    assert pool.evict(BASE) == MODEL_MB * BYTES_PER_MB
+    assert pool.evict(BASE) == 0
+
+    pool.get(SMALL, MagicMock)
+    pool.clear()
+    assert pool.resident_memory() == {}
+
+
+@patch("whisper_typing.model_pool.process_memory_bytes", new_callable=fake_rss)
+def test_lookups_do_not_wait_for_a_load(mock_rss: MagicMock) -> None:  # noqa: ARG001
+    """Test the pool answers while loading and shares a load between callers."""
+    pool = ModelPool()
+    pool.get(BASE, MagicMock)
+    started = threading.Event()
+    release = threading.Event()
+    loaded = MagicMock()
+
+    def slow_loader() -> MagicMock:
+        started.set()
+        release.wait(5)
+        return loaded
+
+    loader = MagicMock(side_effect=slow_loader)
+    results: list[MagicMock] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pool.get(SMALL, loader)))
+        for _ in range(2)
+    ]
+    threads[0].start()
+    assert started.wait(5)
+    threads[1].start()
+
+    # Answered while SMALL is still loading
+    assert SMALL not in pool
+    assert pool.loading(SMALL)
+    assert list(pool.resident_memory()) == [BASE]
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == [loaded, loaded]
+    assert loader.call_count == 1
+    assert not pool.loading(SMALL)
+    assert SMALL in pool
+
+
+def test_failed_load_is_not_cached() -> None:
+    """Test a failed load reaches the caller and the next get retries."""
+    pool = ModelPool()
+    loader = MagicMock(side_effect=[RuntimeError("out of memory"), MagicMock()])
+
+    with pytest.raises(RuntimeError, match="out of memory"):
+        pool.get(BASE, loader)
+    assert not pool.loading(BASE)
+    pool.get(BASE, loader)
+    assert BASE in pool
+
+
+# The worker's load leaves the parent's RSS alone; SMALL's adds MODEL_MB
+@patch(
+    "whisper_typing.model_pool.process_memory_bytes",
+    side_effect=[0, 0, MODEL_MB * BYTES_PER_MB],
+)
+def test_worker_memory_measured_in_worker(mock_rss: MagicMock) -> None:  # noqa: ARG001
+    """Test a model loaded in a worker process is measured there."""
+    pool = ModelPool(max_models=5, max_memory_mb=int(MODEL_MB * 2.5))
+    worker = MagicMock(spec=ProcessTranscriber)
+    worker.memory_bytes.return_value = 2 * MODEL_MB * BYTES_PER_MB
+
+    pool.get(BASE, lambda: worker)
+    assert pool.resident_memory() == {BASE: 2 * MODEL_MB * BYTES_PER_MB}
+    assert pool.worker_memory_bytes() == 2 * MODEL_MB * BYTES_PER_MB
+
+    # The budget counts the worker too: an in-process model evicts it
+    pool.get(SMALL, MagicMock)
+    assert list(pool.resident_memory()) == [SMALL]
+    assert pool.worker_memory_bytes() == 0
+
+
+@patch("whisper_typing.model_pool.process_memory_bytes", new_callable=fake_rss)
+def test_serving_model_is_never_evicted(mock_rss: MagicMock) -> None:  # noqa: ARG001
+    """Test a background load evicts an idle model, not the serving one."""
+    pool = ModelPool(max_models=2)
+    pool.get(BASE, MagicMock)
+    pool.get(SMALL, MagicMock)
+    pool.activate(BASE)  # Least recently used, but still serving
+
+    pool.get(MEDIUM, MagicMock)
+    assert list(pool.resident_memory()) == [BASE, MEDIUM]
+
+
+def test_concurrent_loads_measured_separately() -> None:
+    """Test in-process loads don't count each other's memory."""
+    rss = [0]
+    first_started = threading.Event()
+    release = threading.Event()
+    second_started = threading.Event()
+
+    def load_base() -> MagicMock:
+        first_started.set()
+        rss[0] += MODEL_MB * BYTES_PER_MB
+        release.wait(5)
+        return MagicMock()
+
+    def load_small() -> MagicMock:
+        second_started.set()
+        rss[0] += 2 * MODEL_MB * BYTES_PER_MB
+        return MagicMock()
+
+    pool = ModelPool(max_models=5)
+    with patch(
+        "whisper_typing.model_pool.process_memory_bytes", side_effect=lambda: rss[0]
+    ):
+        threads = [
+            threading.Thread(target=pool.get, args=(BASE, load_base)),
+            threading.Thread(target=pool.get, args=(SMALL, load_small)),
+        ]
+        threads[0].start()
+        assert first_started.wait(5)
+        threads[1].start()
+        # The second load waits until the first is measured
+        assert not second_started.wait(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+    assert pool.resident_memory() == {
+        BASE: MODEL_MB * BYTES_PER_MB,
+        SMALL: 2 * MODEL_MB * BYTES_PER_MB,
+    }
@@ -0,0 +1,87 @@
+"""Tests for preprocessing module."""
+
+import numpy as np
+from scipy import signal
+
+from whisper_typing.preprocessing import (
+    MAX_GAIN_DB,
+    TARGET_RMS_DBFS,
+    AudioPreprocessor,
+)
+
+SAMPLE_RATE = 16000
+BLOCK_SIZE = 320
+
+
+def tone(frequency: float, seconds: float, amplitude: float) -> np.ndarray:
+    """Build a mono sine tone shaped ``(frames, 1)``."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)[:, None]
+
+
+def process_in_blocks(preprocessor: AudioPreprocessor, audio: np.ndarray) -> np.ndarray:
+    """Feed audio through the preprocessor in fixed-size blocks."""
+    return np.concatenate(
+        [
+            preprocessor.process(audio[pos : pos + BLOCK_SIZE])
+            for pos in range(0, len(audio), BLOCK_SIZE)
+        ]
+    )
+
+
+def rms_dbfs(audio: np.ndarray) -> float:
+    """Return the RMS level of audio in dBFS."""
+    return float(20 * np.log10(np.sqrt(np.mean(np.square(audio)))))
+
+
+def test_filter_state_carried_across_blocks() -> None:
+    """Test block-wise filtering equals filtering the whole signal at once."""
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal((SAMPLE_RATE, 1)).astype(np.float32) * 0.1
+
+    preprocessor = AudioPreprocessor(SAMPLE_RATE, agc=False)
+    blocks = process_in_blocks(preprocessor, audio)
+    expected = signal.sosfilt(preprocessor.sos, audio[:, 0])
+
+    np.testing.assert_allclose(blocks[:, 0], expected, atol=1e-5)
+
+
+def test_dc_offset_and_rumble_removed() -> None:
+    """Test DC offset and low rumble are removed while speech bands pass."""
+    rumble = tone(20, 2.0, 0.2) + 0.3
+    speech = tone(1000, 2.0, 0.2)
+
+    def settled_level(audio: np.ndarray) -> float:
+        out = process_in_blocks(AudioPreprocessor(SAMPLE_RATE, agc=False), audio)
+        return rms_dbfs(out[SAMPLE_RATE:])
+
+    assert settled_level(rumble) < rms_dbfs(rumble) - 20
+    assert abs(settled_level(speech) - rms_dbfs(speech)) < 0.5  # noqa: PLR2004
+
+
+def test_quiet_input_levelled_towards_target() -> None:
+    """Test the gain control raises quiet speech and stays within bounds."""
+    quiet = tone(440, 6.0, 0.005)
+
+    out = process_in_blocks(AudioPreprocessor(SAMPLE_RATE), quiet)
+
+    settled = rms_dbfs(out[-SAMPLE_RATE:])
+    assert settled > rms_dbfs(quiet) + 10
+    assert settled <= TARGET_RMS_DBFS + 0.5
+    assert np.abs(out).max() <= 1.0
+
+
+def test_silence_not_amplified() -> None:
+    """Test pauses below the noise gate leave the gain unchanged."""
+    preprocessor = AudioPreprocessor(SAMPLE_RATE)
+    process_in_blocks(preprocessor, tone(440, 2.0, 1e-5))
+
+    assert preprocessor.gain_db == 0.0
+
+
+def test_gain_is_bounded() -> None:
+    """Test the gain never exceeds the configured maximum."""
+    preprocessor = AudioPreprocessor(SAMPLE_RATE)
+    process_in_blocks(preprocessor, tone(440, 20.0, 0.0005))
+
+    assert preprocessor.gain_db <= MAX_GAIN_DB
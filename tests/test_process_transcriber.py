@@ -0,0 +1,186 @@
+"""Tests for process_transcriber module."""
+
+import os
+import threading
+import time
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from whisper_typing.process_transcriber import ProcessTranscriber
+from whisper_typing.transcriber import DecodeMetrics
+
+SAMPLE_RATE = 16000
+
+
+class FakeTranscriber:
+    """Stands in for Transcriber inside the worker process."""
+
+    def __init__(self, **kwargs: Any) -> None:  # noqa: ANN401
+        """Record the arguments, failing on request."""
+        if kwargs.get("model_id") == "broken":
+            msg = "no such model"
+            raise ValueError(msg)
+        self.language: str | None = None
+        self.pinned_language: str | None = None
+        self.recordings = 0
+        self.decode_metrics = DecodeMetrics()
+
+    def begin_recording(self) -> None:
+        """Count recordings."""
+        self.recordings += 1
+        self.pinned_language = None
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        *,
+        streaming: bool = False,
+        cancel: threading.Event | None = None,
+    ) -> str:
+        """Describe the received audio; audio of -1 decodes until cancelled."""
+        if not len(audio):
+            msg = "empty audio"
+            raise ValueError(msg)
+        if audio[0] == -1 and cancel is not None:
+            return "cancelled" if cancel.wait(timeout=10) else "timed out"
+        self.decode_metrics.record_pass(len(audio) / SAMPLE_RATE, 1, 0, 0.0)
+        self.pinned_language = self.language or "de"
+        return (
+            f"{len(audio)} {audio[0]:.1f} {audio[-1]:.1f} {audio.sum():.3f} "
+            f"{self.language} {self.recordings} {streaming} {os.getpid()}"
+        )
+
+
+@pytest.fixture
+def worker() -> Any:  # noqa: ANN401
+    """Start a worker hosting FakeTranscriber with a one-second ring."""
+    with patch("whisper_typing.process_transcriber.RING_SECONDS", 1):
+        transcriber = ProcessTranscriber(
+            transcriber_cls=FakeTranscriber,
+            model_id="base",
+        )
+    yield transcriber
+    transcriber.close()
+
+
+def test_transcribes_in_worker_process(worker: ProcessTranscriber) -> None:
+    """Test audio reaches the worker intact and options are forwarded."""
+    audio = np.linspace(0, 1, SAMPLE_RATE // 2, dtype=np.float32)
+    worker.language = "fr"
+    worker.begin_recording()
+
+    result = worker.transcribe(audio, streaming=True)
+    length, first, last, _sum, language, recordings, streaming, pid = result.split()
+
+    assert int(length) == len(audio)
+    assert (float(first), float(last)) == (0.0, 1.0)
+    assert language == "fr"
+    assert recordings == "1"
+    assert streaming == "True"
+    assert int(pid) != os.getpid()
+    assert worker.decode_metrics.snapshot()["passes"] == 1
+
+
+def test_pinned_language_reported_by_worker(worker: ProcessTranscriber) -> None:
+    """Test the language the worker pinned is visible in the parent."""
+    worker.begin_recording()
+    assert worker.pinned_language is None
+
+    worker.transcribe(np.ones(10, dtype=np.float32), streaming=True)
+    assert worker.pinned_language == "de"
+
+    worker.begin_recording()
+    assert worker.pinned_language is None
+
+
+def test_worker_memory_is_the_worker_rss(worker: ProcessTranscriber) -> None:
+    """Test memory is measured in the worker process, not the parent."""
+    worker_pid = int(worker.transcribe(np.zeros(1, dtype=np.float32)).split()[-1])
+
+    with patch("whisper_typing.process_transcriber.psutil.Process") as mock_process:
+        mock_process.return_value.memory_info.return_value.rss = 123
+        assert worker.memory_bytes() == 123  # noqa: PLR2004
+    mock_process.assert_called_once_with(worker_pid)
+
+    assert worker.memory_bytes() > 0
+    worker.close()
+    assert worker.memory_bytes() == 0
+
+
+def test_ring_wraps_and_grows(worker: ProcessTranscriber) -> None:
+    """Test requests wrap around the ring and longer audio grows it."""
+    for value in (0.1, 0.2, 0.3):
+        audio = np.full(SAMPLE_RATE // 2, value, dtype=np.float32)
+        assert worker.transcribe(audio).split()[1] == f"{value:.1f}"
+
+    long_audio = np.full(3 * SAMPLE_RATE, 0.5, dtype=np.float32)
+    length, first, *_ = worker.transcribe(long_audio).split()
+    assert int(length) == len(long_audio)
+    assert first == "0.5"
+
+
+def test_live_buffer_sends_only_new_samples(worker: ProcessTranscriber) -> None:
+    """Test a growing live buffer is handed over intact, past the ring's size."""
+    buffer = np.linspace(0, 1, 2 * SAMPLE_RATE, dtype=np.float32)
+    worker.begin_recording()
+    written: list[int] = []
+
+    for end in range(SAMPLE_RATE // 4, len(buffer) + 1, SAMPLE_RATE // 4):
+        audio = buffer[:end]
+        length, first, last, total, *_ = worker.transcribe(
+            audio, streaming=True
+        ).split()
+        assert int(length) == end
+        assert (first, last) == (f"{audio[0]:.1f}", f"{audio[-1]:.1f}")
+        assert total == f"{audio.sum():.3f}"
+        written.append(worker._write_pos)  # noqa: SLF001
+
+    # The buffer stays in place while it fits, so only new samples are copied
+    assert written[:4] == [SAMPLE_RATE // 4 * n for n in range(1, 5)]
+
+    # A new recording starts over
+    worker.begin_recording()
+    assert worker.transcribe(buffer[:10], streaming=True).split()[0] == "10"
+
+
+def test_cancel_stops_the_pass_in_the_worker(worker: ProcessTranscriber) -> None:
+    """Test an abandoned pass is stopped in the worker and frees it."""
+    cancel = threading.Event()
+    results: list[str] = []
+    live = threading.Thread(
+        target=lambda: results.append(
+            worker.transcribe(np.full(10, -1, dtype=np.float32), cancel=cancel)
+        )
+    )
+    live.start()
+    time.sleep(0.2)
+
+    started = time.monotonic()
+    cancel.set()
+    live.join(timeout=5)
+    assert results == ["cancelled"]
+    assert time.monotonic() - started < 5  # noqa: PLR2004
+
+    # The next pass isn't affected by the abandoned one
+    assert worker.transcribe(np.ones(10, dtype=np.float32)).startswith("10 ")
+    # A pass abandoned before it reaches the worker is dropped
+    assert worker.transcribe(np.ones(10, dtype=np.float32), cancel=cancel) == ""
+
+
+def test_worker_errors_are_raised(worker: ProcessTranscriber) -> None:
+    """Test errors in the worker surface as RuntimeError and it keeps serving."""
+    with pytest.raises(RuntimeError, match="empty audio"):
+        worker.transcribe(np.zeros(0, dtype=np.float32))
+    assert worker.transcribe(np.ones(10, dtype=np.float32)).startswith("10 ")
+
+
+def test_startup_failure_is_reported() -> None:
+    """Test a model that fails to load raises in the caller."""
+    with pytest.raises(RuntimeError, match="no such model"):
+        ProcessTranscriber(
+            transcriber_cls=FakeTranscriber,
+            model_id="broken",
+        )
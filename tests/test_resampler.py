@@ -0,0 +1,100 @@
+"""Tests for resampler module."""
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from whisper_typing.resampler import StreamingResampler
+
+TARGET_RATE = 16000
+BLOCK_SIZE = 512
+STREAM_SECONDS = 10
+
+
+def resample_in_blocks(
+    resampler: StreamingResampler, audio: np.ndarray, sizes: list[int]
+) -> np.ndarray:
+    """Feed audio through the resampler in blocks of the given sizes."""
+    parts = []
+    pos = 0
+    for size in sizes:
+        parts.append(resampler.process(audio[pos : pos + size]))
+        pos += size
+    parts.append(resampler.process(audio[pos:]))
+    parts.append(resampler.flush())
+    return np.concatenate(parts)
+
+
+@pytest.mark.parametrize("input_rate", [48000, 44100, 22050, 8000])
+def test_streaming_matches_resample_poly(input_rate: int) -> None:
+    """Test block-wise output equals scipy's one-shot polyphase resampling."""
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal((input_rate + 123, 1)).astype(np.float32)
+    sizes = [int(n) for n in rng.integers(1, 2000, size=40)]
+
+    result = resample_in_blocks(
+        StreamingResampler(input_rate, TARGET_RATE), audio, sizes
+    )
+    expected = signal.resample_poly(audio[:, 0], TARGET_RATE, input_rate)
+
+    assert result.shape == (len(expected), 1)
+    np.testing.assert_allclose(result[:, 0], expected, atol=1e-5)
+
+
+def test_block_size_does_not_change_output() -> None:
+    """Test carried state makes output independent of block boundaries."""
+    audio = np.sin(np.linspace(0, 200, 48000, dtype=np.float32))[:, None]
+
+    one_shot = resample_in_blocks(StreamingResampler(48000, TARGET_RATE), audio, [])
+    blocks = resample_in_blocks(
+        StreamingResampler(48000, TARGET_RATE), audio, [BLOCK_SIZE] * 90
+    )
+
+    np.testing.assert_array_equal(one_shot, blocks)
+
+
+def test_multichannel() -> None:
+    """Test channels are resampled independently."""
+    audio = np.stack(
+        [np.ones(4800, dtype=np.float32), np.zeros(4800, dtype=np.float32)], axis=1
+    )
+    resampler = StreamingResampler(48000, TARGET_RATE, channels=2)
+    result = np.concatenate([resampler.process(audio), resampler.flush()])
+
+    assert result.shape == (1600, 2)
+    np.testing.assert_allclose(result[100:-100, 0], 1.0, atol=1e-3)
+    np.testing.assert_array_equal(result[:, 1], 0.0)
+
+
+def test_passthrough_and_empty_flush() -> None:
+    """Test equal rates pass audio through and flushing nothing is empty."""
+    resampler = StreamingResampler(TARGET_RATE, TARGET_RATE)
+    block = np.ones((BLOCK_SIZE, 1), dtype=np.float32)
+
+    assert resampler.passthrough is True
+    np.testing.assert_array_equal(resampler.process(block), block)
+    assert len(resampler.flush()) == 0
+    assert len(StreamingResampler(48000, TARGET_RATE).flush()) == 0
+
+
+def test_small_blocks_can_emit_nothing() -> None:
+    """Test blocks too short to complete an output sample yield empty arrays."""
+    resampler = StreamingResampler(48000, TARGET_RATE)
+    assert len(resampler.process(np.ones((1, 1), dtype=np.float32))) == 0
+
+
+def test_resampler_long_stream_in_callback_blocks() -> None:
+    """Test a long recording delivered in callback-sized blocks keeps its length."""
+    for input_rate in (48000, 44100):
+        audio = np.random.default_rng(1).standard_normal(
+            (input_rate * STREAM_SECONDS, 1)
+        )
+        audio = audio.astype(np.float32)
+        resampler = StreamingResampler(input_rate, TARGET_RATE)
+
+        produced = 0
+        for pos in range(0, len(audio), BLOCK_SIZE):
+            produced += len(resampler.process(audio[pos : pos + BLOCK_SIZE]))
+        produced += len(resampler.flush())
+
+        assert produced == pytest.approx(TARGET_RATE * STREAM_SECONDS, abs=1)
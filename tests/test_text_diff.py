@@ -0,0 +1,73 @@
+"""Tests for text_diff module."""
+
+from whisper_typing.text_diff import (
+    build_edit_script,
+    diff_opcodes,
+    edit_script_cost,
+)
+
+
+def apply_script(old: str, steps: list[tuple[str, int | str]]) -> str:
+    """Simulate an editor applying keystroke steps with the cursor at the end."""
+    buffer = list(old)
+    cursor = len(buffer)
+    for action, value in steps:
+        if action == "left":
+            cursor -= value
+        elif action == "right":
+            cursor += value
+        elif action == "backspace":
+            del buffer[cursor - value : cursor]
+            cursor -= value
+        elif action == "type":
+            buffer[cursor:cursor] = list(value)
+            cursor += len(value)
+    assert cursor == len(buffer)
+    return "".join(buffer)
+
+
+def test_diff_opcodes_words() -> None:
+    """Test word-level opcodes as used by the preview."""
+    opcodes = diff_opcodes(["a", "b", "c"], ["a", "x", "c"])
+    assert ("replace", 1, 2, 1, 2) in opcodes
+
+
+def test_build_edit_script_identical() -> None:
+    """Test identical text needs no keystrokes."""
+    assert build_edit_script("same text", "same text") == []
+
+
+def test_build_edit_script_append() -> None:
+    """Test appending only types the new suffix."""
+    steps = build_edit_script("Hello", "Hello world")
+    assert steps == [("type", " world")]
+
+
+def test_build_edit_script_minimal_fixes() -> None:
+    """Test a few grammar fixes in a long paragraph cost few keystrokes."""
+    old = "we will meet at noon and then go to the store " * 5 + "tomorow its fine"
+    new = old.replace("tomorow its", "tomorrow, it's")
+    steps = build_edit_script(old, new)
+
+    assert apply_script(old, steps) == new
+    typed = sum(len(value) for _, value in steps if isinstance(value, str))
+    assert typed < 5  # noqa: PLR2004
+    assert edit_script_cost(steps) < (len(old) + len(new)) // 10
+
+
+def test_build_edit_script_roundtrip_mixed() -> None:
+    """Test inserts, deletes and replacements produce the target text."""
+    cases = [
+        ("i think so", "I think so."),
+        ("remove this word please", "remove word please"),
+        ("abc", ""),
+        ("", "new text"),
+        ("line one\nline two", "Line one.\nLine 2"),
+    ]
+    for old, new in cases:
+        assert apply_script(old, build_edit_script(old, new)) == new
+
+
+def test_edit_script_cost() -> None:
+    """Test cost counts key presses and typed characters."""
+    assert edit_script_cost([("left", 3), ("backspace", 2), ("type", "ab")]) == 7  # noqa: PLR2004
@@ -1,15 +1,27 @@
 """Tests for transcriber module."""
 
+import threading
+from collections.abc import Iterator
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor
 
-from whisper_typing.transcriber import Transcriber
+from whisper_typing.transcriber import (
+    LANGUAGE_DETECT_SECONDS,
+    MAX_NEW_TOKENS,
+    SAMPLE_RATE,
+    Transcriber,
+    is_repetitive,
+    token_budget,
+)
+from whisper_typing.tuning import TuningSettings
 
 DUMMY_AUDIO_SIZE = 10
 
 
-@patch("whisper_typing.transcriber.WhisperModel")
+@patch("whisper_typing.backends.WhisperModel")
 @patch("torch.cuda.is_available")
 def test_transcriber_initialization_cpu(
     mock_cuda_avail: MagicMock, mock_whisper_model: MagicMock
@@ -24,7 +36,7 @@ def test_transcriber_initialization_cpu(
     mock_whisper_model.assert_called_once()
 
 
-@patch("whisper_typing.transcriber.WhisperModel")
+@patch("whisper_typing.backends.WhisperModel")
 @patch("torch.cuda.is_available")
 def test_transcriber_initialization_cuda_auto(
     mock_cuda_avail: MagicMock,
@@ -39,7 +51,7 @@ def test_transcriber_initialization_cuda_auto(
     assert transcriber.compute_type == "float16"  # Auto selects float16 for cuda
 
 
-@patch("whisper_typing.transcriber.WhisperModel")
+@patch("whisper_typing.backends.WhisperModel")
 def test_transcribe_success(mock_whisper_model: MagicMock) -> None:
     """Test successful transcription."""
     mock_instance = mock_whisper_model.return_value
@@ -47,6 +59,7 @@ def test_transcribe_success(mock_whisper_model: MagicMock) -> None:
     # Mock segments result
     segment = MagicMock()
     segment.text = "Hello world"
+    segment.temperature = 0.0
     mock_instance.transcribe.return_value = ([segment], None)
 
     transcriber = Transcriber()
@@ -55,15 +68,17 @@ def test_transcribe_success(mock_whisper_model: MagicMock) -> None:
     assert result == "Hello world"
 
 
-@patch("whisper_typing.transcriber.WhisperModel")
+@patch("whisper_typing.backends.WhisperModel")
 def test_transcribe_multiple_segments(mock_whisper_model: MagicMock) -> None:
     """Test transcription with multiple segments."""
     mock_instance = mock_whisper_model.return_value
 
     seg1 = MagicMock()
     seg1.text = "Hello"
+    seg1.temperature = 0.0
     seg2 = MagicMock()
     seg2.text = "world"
+    seg2.temperature = 0.0
     mock_instance.transcribe.return_value = ([seg1, seg2], None)
 
     transcriber = Transcriber()
@@ -72,7 +87,7 @@ def test_transcribe_multiple_segments(mock_whisper_model: MagicMock) -> None:
     assert result == "Hello world"
 
 
-@patch("whisper_typing.transcriber.WhisperModel")
+@patch("whisper_typing.backends.WhisperModel")
 @patch("torch.cuda.is_available")
 def test_transcriber_cuda_fallback_to_cpu(
     mock_cuda_avail: MagicMock,
@@ -88,7 +103,7 @@ def test_transcriber_cuda_fallback_to_cpu(
     assert transcriber.compute_type == "float16"
 
 
-@patch("whisper_typing.transcriber.WhisperModel")
+@patch("whisper_typing.backends.WhisperModel")
 def test_transcriber_download_root(mock_whisper_model: MagicMock) -> None:
     """Test Transcriber passes download_root to WhisperModel."""
     test_root = "/custom/path/to/models"
@@ -97,3 +112,278 @@ def test_transcriber_download_root(mock_whisper_model: MagicMock) -> None:
     # Verify download_root was passed correctly
     _, kwargs = mock_whisper_model.call_args
     assert kwargs["download_root"] == test_root
+
+
+@patch("whisper_typing.backends.WhisperModel")
+@patch("whisper_typing.transcriber.load_tuned_settings")
+def test_transcriber_applies_tuned_settings(
+    mock_tuned: MagicMock, mock_whisper_model: MagicMock
+) -> None:
+    """Test cached tuning fills in settings that were not set explicitly."""
+    mock_tuned.return_value = TuningSettings(4, 2, "int8_float32")
+
+    transcriber = Transcriber(device="cpu", compute_type="auto")
+
+    _, kwargs = mock_whisper_model.call_args
+    assert kwargs["cpu_threads"] == 4  # noqa: PLR2004
+    assert kwargs["num_workers"] == 2  # noqa: PLR2004
+    assert transcriber.compute_type == "int8_float32"
+
+    Transcriber(device="cpu", compute_type="int8", cpu_threads=1)
+    _, kwargs = mock_whisper_model.call_args
+    assert kwargs["cpu_threads"] == 1
+    assert kwargs["compute_type"] == "int8"
+
+
+@patch("whisper_typing.backends.WhisperModel")
+@patch("whisper_typing.backends.ModelManager")
+def test_transcriber_loads_local_copy_offline(
+    mock_manager: MagicMock, mock_whisper_model: MagicMock
+) -> None:
+    """Test a complete local model is loaded without hub lookups."""
+    mock_manager.return_value.local_path.return_value = "/models/base"
+
+    Transcriber(model_id="openai/whisper-base")
+
+    args, kwargs = mock_whisper_model.call_args
+    assert args[0] == "/models/base"
+    assert kwargs["local_files_only"] is True
+
+
+@patch("whisper_typing.backends.WhisperModel")
+def test_language_pinned_per_recording(mock_whisper_model: MagicMock) -> None:
+    """Test language is detected once per recording and reused by later passes."""
+    mock_instance = mock_whisper_model.return_value
+    mock_instance.transcribe.return_value = ([], None)
+    mock_instance.detect_language.return_value = ("de", 0.9, [])
+    audio = np.zeros(int(LANGUAGE_DETECT_SECONDS * SAMPLE_RATE), dtype=np.float32)
+
+    transcriber = Transcriber(learn_language_after=2)
+    transcriber.begin_recording()
+    transcriber.transcribe(audio[:SAMPLE_RATE])  # Too short to detect
+    assert mock_instance.transcribe.call_args.kwargs["language"] is None
+
+    transcriber.transcribe(audio)
+    transcriber.transcribe(audio)
+    mock_instance.detect_language.assert_called_once()
+    assert mock_instance.transcribe.call_args.kwargs["language"] == "de"
+    assert transcriber.session_language is None
+
+    # A second agreeing recording makes it the session default
+    transcriber.begin_recording()
+    transcriber.transcribe(audio)
+    assert transcriber.session_language == "de"
+    transcriber.begin_recording()
+    transcriber.transcribe(audio)
+    assert mock_instance.detect_language.call_count == 2  # noqa: PLR2004
+
+
+@patch("whisper_typing.backends.WhisperModel")
+def test_language_not_pinned_when_unsure(mock_whisper_model: MagicMock) -> None:
+    """Test a low-confidence or explicit language is not pinned."""
+    mock_instance = mock_whisper_model.return_value
+    mock_instance.transcribe.return_value = ([], None)
+    mock_instance.detect_language.return_value = ("nl", 0.2, [])
+    audio = np.zeros(int(LANGUAGE_DETECT_SECONDS * SAMPLE_RATE), dtype=np.float32)
+
+    transcriber = Transcriber()
+    transcriber.transcribe(audio)
+    assert transcriber.pinned_language is None
+
+    transcriber.language = "en"
+    transcriber.transcribe(audio)
+    assert mock_instance.transcribe.call_args.kwargs["language"] == "en"
+    mock_instance.detect_language.assert_called_once()
+
+
+def make_segment(  # noqa: PLR0913
+    text: str,
+    start: float,
+    end: float,
+    *,
+    avg_logprob: float = -0.1,
+    compression_ratio: float = 1.2,
+    no_speech_prob: float = 0.01,
+    tokens: list[int] | None = None,
+    temperature: float = 0.0,
+) -> MagicMock:
+    """Build a segment as produced by faster-whisper."""
+    segment = MagicMock()
+    segment.text = text
+    segment.start = start
+    segment.end = end
+    segment.avg_logprob = avg_logprob
+    segment.compression_ratio = compression_ratio
+    segment.no_speech_prob = no_speech_prob
+    segment.tokens = tokens if tokens is not None else [1, 2, 3]
+    segment.temperature = temperature
+    return segment
+
+
+@patch("whisper_typing.backends.WhisperModel")
+def test_greedy_first_escalates_low_confidence(
+    mock_whisper_model: MagicMock,
+) -> None:
+    """Test only low-confidence greedy segments are decoded again with a beam."""
+    mock_instance = mock_whisper_model.return_value
+    info = MagicMock(language="en")
+    greedy = [
+        make_segment(" Clear words.", 0.0, 2.0),
+        make_segment(" mumble", 2.0, 3.0, avg_logprob=-1.2),
+        make_segment(" Also clear.", 3.0, 4.0),
+    ]
+    mock_instance.transcribe.side_effect = [
+        (greedy, info),
+        ([make_segment(" Hard part.", 0.0, 1.0)], info),
+    ]
+    audio = np.zeros(4 * SAMPLE_RATE, dtype=np.float32)
+
+    transcriber = Transcriber(language="en", greedy_first=True, escalation_beam_size=8)
+    result = transcriber.transcribe(audio)
+
+    assert result == "Clear words. Hard part. Also clear."
+    first, second = mock_instance.transcribe.call_args_list
+    assert first.kwargs["beam_size"] == 1
+    assert second.kwargs["beam_size"] == 8  # noqa: PLR2004
+    assert len(second.args[0]) == SAMPLE_RATE  # Only the 2s-3s segment
+
+    metrics = transcriber.decode_metrics.snapshot()
+    assert metrics["escalated_segments"] == 1
+    assert metrics["escalated_fraction"] == 0.25  # noqa: PLR2004
+
+
+@patch("whisper_typing.backends.WhisperModel")
+def test_streaming_passes_reuse_features(mock_whisper_model: MagicMock) -> None:
+    """Test live passes get incrementally computed features from the model."""
+    mock_instance = mock_whisper_model.return_value
+    mock_instance.feature_extractor = FeatureExtractor()
+    computed: list[np.ndarray] = []
+
+    def fake_transcribe(audio: np.ndarray, **_kwargs: Any) -> tuple[list, None]:  # noqa: ANN401
+        computed.append(mock_instance.feature_extractor(audio))
+        return [], None
+
+    mock_instance.transcribe.side_effect = fake_transcribe
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(3 * SAMPLE_RATE) * 0.1).astype(np.float32)
+
+    transcriber = Transcriber(language="en")
+    transcriber.begin_recording()
+    transcriber.transcribe(audio[:SAMPLE_RATE], streaming=True)
+    transcriber.transcribe(audio, streaming=True)
+
+    assert transcriber.backend.streaming_features is not None
+    assert transcriber.backend.streaming_features.incremental.cached_frames > 0
+    np.testing.assert_allclose(computed[-1], FeatureExtractor()(audio), atol=1e-6)
+
+    transcriber.begin_recording()
+    assert transcriber.backend.streaming_features.incremental.cached_frames == 0
+
+
+@patch("whisper_typing.backends.WhisperModel")
+def test_temperature_fallbacks_counted(mock_whisper_model: MagicMock) -> None:
+    """Test segments decoded again at a higher temperature are counted."""
+    mock_instance = mock_whisper_model.return_value
+    mock_instance.transcribe.return_value = (
+        [
+            make_segment("Clear.", 0.0, 1.0),
+            make_segment("Noisy.", 1.0, 2.0, temperature=0.4),
+        ],
+        None,
+    )
+
+    transcriber = Transcriber(language="en")
+    assert transcriber.transcribe(np.zeros(2 * SAMPLE_RATE)) == "Clear. Noisy."
+
+    metrics = transcriber.decode_metrics.snapshot()
+    assert metrics["decoded_segments"] == 2  # noqa: PLR2004
+    assert metrics["fallback_segments"] == 1
+    assert metrics["fallback_rate"] == 0.5  # noqa: PLR2004
+
+
+@patch("whisper_typing.backends.WhisperModel")
+def test_cancelled_pass_stops_decoding(mock_whisper_model: MagicMock) -> None:
+    """Test an abandoned pass doesn't decode the remaining windows."""
+    cancel = threading.Event()
+    decoded: list[str] = []
+
+    def segments() -> Iterator[Any]:
+        for text in ("One.", "Two.", "Three."):
+            decoded.append(text)
+            if text == "One.":
+                cancel.set()  # The recording ends while decoding
+            yield make_segment(text, 0.0, 1.0)
+
+    mock_whisper_model.return_value.transcribe.return_value = (segments(), None)
+    transcriber = Transcriber(language="en")
+
+    assert transcriber.transcribe(np.zeros(SAMPLE_RATE), cancel=cancel) == "One."
+    assert decoded == ["One."]
+
+
+def test_token_budget_scales_with_duration() -> None:
+    """Test the token cap grows with the audio but never past Whisper's limit."""
+    assert token_budget(1.0) < token_budget(10.0) < MAX_NEW_TOKENS
+    assert token_budget(120.0) == MAX_NEW_TOKENS
+
+
+def test_is_repetitive() -> None:
+    """Test a segment ending in a repeated n-gram is detected as a loop."""
+    assert is_repetitive([1, 2, 3] + [7, 8] * 4)
+    assert is_repetitive([5] * 4)
+    assert not is_repetitive([1, 2, 3, 4, 5, 6, 7, 8])
+    assert not is_repetitive([7, 8] * 3)
+
+
+@patch("whisper_typing.backends.WhisperModel")
+def test_decode_guard_drops_runaway_segments(mock_whisper_model: MagicMock) -> None:
+    """Test looping and non-speech segments are dropped and counted."""
+    mock_instance = mock_whisper_model.return_value
+    segments = [
+        make_segment("Hello there.", 0.0, 2.0),
+        make_segment(" la la la la", 2.0, 4.0, tokens=[9] * 12),
+        make_segment(" Hmm.", 4.0, 5.0, no_speech_prob=0.95),
+        make_segment("Goodbye.", 5.0, 6.0),
+    ]
+    mock_instance.transcribe.return_value = (iter(segments), None)
+    audio = np.zeros(6 * SAMPLE_RATE, dtype=np.float32)
+
+    transcriber = Transcriber(language="en", decode_guard=True)
+    result = transcriber.transcribe(audio)
+
+    assert result == "Hello there. Goodbye."
+    kwargs = mock_instance.transcribe.call_args.kwargs
+    assert kwargs["max_new_tokens"] == token_budget(6.0)
+
+    metrics = transcriber.decode_metrics.snapshot()
+    assert metrics["guard_fired"] == 2  # noqa: PLR2004
+    assert metrics["guard_reasons"]["repetition"] == 1
+    assert metrics["guard_reasons"]["no_speech"] == 1
+    assert metrics["guard_saved_seconds"] >= 0
+
+
+@patch("whisper_typing.backends.WhisperModel")
+def test_decode_guard_aborts_live_pass(mock_whisper_model: MagicMock) -> None:
+    """Test a live pass stops decoding at the first runaway segment."""
+    mock_instance = mock_whisper_model.return_value
+    mock_instance.feature_extractor = FeatureExtractor()
+    decoded: list[str] = []
+
+    def lazy_segments() -> Iterator[MagicMock]:
+        for segment in (
+            make_segment(" Start.", 0.0, 1.0),
+            make_segment(" again", 1.0, 2.0, compression_ratio=4.0),
+            make_segment(" Never decoded.", 2.0, 3.0),
+        ):
+            decoded.append(segment.text)
+            yield segment
+
+    mock_instance.transcribe.return_value = (lazy_segments(), None)
+    audio = np.zeros(3 * SAMPLE_RATE, dtype=np.float32)
+
+    transcriber = Transcriber(language="en", decode_guard=True)
+    result = transcriber.transcribe(audio, streaming=True)
+
+    assert result == "Start."
+    assert decoded == [" Start.", " again"]
+    assert transcriber.decode_metrics.snapshot()["guard_reasons"]["compression"] == 1
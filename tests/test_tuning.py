@@ -0,0 +1,131 @@
+"""Tests for tuning module."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from whisper_typing.tuning import (
+    SAMPLE_RATE,
+    BackendResult,
+    TuningResult,
+    TuningSettings,
+    benchmark,
+    benchmark_assisted,
+    candidate_settings,
+    compare_backends,
+    load_tuned_settings,
+    save_tuned_settings,
+)
+
+CPU_COUNT = 8
+
+
+@patch("whisper_typing.tuning.ctranslate2.get_supported_compute_types")
+def test_candidates_stay_within_cores(mock_supported: MagicMock) -> None:
+    """Test candidates cover powers of two without oversubscribing cores."""
+    mock_supported.return_value = {"int8", "float32"}
+
+    candidates = candidate_settings("cpu", cpu_count=CPU_COUNT)
+
+    assert {c.compute_type for c in candidates} == {"int8", "float32"}
+    assert {c.cpu_threads for c in candidates} == {1, 2, 4, 8}
+    assert all(c.cpu_threads * c.num_workers <= CPU_COUNT for c in candidates)
+    assert TuningSettings(4, 2, "int8") in candidates
+    assert TuningSettings(8, 2, "int8") not in candidates
+
+
+@patch("whisper_typing.tuning.WhisperModel")
+def test_benchmark_sorts_by_real_time_factor(mock_whisper_model: MagicMock) -> None:
+    """Test each candidate is measured and the fastest comes first."""
+    mock_whisper_model.return_value.transcribe.return_value = ([], None)
+    audio = np.zeros(2 * SAMPLE_RATE, dtype=np.float32)
+    candidates = [TuningSettings(1, 1, "int8"), TuningSettings(2, 1, "int8")]
+    seen: list[TuningResult] = []
+
+    # Single and concurrent pass per candidate; the first is faster at two
+    timings = [3.0, 2.0, 1.0, 4.0]
+    with patch("whisper_typing.tuning._run_passes", side_effect=timings) as passes:
+        results = benchmark("base", audio, candidates, on_result=seen.append)
+
+    assert [call.args[2] for call in passes.call_args_list] == [1, 2, 1, 2]
+    assert len(seen) == len(candidates)
+    # Ranked by the single pass the app actually runs
+    assert results[0].settings == candidates[1]
+    assert results[0].rtf == 0.5  # noqa: PLR2004
+    assert results[0].concurrent_rtf == 2.0  # noqa: PLR2004
+    _, kwargs = mock_whisper_model.call_args
+    assert kwargs["cpu_threads"] == 2  # noqa: PLR2004
+
+
+def test_tuned_settings_round_trip(tmp_path: Path) -> None:
+    """Test the best settings are cached per model and device."""
+    path = str(tmp_path / "tuning.json")
+    result = TuningResult(TuningSettings(4, 2, "int8"), 1.0, 0.25)
+
+    assert load_tuned_settings("base", "cpu", path) is None
+    save_tuned_settings("base", "cpu", result, path)
+    save_tuned_settings("small", "cpu", result._replace(rtf=0.5), path)
+
+    assert load_tuned_settings("base", "cpu", path) == result.settings
+    assert load_tuned_settings("base", "cuda", path) is None
+
+
+@patch("whisper_typing.tuning.decode_audio")
+@patch("whisper_typing.tuning.AssistedBackend")
+def test_benchmark_assisted_compares_with_plain_model(
+    mock_backend_cls: MagicMock, mock_decode_audio: MagicMock
+) -> None:
+    """Test the same backend decodes without, then with, its assistant."""
+    mock_decode_audio.return_value = np.zeros(2 * SAMPLE_RATE, dtype=np.float32)
+    backend = mock_backend_cls.load.return_value
+    assistant = backend.assistant
+    used = []
+
+    def transcribe(audio: np.ndarray, **kwargs: object) -> tuple[list, None]:  # noqa: ARG001
+        used.append(backend.assistant)
+        return [SimpleNamespace(text=" Hello world.")], None
+
+    backend.transcribe.side_effect = transcribe
+
+    with patch("whisper_typing.tuning.time.perf_counter", side_effect=[0, 4, 0, 1]):
+        result = benchmark_assisted(
+            "openai/whisper-large-v3", "clip.wav", language="en"
+        )
+
+    assert used == [None, None, assistant, assistant]
+    assert result.speedup == 4.0  # noqa: PLR2004
+    assert result.identical
+    assert result.assisted_text == "Hello world."
+    assert backend.transcribe.call_args.kwargs["beam_size"] == 1
+
+
+@patch("whisper_typing.tuning.decode_audio")
+@patch("whisper_typing.tuning.load_backend")
+def test_compare_backends_reports_load_failures(
+    mock_load: MagicMock, mock_decode: MagicMock
+) -> None:
+    """Test a backend that fails to load is reported and the rest measured."""
+    mock_decode.return_value = np.zeros(2 * SAMPLE_RATE, dtype=np.float32)
+    working = MagicMock()
+    working.transcribe.return_value = ([], None)
+    mock_load.side_effect = [
+        ModuleNotFoundError("No module named 'optimum.onnxruntime'"),
+        working,
+    ]
+    seen: list[BackendResult] = []
+
+    results = compare_backends(
+        "openai/whisper-base",
+        "clip.wav",
+        backends=["onnx", "faster-whisper"],
+        on_result=seen.append,
+    )
+
+    assert [r.backend for r in seen] == ["onnx", "faster-whisper"]
+    assert [r.backend for r in results] == ["faster-whisper", "onnx"]
+    assert results[0].error is None
+    assert results[1].error == (
+        "ModuleNotFoundError: No module named 'optimum.onnxruntime'"
+    )
@@ -3,13 +3,14 @@
 import threading
 from unittest.mock import MagicMock, call, patch
 
-from whisper_typing.typer import Typer
+from whisper_typing.typer import Key, Typer
 
 DEFAULT_WPM = 40
 FAST_WPM = 100
 TEST_WPM = 60
 PUNCTUATION_TEXT_LENGTH = 14
 LONG_TEXT_LENGTH = 12
+PARTIAL_TYPED = 2
 
 
 def test_typer_initialization() -> None:
@@ -145,3 +146,91 @@ def test_type_text_pause_intervals(
 
     # Verify typing occurred
     assert mock_keyboard.type.call_count == LONG_TEXT_LENGTH
+
+
+@patch("whisper_typing.typer.Controller")
+@patch("time.sleep")
+def test_type_text_returns_typed_count(
+    mock_sleep: MagicMock,  # noqa: ARG001
+    mock_controller_cls: MagicMock,  # noqa: ARG001
+) -> None:
+    """Test type_text reports how many characters were typed."""
+    typer = Typer(wpm=TEST_WPM)
+    assert typer.type_text("Hello") == len("Hello")
+
+    focus = iter([True, True, False])
+    assert typer.type_text("Hello", check_focus=lambda: next(focus)) == PARTIAL_TYPED
+
+
+@patch("whisper_typing.typer.Controller")
+@patch("time.sleep")
+def test_correct_text_minimal_keystrokes(
+    mock_sleep: MagicMock,  # noqa: ARG001
+    mock_controller_cls: MagicMock,
+) -> None:
+    """Test correcting typed text only sends the differing keystrokes."""
+    mock_keyboard = MagicMock()
+    mock_controller_cls.return_value = mock_keyboard
+
+    typer = Typer(wpm=TEST_WPM)
+    assert typer.correct_text("hello world", "hello world!") is True
+
+    mock_keyboard.type.assert_called_once_with("!")
+    mock_keyboard.press.assert_not_called()
+
+
+@patch("whisper_typing.typer.Controller")
+@patch("time.sleep")
+def test_correct_text_navigates_and_deletes(
+    mock_sleep: MagicMock,  # noqa: ARG001
+    mock_controller_cls: MagicMock,
+) -> None:
+    """Test a mid-text fix moves the cursor, edits and returns to the end."""
+    mock_keyboard = MagicMock()
+    mock_controller_cls.return_value = mock_keyboard
+
+    typer = Typer(wpm=TEST_WPM)
+    assert typer.correct_text("the cat sat down", "the bat sat down") is True
+
+    pressed = [c.args[0] for c in mock_keyboard.press.call_args_list]
+    assert pressed.count(Key.backspace) == 1
+    assert pressed.count(Key.left) == pressed.count(Key.right)
+    mock_keyboard.type.assert_called_once_with("b")
+
+
+@patch("whisper_typing.typer.Controller")
+@patch("time.sleep")
+def test_correct_text_falls_back_to_retype(
+    mock_sleep: MagicMock,  # noqa: ARG001
+    mock_controller_cls: MagicMock,
+) -> None:
+    """Test completely different text is retyped instead of navigated."""
+    mock_keyboard = MagicMock()
+    mock_controller_cls.return_value = mock_keyboard
+
+    typer = Typer(wpm=TEST_WPM)
+    assert typer.correct_text("abcdef", "uvwxyz") is True
+
+    pressed = [c.args[0] for c in mock_keyboard.press.call_args_list]
+    assert pressed == [Key.backspace] * len("abcdef")
+    assert mock_keyboard.type.call_count == len("uvwxyz")
+
+
+@patch("whisper_typing.typer.Controller")
+@patch("time.sleep")
+def test_correct_text_interrupted(
+    mock_sleep: MagicMock,  # noqa: ARG001
+    mock_controller_cls: MagicMock,
+) -> None:
+    """Test correction reports failure when stopped or keys fail."""
+    mock_keyboard = MagicMock()
+    mock_controller_cls.return_value = mock_keyboard
+
+    typer = Typer(wpm=TEST_WPM)
+    stop_event = threading.Event()
+    stop_event.set()
+    assert typer.correct_text("abc", "abcd", stop_event=stop_event) is False
+    assert typer.correct_text("abcd", "abc", check_focus=lambda: False) is False
+
+    mock_keyboard.press.side_effect = Exception("Keyboard error")
+    assert typer.correct_text("abcd", "abc") is False